@@ -15,10 +15,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from enum import Enum
-from typing import Optional, Set, Union, Dict, Iterator, Any, List
+from typing import (
+    Optional,
+    Set,
+    Union,
+    Dict,
+    Iterable,
+    Iterator,
+    AsyncIterator,
+    AsyncGenerator,
+    Any,
+    List,
+)
 from fastapi import (
     APIRouter,
     Depends,
@@ -34,9 +47,11 @@ from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel, Field, validator
 import os.path
 import io
+import itertools
 import json
 import orjson
 from pydantic.main import create_model
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import Response
 import yaml
 
@@ -449,6 +464,26 @@ _archive_download_response = (
 )
 
 
+_ndjson_media_type = 'application/x-ndjson'
+
+_archive_query_response = (
+    200,
+    {
+        'content': {'application/json': {}, _ndjson_media_type: {}},
+        'description': strip(
+            f"""
+        A page of archives. If the request accepts `{_ndjson_media_type}`, the
+        response is streamed as newline delimited JSON instead. The first line is the
+        response without `data`, each following line is one element of `data`. In this
+        case the entries are streamed in the order they are read, which can differ from
+        the page order. If reading the archives fails after the response has started,
+        the last line is an error object `{{"detail": ...}}` with the same `detail` as
+        the respective error response.
+    """
+        ),
+    },
+)
+
 _bad_archive_required_response = (
     status.HTTP_400_BAD_REQUEST,
     {
@@ -878,6 +913,123 @@ def _read_archive(entry_metadata, uploads, required_reader: RequiredReader):
         raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+def _read_entries_from_archive(
+    entries: Iterable[dict], uploads: _Uploads, required_reader: RequiredReader
+) -> Iterator[tuple[dict, Any]]:
+    """
+    Reads the archives of the given entries. Consecutive entries of the same upload are
+    read together, in the order they are stored in the upload's archive file.
+    Yields tuples of the entry and its archive, the archive is `None` for missing
+    archives.
+    """
+    for upload_id, upload_entries in itertools.groupby(
+        entries, key=lambda entry: entry['upload_id']
+    ):
+        entries_by_id = {entry['entry_id']: entry for entry in upload_entries}
+        try:
+            upload_files = uploads.get_upload_files(upload_id)
+            for entry_id, archive in upload_files.read_many(
+                entries_by_id, required_reader
+            ):
+                yield entries_by_id[entry_id], archive
+        except ArchiveQueryError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+_archive_read_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_archive_read_executor() -> ThreadPoolExecutor:
+    global _archive_read_executor
+    if _archive_read_executor is None:
+        _archive_read_executor = ThreadPoolExecutor(
+            max_workers=config.services.archive_read_workers,
+            thread_name_prefix='archive-read',
+        )
+    return _archive_read_executor
+
+
+def _read_upload_archives(
+    upload_id: str, entries: List[dict], required_reader: RequiredReader
+) -> List[tuple[dict, Any]]:
+    """
+    Reads the archives of the given entries of the same upload. The upload files are
+    opened once and closed afterwards, which allows to call this from different threads
+    for different uploads. Returns tuples of the entry and its archive, the archive
+    is `None` for missing archives.
+    """
+    with _Uploads() as uploads:
+        return list(_read_entries_from_archive(entries, uploads, required_reader))
+
+
+async def _iter_entries_from_archive_async(
+    request: Request, entries: List[dict], required_reader: RequiredReader
+) -> AsyncGenerator[List[tuple[dict, Any]], None]:
+    """
+    Reads the archives of the given entries and yields the tuples of entry and archive
+    of each upload as soon as the upload is read, see :func:`_read_upload_archives`.
+    The uploads are read concurrently with the archive read executor, the event loop
+    is not blocked. Reading is aborted, if the client disconnects.
+    """
+    entries_by_upload: Dict[str, List[dict]] = {}
+    for entry in entries:
+        entries_by_upload.setdefault(entry['upload_id'], []).append(entry)
+
+    pending: List[asyncio.Future]
+    if config.services.archive_read_workers <= 0:
+        pending = [
+            asyncio.ensure_future(
+                run_in_threadpool(
+                    _read_upload_archives, upload_id, upload_entries, required_reader
+                )
+            )
+            for upload_id, upload_entries in entries_by_upload.items()
+        ]
+    else:
+        loop = asyncio.get_running_loop()
+        executor = _get_archive_read_executor()
+        pending = [
+            loop.run_in_executor(
+                executor,
+                _read_upload_archives,
+                upload_id,
+                upload_entries,
+                required_reader,
+            )
+            for upload_id, upload_entries in entries_by_upload.items()
+        ]
+
+    try:
+        for next_result in asyncio.as_completed(pending):
+            yield await next_result
+
+            if await request.is_disconnected():
+                logger.info('client disconnected', endpoint='entries/archive')
+                break
+    finally:
+        # uploads that are not read yet are not read at all
+        for future in pending:
+            future.cancel()
+
+
+async def _read_entries_from_archive_async(
+    request: Request, entries: List[dict], required_reader: RequiredReader
+) -> None:
+    """
+    Reads the archives of the given entries and stores them under the `archive` key
+    of each entry. Entries with missing archives are not changed.
+    See :func:`_iter_entries_from_archive_async`.
+    """
+    async for upload_archives in _iter_entries_from_archive_async(
+        request, entries, required_reader
+    ):
+        for entry, archive in upload_archives:
+            if archive is None:
+                logger.error('missing archive', entry_id=entry['entry_id'])
+            else:
+                entry['archive'] = archive
+
+
 def _validate_required(required: ArchiveRequired, user) -> RequiredReader:
     try:
         return RequiredReader(required, user=user)
@@ -888,24 +1040,6 @@ def _validate_required(required: ArchiveRequired, user) -> RequiredReader:
         )
 
 
-def _read_entry_from_archive(entry: dict, uploads, required_reader: RequiredReader):
-    entry_id, upload_id = entry['entry_id'], entry['upload_id']
-
-    # all other exceptions are handled by the caller `_answer_entries_archive_request`
-    try:
-        upload_files = uploads.get_upload_files(upload_id)
-
-        with upload_files.read_archive(entry_id, True) as archive:
-            entry['archive'] = required_reader.read(archive, entry_id, upload_id)
-            return entry
-    except ArchiveQueryError as e:
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except KeyError as e:
-        logger.error('missing archive', exc_info=e, entry_id=entry_id)
-
-        return None
-
-
 async def _answer_entries_archive_request(
     request: Request,
     owner: Owner,
@@ -927,7 +1061,8 @@ async def _answer_entries_archive_request(
     if required is None:
         required = '*'
 
-    search_response = perform_search(
+    search_response = await run_in_threadpool(
+        perform_search,
         owner=owner,
         query=query,
         pagination=pagination,
@@ -945,22 +1080,9 @@ async def _answer_entries_archive_request(
     ]
 
     required_reader = _validate_required(required, user)
-    response_data = []
     if isinstance(entries, dict):
         entries = [entries]
 
-    with _Uploads() as uploads:
-        for entry in entries:
-            disconnected = await request.is_disconnected()
-            if disconnected:
-                logger.info('client disconnected', endpoint='entries/archive')
-                break
-
-            entry_archive = _read_entry_from_archive(entry, uploads, required_reader)
-            response_data.append(entry_archive)
-
-        logger.info('read all archives', endpoint='entries/archive')
-
     response = EntriesArchiveResponse(
         owner=search_response.owner,
         query=search_response.query,
@@ -970,11 +1092,61 @@ async def _answer_entries_archive_request(
     if populate_url:
         response.pagination.populate_urls(request)
     result = response.dict(exclude_none=True)
+
+    if _ndjson_media_type in request.headers.get('accept', ''):
+        return StreamingResponse(
+            _stream_entries_archive_response(request, result, entries, required_reader),
+            media_type=_ndjson_media_type,
+        )
+
+    await _read_entries_from_archive_async(request, entries, required_reader)
+    response_data = [entry for entry in entries if 'archive' in entry]
+
+    logger.info('read all archives', endpoint='entries/archive')
+
     result['data'] = list(filter(None, response_data))
 
     return ORJSONResponse(result)
 
 
+async def _stream_entries_archive_response(
+    request: Request,
+    result: dict,
+    entries: List[dict],
+    required_reader: RequiredReader,
+) -> AsyncIterator[bytes]:
+    """
+    Creates the lines of a newline delimited JSON archive query response. The first
+    line contains the response without data, each following line contains one entry
+    and its archive. Entries are streamed upload by upload, as soon as they are
+    read, the order can differ from the page order. If reading fails, the last line
+    contains the error `detail`.
+    """
+    # the same options as ORJSONResponse
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    yield orjson.dumps(result, option=option) + b'\n'
+
+    upload_archives_iterator = _iter_entries_from_archive_async(
+        request, entries, required_reader
+    )
+    try:
+        async for upload_archives in upload_archives_iterator:
+            for entry, archive in upload_archives:
+                if archive is None:
+                    logger.error('missing archive', entry_id=entry['entry_id'])
+                    continue
+
+                entry['archive'] = archive
+                yield orjson.dumps(entry, option=option) + b'\n'
+                del entry['archive']
+    except HTTPException as e:
+        yield orjson.dumps(dict(detail=e.detail)) + b'\n'
+    finally:
+        await upload_archives_iterator.aclose()
+
+    logger.info('streamed all archives', endpoint='entries/archive')
+
+
 _entries_archive_docstring = strip(
     """
     This operation will perform a search with the given `query` and `owner` and return
@@ -993,7 +1165,9 @@ _entries_archive_docstring = strip(
     response_model=EntriesArchiveResponse,
     response_model_exclude_unset=True,
     response_model_exclude_none=True,
-    responses=create_responses(_bad_owner_response, _bad_archive_required_response),
+    responses=create_responses(
+        _archive_query_response, _bad_owner_response, _bad_archive_required_response
+    ),
 )
 async def post_entries_archive_query(
     request: Request,
@@ -1027,7 +1201,9 @@ async def post_entries_archive_query(
     response_model=EntriesArchiveResponse,
     response_model_exclude_unset=True,
     response_model_exclude_none=True,
-    responses=create_responses(_bad_owner_response, _bad_archive_required_response),
+    responses=create_responses(
+        _archive_query_response, _bad_owner_response, _bad_archive_required_response
+    ),
 )
 async def get_entries_archive_query(
     request: Request,
@@ -1084,15 +1260,24 @@ def _answer_entries_archive_download_request(
 
     # a generator of StreamedFile objects to create the zipstream from
     def streamed_files():
-        # go through all entries that match the query
-        for entry_metadata in _do_exhaustive_search(
-            owner, query, include=search_includes, user=user
+        # go through all entries that match the query, the search results are
+        # ordered by upload, the archives of each upload are read in one batch
+        for entry_metadata, archive in _read_entries_from_archive(
+            _do_exhaustive_search(owner, query, include=search_includes, user=user),
+            uploads,
+            required_reader,
         ):
             path = os.path.join(
                 entry_metadata['upload_id'], f'{entry_metadata["entry_id"]}.json'
             )
-            try:
-                archive_data = _read_archive(entry_metadata, uploads, required_reader)
+            if archive is None:
+                logger.error('missing archive', entry_id=entry_metadata['entry_id'])
+            else:
+                archive_data = {
+                    'entry_id': entry_metadata['entry_id'],
+                    'parser_name': entry_metadata['parser_name'],
+                    'archive': archive,
+                }
 
                 f = io.BytesIO(
                     orjson.dumps(  # pylint: disable=maybe-no-member
@@ -1102,10 +1287,6 @@ def _answer_entries_archive_download_request(
                 )  # pylint: disable=maybe-no-member
 
                 yield StreamedFile(path=path, f=f, size=f.getbuffer().nbytes)
-            except KeyError as e:
-                logger.error(
-                    'missing archive', entry_id=entry_metadata['entry_id'], exc_info=e
-                )
 
             entry_metadata['path'] = path
             manifest.append(entry_metadata)
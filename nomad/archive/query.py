@@ -145,7 +145,15 @@ def _load_data(query_dict: Dict[str, Any], archive_item: ArchiveDict) -> Dict:
     query_dict_with_fixed_ids = {
         utils.adjust_uuid_size(key): value for key, value in query_dict.items()
     }
-    return filter_archive(query_dict_with_fixed_ids, archive_item, transform=to_json)
+    archive_data: Union[Dict, ArchiveDict] = archive_item
+    if hasattr(archive_item, 'read_many'):
+        # read all queried entries in one pass, in the order they are stored
+        archive_data = {
+            key.strip(): value
+            for key, value in archive_item.read_many(query_dict_with_fixed_ids)
+            if value is not None
+        }
+    return filter_archive(query_dict_with_fixed_ids, archive_data, transform=to_json)
 
 
 def filter_archive(
@@ -254,8 +254,15 @@ class RequiredReader:
         Reads the archive of the given entry id from the given archive reader and applies
         the instance's requirement specification.
         """
+        return self.read_root(
+            archive_reader[utils.adjust_uuid_size(entry_id)], entry_id, upload_id
+        )
 
-        archive_root = archive_reader[utils.adjust_uuid_size(entry_id)]
+    def read_root(self, archive_root, entry_id: str, upload_id: str) -> dict:
+        """
+        Applies the instance's requirement specification to the given, already loaded,
+        archive root of the given entry.
+        """
         result_root: dict = {}
         ref_result_root: dict = {}
 
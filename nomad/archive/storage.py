@@ -22,6 +22,7 @@ from io import BytesIO, BufferedReader
 from collections.abc import Mapping, Sequence
 
 import struct
+import threading
 
 import msgspec
 
@@ -65,13 +66,16 @@ class ArchiveError(Exception):
 
 
 class ArchiveItem:
-    def __init__(self, f: BytesIO, offset: int = 0):
+    def __init__(self, f: BytesIO, offset: int = 0, lock: threading.Lock = None):
         self._f = f
         self._offset = offset
+        # shared by all items of the same file, seek and read must not interleave
+        self._lock = lock if lock is not None else threading.Lock()
 
     def _direct_read(self, size: int, offset: int):
-        self._f.seek(offset)
-        return self._f.read(size)
+        with self._lock:
+            self._f.seek(offset)
+            return self._f.read(size)
 
     def _read(self, position: Tuple[int, int]):
         start, end = position
@@ -81,12 +85,12 @@ class ArchiveItem:
     def _child(self, child_toc_entry):
         if isinstance(child_toc_entry, dict):
             if child_toc_entry.get('toc', None):
-                return ArchiveDict(child_toc_entry, self._f, self._offset)
+                return ArchiveDict(child_toc_entry, self._f, self._offset, self._lock)
 
             return self._read(child_toc_entry['pos'])
 
         if isinstance(child_toc_entry, list):
-            return ArchiveList(child_toc_entry, self._f, self._offset)
+            return ArchiveList(child_toc_entry, self._f, self._offset, self._lock)
 
         assert False, 'unreachable'
 
@@ -270,7 +274,9 @@ class ArchiveReader(ArchiveDict):
     def __getitem__(self, key):
         toc_position, data_position = self._locate_position(utils.adjust_uuid_size(key))
 
-        return ArchiveDict(self._read(toc_position), self._f, data_position[0])
+        return ArchiveDict(
+            self._read(toc_position), self._f, data_position[0], self._lock
+        )
 
     def get_raw(self, key: str) -> tuple[dict, Generator]:
         """
@@ -17,12 +17,21 @@
 #
 from __future__ import annotations
 
+import mmap
+import os
 import struct
-from collections.abc import Generator, Iterable
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
+from typing import TYPE_CHECKING
 
 import msgpack
 import msgspec.msgpack
+import numpy as np
 from bitarray import bitarray
 from msgpack import Unpacker
 
@@ -30,7 +39,69 @@ from nomad import utils
 from nomad.config import config
 from nomad.archive import ArchiveError
 
-_packer = msgpack.Packer(autoreset=True, use_bin_type=True)
+if TYPE_CHECKING:
+    from nomad.archive.storage import ArchiveReader as LegacyArchiveReader
+
+# msgpack extension type of numpy arrays, the ext data is a header with the
+# dtype and shape followed by the raw array data in C order
+_ndarray_ext_code = 1
+_ndarray_header = struct.Struct('<B')
+_ndarray_dim = struct.Struct('<Q')
+
+
+def _pack_ndarray(obj):
+    if not isinstance(obj, np.ndarray):
+        raise TypeError(f'Cannot serialize {obj.__class__}.')
+
+    if obj.dtype.kind not in 'biuf':
+        return obj.tolist()
+
+    dtype = obj.dtype.str.encode()
+    return msgpack.ExtType(
+        _ndarray_ext_code,
+        b''.join(
+            (
+                _ndarray_header.pack(len(dtype)),
+                dtype,
+                _ndarray_header.pack(obj.ndim),
+                *(_ndarray_dim.pack(n) for n in obj.shape),
+                np.ascontiguousarray(obj).tobytes(),
+            )
+        ),
+    )
+
+
+def _unpack_ndarray(code: int, data) -> np.ndarray:
+    if code != _ndarray_ext_code:
+        return msgpack.ExtType(code, bytes(data))
+
+    offset = _ndarray_header.size
+    (dtype_len,) = _ndarray_header.unpack_from(data)
+    dtype = np.dtype(bytes(data[offset : offset + dtype_len]).decode())
+    offset += dtype_len
+    (ndim,) = _ndarray_header.unpack_from(data, offset)
+    offset += _ndarray_header.size
+    shape = tuple(
+        _ndarray_dim.unpack_from(data, offset + i * _ndarray_dim.size)[0]
+        for i in range(ndim)
+    )
+    offset += ndim * _ndarray_dim.size
+    # the data might be a view of a memory mapped file, hence the copy
+    return (
+        np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+        .reshape(shape)
+        .copy()
+    )
+
+
+def _unpack_ndarray_as_list(code: int, data):
+    value = _unpack_ndarray(code, data)
+    return value.tolist() if isinstance(value, np.ndarray) else value
+
+
+_packer = msgpack.Packer(autoreset=True, use_bin_type=True, default=_pack_ndarray)
+_decoder = msgspec.msgpack.Decoder(ext_hook=_unpack_ndarray_as_list)
+_ndarray_decoder = msgspec.msgpack.Decoder(ext_hook=_unpack_ndarray)
 
 
 class Utility:
@@ -70,8 +141,18 @@ class Utility:
 
     # noinspection SpellCheckingInspection
     @staticmethod
-    def unpackb(o):
-        return msgspec.msgpack.decode(o)
+    def unpackb(o, ndarray: bool = False):
+        """
+        Decodes the given msgpack bytes. Numpy arrays that were stored as extension
+        type are decoded as lists, unless `ndarray` is set.
+        """
+        return (_ndarray_decoder if ndarray else _decoder).decode(o)
+
+    @staticmethod
+    def unpacker(o, ndarray: bool = False) -> Unpacker:
+        return Unpacker(
+            BytesIO(o), ext_hook=_unpack_ndarray if ndarray else _unpack_ndarray_as_list
+        )
 
     @staticmethod
     def unpack_entry(data: bytes) -> tuple[str, tuple]:
@@ -369,12 +450,27 @@ class ArchiveWriter:
 
         self._write_entry(uuid, toc, packed)
 
-    def add_raw(self, uuid: str, toc: dict, packed: Generator):
+    def add_raw(self, uuid: str, toc: dict, packed: bytes | Generator):
         self._write_entry(uuid, toc, packed)
 
 
 def to_json(v):
-    return v.to_json() if hasattr(v, 'to_json') else v
+    if hasattr(v, 'to_json'):
+        return v.to_json()
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    return v
+
+
+def _ndarray_to_list(v):
+    """Replaces all numpy arrays in the given decoded data with lists."""
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    if isinstance(v, dict):
+        return {k: _ndarray_to_list(x) for k, x in v.items()}
+    if isinstance(v, list):
+        return [_ndarray_to_list(x) for x in v]
+    return v
 
 
 class ArchiveReadCounter:
@@ -398,14 +494,190 @@ class ArchiveReadCounter:
         self._call_counter = 0
 
 
+@lru_cache(maxsize=128)
+def _filesystem_type(directory: str) -> str | None:
+    """
+    Find the type of the file system the given directory is mounted on.
+    Returns `None` if the mount table is not available.
+    """
+    try:
+        with open('/proc/mounts') as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return None
+
+    fs_type, mount_point_length = None, -1
+    for mount in mounts:
+        if len(mount) < 3:
+            continue
+        mount_point = mount[1]
+        if (
+            directory == mount_point
+            or directory.startswith(mount_point.rstrip('/') + '/')
+        ) and len(mount_point) > mount_point_length:
+            fs_type, mount_point_length = mount[2], len(mount_point)
+
+    return fs_type
+
+
+def mmap_supported(path: str) -> bool:
+    """
+    Check if the given file can be safely memory-mapped.
+    """
+    fs_type = _filesystem_type(os.path.dirname(os.path.realpath(path)))
+    return fs_type is None or fs_type.lower() not in {
+        v.lower() for v in config.archive.mmap_unsafe_filesystems
+    }
+
+
+class PositionalFile:
+    """
+    A read-only file that is read with positional reads (`pread`). Reads do not depend
+    on a shared file position, the file can hence be shared between threads.
+    """
+
+    def __init__(self, path: str):
+        self._closed: bool = True
+        self._fd: int = os.open(path, os.O_RDONLY)
+        self._closed = False
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def read_at(self, size: int, offset: int) -> bytes | memoryview:
+        return os.pread(self._fd, size, offset)
+
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        os.close(self._fd)
+
+
+class MappedFile(PositionalFile):
+    """
+    A read-only memory-mapped file. Reads return `memoryview` slices of the mapping,
+    no data is copied until it is decoded.
+    """
+
+    def __init__(self, path: str):
+        self._closed = True
+        with open(path, 'rb') as f:
+            self._mmap: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view: memoryview = memoryview(self._mmap)
+        self._closed = False
+
+    def read_at(self, size: int, offset: int) -> memoryview:
+        return self._view[offset : offset + size]
+
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # slices of the mapping are still referenced somewhere,
+            # the mapping is released once they are garbage collected
+            pass
+
+
+class SeekableFile(PositionalFile):
+    """
+    A file object that is read with `seek` and `read`, e.g. a buffered file or a
+    `BytesIO`. Both calls are made under a lock, the file can hence be shared between
+    threads.
+    """
+
+    def __init__(self, f: BytesIO):
+        self._f: BytesIO = f
+        self._lock = threading.Lock()
+
+    def __del__(self):
+        # the wrapped file is closed by its owner
+        pass
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def read_at(self, size: int, offset: int) -> bytes:
+        with self._lock:
+            self._f.seek(offset)
+            return self._f.read(size)
+
+    def close(self):
+        self._f.close()
+
+
+class _BlockFile(PositionalFile):
+    """
+    A block of an archive file that was read into memory. Reads use the offsets of the
+    original file and must be within the block.
+    """
+
+    def __init__(self, data: bytes | memoryview, offset: int):
+        self._data: memoryview = memoryview(data)
+        self._offset: int = offset
+        self._closed = False
+
+    def read_at(self, size: int, offset: int) -> memoryview:
+        start = offset - self._offset
+        return self._data[start : start + size]
+
+    def close(self):
+        self._closed = True
+
+
+class _CheckedOutFile(PositionalFile):
+    """
+    The view of a cached file for one checkout of an :class:`ArchiveReaderCache`.
+    Closing the view does not close the file, but everything that was read through
+    the view becomes unreadable.
+    """
+
+    def __init__(self, f: PositionalFile):
+        self._f: PositionalFile = f
+        self._closed = False
+
+    def __del__(self):
+        pass
+
+    @property
+    def closed(self) -> bool:
+        return self._closed or self._f.closed
+
+    def read_at(self, size: int, offset: int) -> bytes | memoryview:
+        if self._closed:
+            raise ValueError('I/O operation on closed file.')
+        return self._f.read_at(size, offset)
+
+    def close(self):
+        self._closed = True
+
+
 class ArchiveItem:
     def __init__(
-        self, f: BytesIO, offset: int = 0, *, counter: ArchiveReadCounter = None
+        self,
+        f: PositionalFile,
+        offset: int = 0,
+        *,
+        counter: ArchiveReadCounter = None,
+        ndarray: bool = False,
     ):
-        self._f: BytesIO = f
+        self._f: PositionalFile = f
         self._offset: int = offset
         # to record how many bytes have been read
         self._counter: ArchiveReadCounter = counter
+        # to decode numpy arrays as arrays instead of lists
+        self._ndarray: bool = ndarray
         # to record how many items have been accessed
         self._accessed_items: int = 0
 
@@ -423,15 +695,14 @@ class ArchiveItem:
             raise ArchiveError('Archive is closed')
         if self._counter:
             self._counter += size
-        self._f.seek(offset)
-        return self._f.read(size)
+        return self._f.read_at(size, offset)
 
     # noinspection SpellCheckingInspection
     def _readb(self, start: int, end: int):
         return self._direct_read(end - start, start + self._offset)
 
     def _read(self, start: int, end: int):
-        return Utility.unpackb(self._readb(start, end))
+        return Utility.unpackb(self._readb(start, end), self._ndarray)
 
     def _child(self, toc: dict, offset: int = None):
         child_offset: int = offset or self._offset
@@ -452,13 +723,31 @@ class ArchiveItem:
                     end += offset
                 return self._read(start, end)
 
-            return ArchiveList(toc, self._f, child_offset, counter=self._counter)
+            return ArchiveList(
+                toc,
+                self._f,
+                child_offset,
+                counter=self._counter,
+                ndarray=self._ndarray,
+            )
 
         if isinstance(child_toc, list):
-            return ArchiveList(toc, self._f, child_offset, counter=self._counter)
+            return ArchiveList(
+                toc,
+                self._f,
+                child_offset,
+                counter=self._counter,
+                ndarray=self._ndarray,
+            )
 
         if isinstance(child_toc, dict):
-            return ArchiveDict(toc, self._f, child_offset, counter=self._counter)
+            return ArchiveDict(
+                toc,
+                self._f,
+                child_offset,
+                counter=self._counter,
+                ndarray=self._ndarray,
+            )
 
         raise ArchiveError(f'Invalid TOC: {toc}')
 
@@ -480,12 +769,13 @@ class ArchiveList(ArchiveItem):
     def __init__(
         self,
         toc: dict,
-        f: BytesIO,
+        f: PositionalFile,
         offset: int = 0,
         *,
         counter: ArchiveReadCounter = None,
+        ndarray: bool = False,
     ):
-        super().__init__(f, offset, counter=counter)
+        super().__init__(f, offset, counter=counter, ndarray=ndarray)
         self._toc: list = toc.get('toc', [])  # if empty, it's a list of small objects
         self._pos: list = toc['pos']
         self._cache = [None] * len(self)
@@ -519,7 +809,7 @@ class ArchiveList(ArchiveItem):
                         if num_start <= item < num_end:
                             self._mask[num_start:num_end] = 1
                             self._cache[num_start:num_end] = list(
-                                Unpacker(BytesIO(self._readb(start, end)))
+                                Utility.unpacker(self._readb(start, end), self._ndarray)
                             )
                             break
                         num_start = num_end
@@ -548,17 +838,20 @@ class ArchiveList(ArchiveItem):
                 for index in range(len(self)):
                     self._cache[index] = to_json(self[index])  # type: ignore
             elif self._toc:
-                self._cache = self._read(*self._pos)
+                self._cache = Utility.unpackb(self._readb(*self._pos))
             else:
                 num_start, num_end = 0, 0
                 for size, start, end in self._pos:
                     num_end += size
                     if 0 == self._mask[num_start]:
                         self._cache[num_start:num_end] = list(
-                            Unpacker(BytesIO(self._readb(start, end)))
+                            Utility.unpacker(self._readb(start, end))
                         )
                     num_start = num_end
 
+            if self._ndarray:
+                self._cache = _ndarray_to_list(self._cache)
+
             self._mask.setall(1)
 
         return self._cache
@@ -568,12 +861,13 @@ class ArchiveDict(ArchiveItem):
     def __init__(
         self,
         toc: dict,
-        f: BytesIO,
+        f: PositionalFile,
         offset: int = 0,
         *,
         counter: ArchiveReadCounter = None,
+        ndarray: bool = False,
     ):
-        super().__init__(f, offset, counter=counter)
+        super().__init__(f, offset, counter=counter, ndarray=ndarray)
         self._toc: dict = toc['toc']
         self._pos: list = toc['pos']
         self._cache: dict = {}
@@ -612,10 +906,12 @@ class ArchiveDict(ArchiveItem):
         if not self._full_loaded:
             self._full_loaded = True
             if self._fast_loading and self._pos:
-                self._cache = self._read(*self._pos)
+                self._cache = Utility.unpackb(self._readb(*self._pos))
             else:
                 for k in self:
                     self._cache[k] = to_json(self[k])
+                if self._ndarray:
+                    self._cache = _ndarray_to_list(self._cache)
 
         return self._cache
 
@@ -626,19 +922,40 @@ class ArchiveReader(ArchiveItem):
         file_or_path: str | BytesIO,
         use_blocked_toc: bool = True,
         counter: ArchiveReadCounter = None,
+        use_mmap: bool = None,
+        thread_safe: bool = False,
+        ndarray: bool = False,
     ):
         self._file_or_path: str | BytesIO = file_or_path
 
+        if use_mmap is None:
+            use_mmap = config.archive.use_mmap
+
+        f: PositionalFile
         if isinstance(self._file_or_path, str):
-            f = open(
-                self._file_or_path, 'rb', buffering=config.archive.read_buffer_size
-            )
+            f = None  # type: ignore
+            if use_mmap and mmap_supported(self._file_or_path):
+                try:
+                    f = MappedFile(self._file_or_path)
+                except (OSError, ValueError):
+                    # e.g. empty files or file systems without mmap support
+                    pass
+            if f is None and thread_safe:
+                f = PositionalFile(self._file_or_path)
+            if f is None:
+                f = SeekableFile(
+                    open(  # type: ignore
+                        self._file_or_path,
+                        'rb',
+                        buffering=config.archive.read_buffer_size,
+                    )
+                )
         elif isinstance(self._file_or_path, BytesIO):
-            f = self._file_or_path
+            f = SeekableFile(self._file_or_path)
         else:
             raise ValueError('not a file or path')
 
-        super().__init__(f, counter=counter)
+        super().__init__(f, counter=counter, ndarray=ndarray)
 
         self._cache: dict = {}
         self._full_cache: dict = None  # type: ignore
@@ -769,6 +1086,76 @@ class ArchiveReader(ArchiveItem):
 
         return self._cache[key]
 
+    def read_many(
+        self, keys: Iterable[str]
+    ) -> Generator[tuple[str, ArchiveDict | None], None, None]:
+        """
+        Reads the archives of many entries at once. The positions of all entries are
+        resolved first, the entries are then read in the order of their position in the
+        file. Entries that are adjacent in the file are read with a single read of
+        at most `config.archive.coalesce_read_size` bytes. Larger entries are
+        read lazily like with `__getitem__`.
+
+        Yields tuples of the given key and the entry archive, or `None` if the entry
+        does not exist. The tuples are yielded in the order of the file positions,
+        not in the order of the given keys.
+        """
+        positions: list[tuple[int, int, str, tuple]] = []
+        for key in keys:
+            adjusted_key = utils.adjust_uuid_size(key)
+            if self._full_cache is not None or adjusted_key in self._cache:
+                yield key, self.get(adjusted_key)
+                continue
+
+            try:
+                toc_position, data_position = self._locate_position(adjusted_key)
+            except KeyError:
+                yield key, None
+                continue
+
+            positions.append(
+                (toc_position[0], data_position[1], key, (toc_position, data_position))
+            )
+
+        positions.sort()
+
+        def _read_block(block: list[tuple[int, int, str, tuple]]):
+            start, end = block[0][0], block[-1][1]
+            block_file = _BlockFile(self._direct_read(end - start, start), start)
+            item = ArchiveItem(block_file, counter=self._counter, ndarray=self._ndarray)
+            for _, _, key, (toc_position, data_position) in block:
+                yield key, item._child(item._read(*toc_position), data_position[0])
+
+        block: list[tuple[int, int, str, tuple]] = []
+        for position in positions:
+            start, end, key, (toc_position, data_position) = position
+            if block and (
+                start - block[-1][1] > config.archive.coalesce_gap_size
+                or end - block[0][0] > config.archive.coalesce_read_size
+            ):
+                yield from _read_block(block)
+                block = []
+
+            if end - start > config.archive.coalesce_read_size:
+                yield key, self._child(self._read(*toc_position), data_position[0])
+            else:
+                block.append(position)
+
+        if block:
+            yield from _read_block(block)
+
+    def read_detached(self, key: str) -> ArchiveDict:
+        """
+        Reads the archive of the given entry into memory with a single read. Contrary
+        to `__getitem__`, the archive remains readable after the reader was closed.
+        The data is still only decoded when it is accessed.
+        """
+        toc_position, data_position = self._locate_position(utils.adjust_uuid_size(key))
+        start, end = toc_position[0], data_position[1]
+        block_file = _BlockFile(bytes(self._direct_read(end - start, start)), start)
+        item = ArchiveItem(block_file, counter=self._counter, ndarray=self._ndarray)
+        return item._child(item._read(*toc_position), data_position[0])
+
     def get_raw(self, key: str) -> tuple[dict, Generator]:
         """
         Get raw bytes of the data and the TOC of the entry.
@@ -843,17 +1230,271 @@ class ArchiveReader(ArchiveItem):
         return self._full_cache
 
 
-def combine_archive(path: str, n_entries: int, data: Iterable[tuple]):
-    with ArchiveWriter(path, n_entries, toc_depth=config.archive.toc_depth) as writer:
-        for uuid, reader in data:
-            if not reader:
-                writer.add(uuid, {})
-            elif isinstance(reader, ArchiveReader):
-                toc, data = reader.get_raw(uuid)
-                writer.add_raw(uuid, toc, data)
+class _CheckedOutReader(ArchiveReader):
+    """
+    The handle of one checkout of a reader from an :class:`ArchiveReaderCache`. It
+    shares the decoded TOC with the cached reader, but reads through its own view of
+    the file and keeps its own entries. Closing the handle hands the cached reader back
+    to the cache, closing it again has no effect.
+    """
+
+    def __init__(self, reader: ArchiveReader, release: Callable[[ArchiveReader], None]):
+        # the reader is already open, its state is shared instead of read again
+        self.__dict__.update(reader.__dict__)
+        self._reader: ArchiveReader | None = reader
+        self._release: Callable[[ArchiveReader], None] = release
+        self._f = _CheckedOutFile(reader._f)
+        self._cache = {}
+        self._full_cache = None  # type: ignore
+        self._accessed_items = 0
+
+    def close(self, close_unowned: bool = False):
+        if self._reader is None:
+            return
+
+        reader, self._reader = self._reader, None
+        self._f.close()
+        if reader._toc_entry is None:
+            reader._toc_entry = self._toc_entry
+        self._release(reader)
+
+    def is_closed(self):
+        return self._reader is None
+
+
+class ArchiveReaderCache:
+    """
+    A size-bounded LRU cache of open archive readers.
+
+    Readers are keyed by their file path and the identity of the file (inode, size and
+    modification time), files that are replaced on disk are hence never served from
+    the cache. Each reader keeps its decoded TOC blocks, repeated reads from the same
+    file skip opening the file and decoding the TOC.
+
+    Readers are checked out exclusively. :meth:`get` returns a new handle for each
+    checkout, closing the handle hands the reader back to the cache. A closed handle
+    stays closed, even if its reader is checked out again. The file is closed once the
+    reader is evicted or invalidated. The entries that were read during a checkout are
+    not kept and cannot be read any further once the reader is handed back. An optional
+    `group` (e.g. the upload id) allows to invalidate all readers of files that belong
+    together.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._readers: OrderedDict[tuple, ArchiveReader] = OrderedDict()
+        self._lock = threading.Lock()
+        # keys of the readers that are currently checked out, by reader id
+        self._checked_out: dict[int, tuple] = {}
+
+    def get(
+        self, path: str, group: str = None, use_blocked_toc: bool = True
+    ) -> ArchiveReader | LegacyArchiveReader:
+        """
+        Returns an open reader for the given archive file, either from the cache or
+        newly opened. Raises `FileNotFoundError` if the file does not exist.
+        """
+        stat = os.stat(path)
+        key = (
+            group,
+            path,
+            use_blocked_toc,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+
+        with self._lock:
+            reader = self._readers.pop(key, None)
+            if reader is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if reader is None:
+            with open(path, 'rb') as f:
+                magic = f.read(ArchiveWriter.magic_len)
+
+            if magic != ArchiveWriter.magic:
+                # readers of the legacy format are not cached
+                from nomad.archive.storage import read_archive
+
+                return read_archive(path, use_blocked_toc=use_blocked_toc)
+
+            reader = ArchiveReader(
+                path, use_blocked_toc=use_blocked_toc, thread_safe=True
+            )
+
+        with self._lock:
+            self._checked_out[id(reader)] = key
+
+        return _CheckedOutReader(reader, self._release)
+
+    def _release(self, reader: ArchiveReader):
+        evicted: list[ArchiveReader] = []
+        with self._lock:
+            key = self._checked_out.pop(id(reader), None)
+            if key is None or key in self._readers or self.max_size <= 0:
+                # another reader for the same file was handed back first,
+                # or the file was invalidated in the meantime
+                evicted.append(reader)
             else:
-                # rare case, old reader new writer, toc is not compatible, has to repack
-                writer.add(uuid, to_json(reader[uuid]))
+                self._readers[key] = reader
+                while len(self._readers) > self.max_size:
+                    evicted.append(self._readers.popitem(last=False)[1])
+
+        for evicted_reader in evicted:
+            evicted_reader.close()
+
+    def invalidate(self, group: str = None):
+        """
+        Closes and removes all cached readers of the given group, or all cached readers
+        if no group is given.
+        """
+        with self._lock:
+            for reader_id, key in list(self._checked_out.items()):
+                if group is None or key[0] == group:
+                    # checked out readers are closed when they are handed back
+                    del self._checked_out[reader_id]
+            keys = [key for key in self._readers if group is None or key[0] == group]
+            evicted = [self._readers.pop(key) for key in keys]
+
+        for reader in evicted:
+            reader.close()
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return dict(size=len(self._readers), hits=self.hits, misses=self.misses)
+
+
+def _add_from_reader(writer: ArchiveWriter, uuid: str, reader):
+    if not reader:
+        writer.add(uuid, {})
+    elif isinstance(reader, ArchiveReader):
+        toc, data = reader.get_raw(uuid)
+        writer.add_raw(uuid, toc, data)
+    else:
+        # rare case, old reader new writer, toc is not compatible, has to repack
+        writer.add(uuid, to_json(reader[uuid]))
+
+
+def _load_source(uuid: str, path: str) -> tuple:
+    """
+    Reads and validates the archive of a single entry from its own archive file.
+    Returns a tuple of the kind of the result and the data to write:
+    `raw` with the TOC and the pre-encoded bytes that can be copied as they are,
+    `json` with the decoded archive that has to be re-encoded, or `file` if the
+    entry is too large to be loaded in advance.
+    """
+    from nomad.archive.storage import read_archive
+
+    with read_archive(path) as reader:
+        if not isinstance(reader, ArchiveReader):
+            return 'json', to_json(reader[uuid])
+
+        toc_position, data_position = reader._locate_position(
+            utils.adjust_uuid_size(uuid)
+        )
+        start, end = data_position
+        if end - start > config.archive.copy_chunk_size:
+            return 'file', None
+
+        toc = reader._read(*toc_position)
+        data = reader._direct_read(end - start, start)
+        if len(data) != end - start or toc['pos'][1] - toc['pos'][0] != len(data):
+            # the TOC does not match the data, the archive has to be repacked
+            return 'json', to_json(reader[uuid])
+
+        return 'raw', (toc, bytes(data))
+
+
+def combine_archive(
+    path: str,
+    n_entries: int,
+    data: Iterable[tuple],
+    *,
+    workers: int = None,
+    logger=None,
+):
+    """
+    Combines the archives of many entries into a single archive file.
+
+    The `data` yields tuples of entry id and either the path to the entry's own archive
+    file, an open reader, or `None` for entries without archive. Archive files that are
+    given by path are read and validated by a pool of `workers` threads, while the
+    entries are written in the given order. Pre-encoded data is copied as it is, whenever
+    the TOC of the source archive can be reused.
+    """
+    if workers is None:
+        workers = config.archive.combine_workers
+
+    progress_interval = max(1, n_entries // 10)
+    start_time = time.time()
+    n_written, n_bytes = 0, 0
+
+    def _report_progress(final: bool = False):
+        if logger is None:
+            return
+        if not final and n_written % progress_interval != 0:
+            return
+
+        duration = time.time() - start_time
+        logger.info(
+            'combined archives' if final else 'combining archives',
+            number_of_entries=n_entries,
+            entries_written=n_written,
+            bytes_written=n_bytes,
+            entries_per_second=n_written / duration if duration else None,
+            bytes_per_second=n_bytes / duration if duration else None,
+        )
+
+    with (
+        ArchiveWriter(path, n_entries, toc_depth=config.archive.toc_depth) as writer,
+        ThreadPoolExecutor(max_workers=max(1, workers)) as executor,
+    ):
+
+        def _write(uuid: str, source, source_path: str = None):
+            nonlocal n_written, n_bytes
+            position = writer._pos
+
+            if isinstance(source, Future):
+                kind, value = source.result()
+                if kind == 'raw':
+                    writer.add_raw(uuid, *value)
+                elif kind == 'json':
+                    writer.add(uuid, value)
+                else:
+                    with ArchiveReader(source_path) as reader:
+                        _add_from_reader(writer, uuid, reader)
+            else:
+                _add_from_reader(writer, uuid, source)
+
+            n_written += 1
+            n_bytes += writer._pos - position
+            _report_progress()
+
+        # a bounded window of pending reads keeps the memory usage in check
+        pending: deque = deque()
+        for uuid, source in data:
+            if isinstance(source, str):
+                pending.append(
+                    (uuid, executor.submit(_load_source, uuid, source), source)
+                )
+                while len(pending) > 2 * max(1, workers):
+                    _write(*pending.popleft())
+            else:
+                # open readers are only valid until the next item is requested
+                while pending:
+                    _write(*pending.popleft())
+                _write(uuid, source)
+
+        while pending:
+            _write(*pending.popleft())
+
+    _report_progress(final=True)
 
 
 def write_archive(
@@ -45,7 +45,7 @@ from ase.utils import pbc2pbc
 from nptyping import NDArray
 from scipy.spatial import Voronoi  # pylint: disable=no-name-in-module
 
-from nomad.aflow_prototypes import aflow_prototypes
+from nomad.aflow_prototypes import get_aflow_prototype
 from nomad.constants import atomic_masses
 
 valid_elements = set(ase.data.chemical_symbols[1:])
@@ -788,16 +788,7 @@ def search_aflow_prototype(space_group: int, norm_wyckoff: dict) -> dict:
     Returns:
         Dictionary containing the AFLOW prototype information.
     """
-    structure_type_info = None
-    type_descriptions: Any = aflow_prototypes['prototypes_by_spacegroup'].get(
-        space_group, []
-    )
-    for type_description in type_descriptions:
-        current_norm_wyckoffs = type_description.get('normalized_wyckoff_matid')
-        if current_norm_wyckoffs and current_norm_wyckoffs == norm_wyckoff:
-            structure_type_info = type_description
-            break
-    return structure_type_info
+    return get_aflow_prototype(space_group, norm_wyckoff)
 
 
 def get_brillouin_zone(reciprocal_lattice: NDArray[Any]) -> dict:
@@ -257,7 +257,7 @@ def nginx_conf(prefix, host, port, server):
 
 
 @ops.command(
-    help='Updates the AFLOW prototype information using the latest online version and writes the results to a python module in the given FILEPATH.'
+    help='Updates the AFLOW prototype information using the latest online version and writes the results to a library file in the given FILEPATH. The shipped library is nomad/aflow_prototypes.msgpack.gz.'
 )
 @click.argument('FILEPATH', nargs=1, type=str)
 @click.option(
@@ -272,6 +272,42 @@ def prototypes_update(ctx, filepath, matches_only):
     update_prototypes(ctx, filepath, matches_only)
 
 
+@ops.command(
+    help='Updates the ids of the materials with the most entries using an ES terms aggregation and writes them to a numpy file in the given FILEPATH. The shipped file is nomad/normalizing/data/top_50k_material_ids.npy.'
+)
+@click.argument('FILEPATH', nargs=1, type=str)
+@click.option(
+    '--n-materials',
+    default=50000,
+    type=int,
+    help='Number of materials to write. Default is 50000.',
+)
+def top_materials_update(filepath, n_materials):
+    from nomad import infrastructure
+    from nomad.metainfo.elasticsearch_extension import entry_index
+    from nomad.normalizing.topology import MaterialIds
+
+    infrastructure.setup_elastic()
+
+    response = infrastructure.elastic_client.search(
+        index=entry_index.index_name,
+        body={
+            'size': 0,
+            'aggs': {
+                'material_ids': {
+                    'terms': {
+                        'field': 'results.material.material_id',
+                        'size': n_materials,
+                    }
+                }
+            },
+        },
+    )
+    buckets = response['aggregations']['material_ids']['buckets']
+    MaterialIds.write([bucket['key'] for bucket in buckets], filepath)
+    print(f'Wrote {len(buckets)} material ids to {filepath}.')
+
+
 @ops.command(
     help='Updates the springer database in nomad.config.normalize.springer_db_path.'
 )
@@ -32,7 +32,6 @@ import time
 import typing
 import io
 import re
-import uuid
 import json
 import numpy as np
 import ase
@@ -40,6 +39,7 @@ import bs4
 import matid  # pylint: disable=import-error
 
 from nomad import atomutils, client, processing as proc
+from nomad.aflow_prototypes import read_aflow_prototypes, write_aflow_prototypes
 from nomad.config import config
 from nomad.client import api, upload_file
 
@@ -533,75 +533,9 @@ class DbUpdater:
             self.download()
 
 
-def write_prototype_data_file(aflow_prototypes: dict, filepath) -> None:
-    """Writes the prototype data file in a compressed format to a python
-    module.
-
-    Args:
-        aflow_prototypes
-    """
-
-    class NoIndent(object):
-        def __init__(self, value):
-            self.value = value
-
-    class NoIndentEncoder(json.JSONEncoder):
-        """A custom JSON encoder that can pretty-print objects wrapped in the
-        NoIndent class.
-        """
-
-        def __init__(self, *args, **kwargs):
-            super(NoIndentEncoder, self).__init__(*args, **kwargs)
-            self.kwargs = dict(kwargs)
-            del self.kwargs['indent']
-            self._replacement_map = {}
-
-        def default(self, o):  # pylint: disable=E0202
-            if isinstance(o, NoIndent):
-                key = uuid.uuid4().hex
-                self._replacement_map[key] = json.dumps(o.value, **self.kwargs)
-                return '@@%s@@' % (key,)
-            else:
-                return super(NoIndentEncoder, self).default(o)
-
-        def encode(self, o):
-            result = super(NoIndentEncoder, self).encode(o)
-            for k, v in self._replacement_map.items():
-                result = result.replace('"@@%s@@"' % (k,), v)
-            return result
-
-    prototype_dict = aflow_prototypes['prototypes_by_spacegroup']
-    for prototypes in prototype_dict.values():
-        for prototype in prototypes:
-            # Save the information back in a prettified form
-            prototype['atom_positions'] = NoIndent(prototype['atom_positions'])
-            prototype['atom_labels'] = NoIndent(prototype['atom_labels'])
-            prototype['lattice_vectors'] = NoIndent(prototype['lattice_vectors'])
-            try:
-                prototype['normalized_wyckoff_matid'] = NoIndent(
-                    prototype['normalized_wyckoff_matid']
-                )
-            except KeyError:
-                pass
-
-    # Save the updated data
-    with io.open(filepath, 'w', encoding='utf8') as f:
-        json_dump = json.dumps(
-            aflow_prototypes,
-            ensure_ascii=False,
-            indent=4,
-            sort_keys=True,
-            cls=NoIndentEncoder,
-        )
-        json_dump = re.sub(
-            r'\"(-?\d+(?:[\.,]\d+)?)\"', r'\1', json_dump
-        )  # Removes quotes around numbers
-        f.write('aflow_prototypes = {}\n'.format(json_dump))
-
-
 def update_prototypes(ctx, filepath, matches_only):
     if matches_only:
-        from nomad.aflow_prototypes import aflow_prototypes
+        aflow_prototypes = read_aflow_prototypes()
     else:
         # The basic AFLOW prototype data is available in a Javascript file. Here we
         # retrieve it and read only the prototype list from it.
@@ -753,5 +687,5 @@ def update_prototypes(ctx, filepath, matches_only):
         )
     )
 
-    # Write data file to the specified path
-    write_prototype_data_file(aflow_prototypes, filepath)
+    # Write library file to the specified path
+    write_aflow_prototypes(aflow_prototypes, filepath)
@@ -18,6 +18,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from asyncio import Semaphore
 from itertools import islice
 from typing import Any, Union
@@ -441,36 +442,68 @@ class ArchiveQuery:
 
             self._accumulated_requests += 1
 
-            response = await session.post(
-                self._download_url, json=request, headers=self._auth.headers()
-            )
-            bar.update(len(entry_ids))
-            for item in ids:
-                self._entries.remove(item)
+            async with session.stream(
+                'POST',
+                self._download_url,
+                json=request,
+                headers={**self._auth.headers(), 'Accept': 'application/x-ndjson'},
+            ) as response:
+                bar.update(len(entry_ids))
+                for item in ids:
+                    self._entries.remove(item)
 
-            if response.status_code >= 400:
-                print(
-                    f'Request returns {response.status_code}, will retry in the next download call...'
-                )
-                self._entries.extend(ids)
-                return None
-
-            # successfully downloaded data
-            results: list = []
-
-            response_json: list = response.json()['data']
-
-            for index in range(len(ids)):
-                entry_id, upload_id = ids[index]
-                context = ClientContext(self._url, upload_id=upload_id, auth=self._auth)
-                result = EntryArchive.m_from_dict(
-                    response_json[index]['archive'], m_context=context
-                )
-
-                if not result:
-                    print(f'No result returned for id {entry_id}, is the query proper?')
+                if response.status_code >= 400:
+                    print(
+                        f'Request returns {response.status_code}, will retry in the next download call...'
+                    )
+                    self._entries.extend(ids)
+                    return None
+
+                # successfully downloaded data
+                results: list = []
+                upload_ids = dict(ids)
+
+                def add_result(entry: dict):
+                    context = ClientContext(
+                        self._url,
+                        upload_id=upload_ids.get(entry['entry_id']),
+                        auth=self._auth,
+                    )
+                    result = EntryArchive.m_from_dict(
+                        entry['archive'], m_context=context
+                    )
+
+                    if not result:
+                        print(
+                            f'No result returned for id {entry["entry_id"]}, is the query proper?'
+                        )
 
-                results.append(result)
+                    results.append(result)
+
+                if not response.headers.get('content-type', '').startswith(
+                    'application/x-ndjson'
+                ):
+                    # the server does not support streaming
+                    await response.aread()
+                    for entry in response.json()['data']:
+                        add_result(entry)
+                    return results
+
+                # the first line is the response without data, the following lines
+                # are the entries, they are processed as soon as they are received
+                is_first_line = True
+                async for line in response.aiter_lines():
+                    if is_first_line or not line:
+                        is_first_line = False
+                        continue
+                    entry = json.loads(line)
+                    if 'detail' in entry:
+                        print(
+                            f'Request fails with {entry["detail"]}, will retry in the next download call...'
+                        )
+                        self._entries.extend(ids)
+                        return None
+                    add_result(entry)
 
             return results
 
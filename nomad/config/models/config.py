@@ -176,6 +176,38 @@ class Services(ConfigBaseModel):
         Page-after-value-based pagination is independent and can be used without limitations.
     """,
     )
+    archive_read_workers = Field(
+        4,
+        description="""
+        The number of threads per app worker process that read archives for the
+        `entries/archive/query` API. The archives of different uploads on the same page are
+        read concurrently. Set to 0 to use the default thread pool of the app server.
+    """,
+    )
+    graph_concurrency = Field(
+        8,
+        description="""
+        The maximum number of blocking reads (archives, mongo and elasticsearch queries)
+        a single `graph` API request performs concurrently. Independent keys and list
+        items of the request are read concurrently. Set to 1 to read sequentially.
+    """,
+    )
+    graph_archive_cache_size = Field(
+        256 * 1024**2,
+        description="""
+        The maximum total size in bytes of the archives a single `graph` API request
+        keeps for reuse. Archives that are visited repeatedly, e.g. through references,
+        and their resolved reference targets are only read once. Least recently used
+        archives are evicted first. Set to 0 to disable.
+    """,
+    )
+    graph_debug_info = Field(
+        False,
+        description="""
+        Include debug information, e.g. the archive cache statistics, as `m_debug` in
+        the responses of the `graph` API.
+    """,
+    )
     unavailable_value = Field(
         'unavailable',
         description="""
@@ -346,6 +378,7 @@ CELERY_QUEUE_ROUTING = 'queue'
 class Celery(ConfigBaseModel):
     max_memory = 64e6  # 64 GB
     timeout = 1800  # 1/2 h
+    batch_timeout = 4 * 3600  # the timeout of a batch of processes, at least timeout
     acks_late = False
     routing = CELERY_QUEUE_ROUTING
     priorities = {
@@ -410,6 +443,24 @@ class Elastic(ConfigBaseModel):
     entries_per_material_cap = 1000
     entries_index = 'nomad_entries_v1'
     materials_index = 'nomad_materials_v1'
+    search_cache_size: int = Field(
+        0,
+        description="""
+        The maximum number of search responses that are cached by each API worker.
+        With 0, search responses are not cached.
+    """,
+    )
+    search_cache_ttl: float = Field(
+        10,
+        description="""
+        The time in seconds a search response is cached. Index modifications by other
+        processes, e.g. processing workers, only become visible after this time.
+    """,
+    )
+    search_cache_owners: List[str] = Field(
+        ['public'],
+        description='The search owner values for which responses are cached.',
+    )
     username: Optional[str]
     password: Optional[str]
 
@@ -692,6 +743,65 @@ class Process(ConfigBaseModel):
     metadata_file_extensions = ('json', 'yaml', 'yml')
     auxfile_cutoff = 100
     parser_matching_size = 150 * 80  # 150 lines of 80 ASCII characters per line
+    matching_workers: int = Field(
+        4,
+        description="""
+        The number of threads used to match the files of an upload to parsers. Matching
+        is mostly I/O bound; more threads help to hide the latency of network file systems.
+        With 1 or less, files are matched sequentially.
+    """,
+    )
+    matching_insert_batch_size: int = Field(
+        1000,
+        description='The number of newly matched entries that are inserted into mongo at once.',
+    )
+    lazy_referenced_archives: bool = Field(
+        False,
+        description="""
+        Archives that are loaded to resolve references between entries are deserialized
+        lazily. Sections and quantities are only read and normalized when they are
+        accessed for the first time.
+    """,
+    )
+    entry_batch_size: int = Field(
+        1,
+        description="""
+        The number of entries that are processed by one celery task. Batches reduce the
+        scheduling overhead for uploads with many small entries. With 1 or less, each
+        entry is processed by its own task.
+    """,
+    )
+    entry_batch_bytes: int = Field(
+        64 * 1024**2,
+        description='The maximum summed size of the mainfiles of one batch of entries.',
+    )
+    entry_batch_parsers: Dict[str, int] = Field(
+        {},
+        description="""
+        Parser specific batch sizes by parser name, overriding `entry_batch_size`.
+    """,
+    )
+    index_buffer_entries: int = Field(
+        1,
+        description="""
+        The number of entry index documents a processing worker buffers before they are
+        sent to elasticsearch with one bulk request. With 1 or less (default), each entry
+        is indexed right away. With buffering, an entry completes processing with SUCCESS
+        before its document is indexed. If indexing the document fails later, the entry
+        is set to FAILURE.
+    """,
+    )
+    index_buffer_bytes: int = Field(
+        10 * 1024**2,
+        description='The size of buffered entry index documents that causes a flush.',
+    )
+    index_buffer_delay: float = Field(
+        5,
+        description="""
+        The maximum time in seconds an entry index document stays buffered before it is
+        sent to elasticsearch.
+    """,
+    )
     max_upload_size = 32 * (1024**3)
     use_empty_parsers = False
     redirect_stdouts: bool = Field(
@@ -717,6 +827,7 @@ class Reprocess(ConfigBaseModel):
     add_matched_entries_to_published = True
     delete_unmatched_published_entries = False
     index_individual_entries = False
+    skip_unchanged_entries = False  # only applies without rematch_published
 
 
 class RFC3161Timestamp(ConfigBaseModel):
@@ -912,6 +1023,61 @@ class Archive(ConfigBaseModel):
         To identify numerical lists.
         """,
     )
+    ndarray_ext = Field(
+        False,
+        description="""
+        If enabled, numerical numpy arrays are written into entry archives as typed binary
+        data (a msgpack extension type with dtype and shape) instead of nested lists.
+        Archive readers decode them into lists, unless arrays are explicitly requested,
+        so that all JSON outputs remain unchanged. Archives written with this option
+        cannot be read by older versions.
+        """,
+    )
+    combine_workers = Field(
+        4,
+        description="""
+        The number of threads that read and validate the archives of individual entries
+        when they are combined into the archive file of a published upload.
+        """,
+    )
+    coalesce_read_size = Field(
+        16 * 2**20,
+        description="""
+        When reading many entries at once, entries that are adjacent in the archive file
+        are read together with reads of up to this size. Larger entries are read lazily.
+        """,
+    )
+    coalesce_gap_size = Field(
+        4 * 2**10,
+        description="""
+        When reading many entries at once, entries that are separated by at most this
+        number of bytes are considered adjacent and read together.
+        """,
+    )
+    use_mmap = Field(
+        False,
+        description="""
+        When enabled, archive files are memory-mapped instead of being read with buffered I/O.
+        Reads then become slices of the mapped file that are decoded without intermediate copies.
+        """,
+    )
+    reader_cache_size = Field(
+        32,
+        description="""
+        The number of open archive readers of published uploads that are kept in a
+        process-wide LRU cache. Cached readers keep their decoded TOC, repeated reads
+        from the same upload skip opening the file and decoding the TOC. Decoded entries
+        are not cached.
+        Set to 0 to disable the cache.
+        """,
+    )
+    mmap_unsafe_filesystems: List[str] = Field(
+        ['gpfs'],
+        description="""
+        File system types (as listed in `/proc/mounts`) on which memory-mapping is considered unsafe.
+        Archive files on these file systems are always read with buffered I/O.
+        """,
+    )
 
 
 class Config(ConfigBaseModel):
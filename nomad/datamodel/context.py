@@ -302,8 +302,15 @@ class ServerContext(Context):
         try:
             with upload_files.read_archive(entry_id) as reader:
                 from nomad.archive import to_json
+                from nomad.archive.storage_v2 import ArchiveReader
 
-                archive_dict = to_json(reader[entry_id])
+                lazy = config.process.lazy_referenced_archives and isinstance(
+                    reader, ArchiveReader
+                )
+                if lazy:
+                    archive_data = reader.read_detached(entry_id)
+                else:
+                    archive_data = to_json(reader[entry_id])
         except KeyError:
             if upload_id != self.upload_id:
                 raise MetainfoReferenceError(
@@ -321,7 +328,7 @@ class ServerContext(Context):
 
             context = ServerContext(Upload(upload_id=upload_id))
 
-        return EntryArchive.m_from_dict(archive_dict, m_context=context)
+        return EntryArchive.m_from_dict(archive_data, m_context=context, lazy=lazy)
 
     def load_raw_file(
         self, path: str, upload_id: str, installation_url: str, url: str = None
@@ -46,8 +46,10 @@ original mainfile, and vice versa.
 from __future__ import annotations
 
 from abc import ABCMeta
+from collections import OrderedDict
 from typing import (
     IO,
+    TYPE_CHECKING,
     Set,
     Dict,
     Iterable,
@@ -57,6 +59,8 @@ from typing import (
     Any,
     NamedTuple,
     Callable,
+    Optional,
+    Union,
 )
 from pydantic import BaseModel
 from datetime import datetime
@@ -64,21 +68,34 @@ import os.path
 import os
 import shutil
 import tarfile
+import threading
+import time
 import zipstream
 import hashlib
 import io
 import json
 import yaml
 import magic
+import mmap
+import struct
 import zipfile
 
+import numpy as np
+
 from nomad import utils, datamodel
 from nomad.common import get_compression_format, extract_file
 from nomad.config import config
-from nomad.archive.storage_v2 import combine_archive
+from nomad.archive.storage_v2 import (
+    combine_archive,
+    ArchiveReaderCache,
+    ArchiveReader as ArchiveReaderV2,
+)
 from nomad.config.models.config import BundleImportSettings, BundleExportSettings
 from nomad.archive import write_archive, read_archive, ArchiveReader, to_json
 
+if TYPE_CHECKING:
+    from nomad.archive import RequiredReader
+
 bundle_info_filename = 'bundle_info.json'
 
 # Used to check if zip-files/archive files are empty
@@ -87,6 +104,9 @@ empty_zip_file_size = 22
 empty_hdf5_file_size = 96
 empty_archive_file_size = 32
 
+# Process-wide cache of open archive readers of published uploads
+archive_reader_cache = ArchiveReaderCache(config.archive.reader_cache_size)
+
 
 def copytree(src, dst):
     """
@@ -246,6 +266,75 @@ class DirectoryObject(PathObject):
         return os.path.isdir(self.os_path)
 
 
+# Files modified more recently than this might still be modified without a change in
+# their modification time, e.g. on file systems with a coarse time resolution.
+_racy_interval_ns = 2 * 10**9
+
+_directory_files_cache: OrderedDict[str, Tuple[Tuple[int, int], List[str]]] = (
+    OrderedDict()
+)
+_directory_files_cache_size = 64
+_directory_files_lock = threading.Lock()
+
+
+def _directory_files(directory: str) -> List[str]:
+    """
+    Returns the sorted names of all files in the given directory. Listings are cached
+    per process and reused as long as the directory's inode and modification time do not
+    change, i.e. no files were added, removed, or renamed.
+    """
+    stat = os.stat(directory)
+    key = (stat.st_ino, stat.st_mtime_ns)
+    with _directory_files_lock:
+        cached = _directory_files_cache.get(directory)
+        if cached is not None and cached[0] == key:
+            _directory_files_cache.move_to_end(directory)
+            return cached[1]
+
+    with os.scandir(directory) as dir_entries:
+        names = sorted(
+            dir_entry.name for dir_entry in dir_entries if dir_entry.is_file()
+        )
+
+    if time.time_ns() - stat.st_mtime_ns > _racy_interval_ns:
+        with _directory_files_lock:
+            _directory_files_cache[directory] = (key, names)
+            while len(_directory_files_cache) > _directory_files_cache_size:
+                _directory_files_cache.popitem(last=False)
+
+    return names
+
+
+def _select_entry_files(
+    mainfile: str,
+    directory: str,
+    directory_files: List[str],
+    with_mainfile: bool = True,
+    with_cutoff: bool = True,
+) -> List[str]:
+    """
+    Selects the files of an entry from the sorted names of all files in the mainfile's
+    directory. This implements nomad's logic about what is part of an entry and what
+    not. The mainfile is the first element, the rest is sorted.
+    """
+    mainfile_basename = os.path.basename(mainfile)
+    aux_files = [
+        os.path.join(directory, name)
+        for name in directory_files
+        if name != mainfile_basename
+    ]
+    if with_cutoff:
+        # If there are too many of them, its probably just a directory with lots of
+        # mainfiles/entries. In this case it does not make any sense to provide thousands of
+        # aux files.
+        aux_files = aux_files[: config.process.auxfile_cutoff + 1]
+
+    if with_mainfile:
+        return [mainfile] + aux_files
+    else:
+        return aux_files
+
+
 class RawPathInfo(NamedTuple):
     """
     Stores basic info about a file or folder located at a specific raw path.
@@ -257,6 +346,199 @@ class RawPathInfo(NamedTuple):
     access: str
 
 
+class RawDirectoryIndex:
+    """
+    A compact index of all files and directories in a raw zip file. The index is
+    stored as a sidecar file next to the zip file and memory-mapped when used, which
+    avoids parsing the zip directory for every new :class:`PublicUploadFiles`.
+
+    The index holds the paths, sizes, CRC-32 checksums, and types of all files and directories sorted by
+    their path components. This puts every directory directly in front of its contents.
+    For each path, the index of the first path after its subtree is stored, which allows
+    to list directories without visiting deeper levels. Paths are found by binary search.
+
+    File layout (little endian): magic, header (number of paths, zip file size, zip
+    file mtime in ns), path offsets (uint64, n + 1), sizes (uint64, n), subtree
+    ends (uint64, n), CRC-32 checksums (uint32, n), file flags (uint8, n), utf-8
+    encoded paths.
+    """
+
+    magic: bytes = b'nomad-raw-index-v2'
+    _header = struct.Struct('<QQQ')
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        offset = len(self.magic)
+        self._n, self.zip_size, self.zip_mtime = self._header.unpack_from(
+            buffer, offset
+        )
+        offset += self._header.size
+
+        def _array(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes
+            return array
+
+        self._offsets = _array('<u8', self._n + 1)
+        self._sizes = _array('<u8', self._n)
+        self._ends = _array('<u8', self._n)
+        self._crc32 = _array('<u4', self._n)
+        self._is_file = _array('u1', self._n)
+        self._paths_offset = offset
+
+    def __len__(self):
+        return self._n
+
+    @classmethod
+    def create(cls, zip_path: str) -> bytes:
+        """Creates the index data for the given zip file."""
+        entries: Dict[str, Tuple[int, bool]] = {}
+        crc32: Dict[str, int] = {}
+        stat = os.stat(zip_path)
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                path = info.filename
+                file_name = os.path.basename(path)
+                directory_path = os.path.dirname(path)
+                size = info.file_size if file_name else 0
+
+                if directory_path:
+                    # Ensure that all parent directories are added
+                    sub_path = ''
+                    for directory in directory_path.split(os.path.sep):
+                        sub_path = os.path.join(sub_path, directory)
+                        entries[sub_path] = (
+                            entries.get(sub_path, (0, False))[0] + size,
+                            False,
+                        )
+
+                if file_name:
+                    entries[path] = (size, True)
+                    crc32[path] = info.CRC
+
+        paths = sorted(entries, key=lambda path: path.split(os.path.sep))
+        n = len(paths)
+
+        # determine the end of each path's subtree
+        ends = np.arange(1, n + 1, dtype='<u8')
+        open_directories: List[int] = []
+        for i, path in enumerate(paths):
+            while open_directories and not path.startswith(
+                paths[open_directories[-1]] + os.path.sep
+            ):
+                ends[open_directories.pop()] = i
+            if not entries[path][1]:
+                open_directories.append(i)
+        for i in open_directories:
+            ends[i] = n
+
+        encoded_paths = [path.encode('utf-8') for path in paths]
+        offsets = np.zeros(n + 1, dtype='<u8')
+        np.cumsum([len(path) for path in encoded_paths], out=offsets[1:])
+
+        return b''.join(
+            [
+                cls.magic,
+                cls._header.pack(n, stat.st_size, stat.st_mtime_ns),
+                offsets.tobytes(),
+                np.array([entries[path][0] for path in paths], dtype='<u8').tobytes(),
+                ends.tobytes(),
+                np.array([crc32.get(path, 0) for path in paths], dtype='<u4').tobytes(),
+                np.array([entries[path][1] for path in paths], dtype='u1').tobytes(),
+                *encoded_paths,
+            ]
+        )
+
+    @classmethod
+    def write(cls, zip_path: str, index_path: str) -> bytes:
+        """Creates the index for the given zip file and writes it to the given path."""
+        data = cls.create(zip_path)
+        tmp_path = f'{index_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, index_path)
+        return data
+
+    @classmethod
+    def open(cls, zip_path: str, index_path: str) -> 'RawDirectoryIndex':
+        """
+        Opens the index of the given zip file. The index is (re-)created if it is
+        missing or does not match the zip file.
+        """
+        stat = os.stat(zip_path)
+        try:
+            with open(index_path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            index = cls(buffer)
+            if (
+                buffer[: len(cls.magic)] == cls.magic
+                and index.zip_size == stat.st_size
+                and index.zip_mtime == stat.st_mtime_ns
+            ):
+                return index
+        except (OSError, ValueError, struct.error):
+            pass
+
+        try:
+            return cls(cls.write(zip_path, index_path))
+        except OSError:
+            # e.g. a read-only file system, use the index without storing it
+            return cls(cls.create(zip_path))
+
+    @classmethod
+    def empty(cls) -> 'RawDirectoryIndex':
+        return cls(cls.magic + cls._header.pack(0, 0, 0) + np.zeros(1, '<u8').tobytes())
+
+    def path(self, i: int) -> str:
+        start = self._paths_offset + int(self._offsets[i])
+        end = self._paths_offset + int(self._offsets[i + 1])
+        return bytes(self._buffer[start:end]).decode('utf-8')
+
+    def is_file(self, i: int) -> bool:
+        return bool(self._is_file[i])
+
+    def size(self, i: int) -> int:
+        return int(self._sizes[i])
+
+    def crc32(self, i: int) -> int:
+        return int(self._crc32[i])
+
+    def path_info(self, i: int, access: str) -> RawPathInfo:
+        return RawPathInfo(
+            path=self.path(i),
+            is_file=self.is_file(i),
+            size=int(self._sizes[i]),
+            access=access,
+        )
+
+    def find(self, path: str) -> int | None:
+        """Returns the position of the given path, or `None` if it does not exist."""
+        key = path.split(os.path.sep)
+        low, high = 0, self._n
+        while low < high:
+            middle = (low + high) // 2
+            if self.path(middle).split(os.path.sep) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self._n and self.path(low) == path:
+            return low
+
+        return None
+
+    def children(self, i: int = None) -> Iterator[int]:
+        """
+        Yields the positions of the direct children of the directory at the given
+        position (or of the root directory), sorted by name.
+        """
+        child, end = (0, self._n) if i is None else (i + 1, int(self._ends[i]))
+        while child < end:
+            yield child
+            child = int(self._ends[child])
+
+
 class StreamedFile(BaseModel):
     """
     Convenience class for representing a streamed file, together with information about
@@ -746,6 +1028,21 @@ class UploadFiles(DirectoryObject, metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def entry_fingerprint(self, mainfile: str, mainfile_key: str) -> Optional[str]:
+        """
+        Returns a fingerprint of the files of the given entry that is cheap to compute
+        compared to the :func:`StagingUploadFiles.entry_hash`. As long as the fingerprint
+        does not change, the entry files and therefore the entry hash do not change.
+        Arguments:
+            mainfile: The mainfile path relative to the upload.
+            mainfile_key: The mainfile_key of the entry (if any)
+        Returns:
+            The fingerprint, or None if no reliable fingerprint can be determined.
+        Raises:
+            KeyError: If the mainfile does not exist.
+        """
+        raise NotImplementedError()
+
     def raw_file_mime_type(self, file_path: str) -> str:
         assert self.raw_path_is_file(
             file_path
@@ -770,11 +1067,38 @@ class UploadFiles(DirectoryObject, metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def read_many(
+        self, entry_ids: Iterable[str], required: RequiredReader = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Reads the archives of the given entries. If a :class:`RequiredReader` is given,
+        it is applied to each archive, otherwise the whole archive is read.
+        Yields tuples of entry id and the JSON serializable archive data, or `None`
+        for entries without archive. Implementations may yield the entries in a
+        different order than given, e.g. the order in which the archives are stored.
+        """
+        for entry_id in entry_ids:
+            try:
+                with self.read_archive(entry_id) as archive:
+                    yield (
+                        entry_id,
+                        self._apply_required(archive[entry_id], entry_id, required),
+                    )
+            except KeyError:
+                yield entry_id, None
+
+    def _apply_required(self, archive, entry_id: str, required: RequiredReader):
+        if required is None:
+            return to_json(archive)
+
+        return required.read_root(archive, entry_id, self.upload_id)
+
     def close(self):
         """Release possibly held system resources (e.g. file handles)."""
         pass
 
     def delete(self) -> None:
+        archive_reader_cache.invalidate(self.upload_id)
         shutil.rmtree(self.os_path, ignore_errors=True)
         if config.fs.prefix_size > 0:
             # If using prefix, also remove the parent directory if empty
@@ -1258,6 +1582,7 @@ class StagingUploadFiles(UploadFiles):
                     target_dir, entries, access, other_access
                 )
                 log_data.update(number_of_entries=number_of_entries)
+            archive_reader_cache.invalidate(self.upload_id)
 
         # zip raw files
         if include_raw:
@@ -1277,14 +1602,18 @@ class StagingUploadFiles(UploadFiles):
             for entry in entries:
                 archive_file = self._archive_file_object(entry.entry_id)
                 if archive_file.exists():
-                    with read_archive(archive_file.os_path) as archive:
-                        yield entry.entry_id, archive
+                    yield entry.entry_id, archive_file.os_path
                 else:
                     yield entry.entry_id, None
 
         try:
             file_object = PublicUploadFiles._create_msg_file_object(target_dir, access)
-            combine_archive(file_object.os_path, number_of_entries, create_iterator())
+            combine_archive(
+                file_object.os_path,
+                number_of_entries,
+                create_iterator(),
+                logger=self.logger,
+            )
             # Remove the file with the opposite access, if it exists
             other_file_object = PublicUploadFiles._create_msg_file_object(
                 target_dir, other_access
@@ -1297,10 +1626,11 @@ class StagingUploadFiles(UploadFiles):
 
             with h5py.File(file_object.os_path, 'w') as hdf5_target:
                 for entry in entries:
-                    with h5py.File(
-                        self.archive_hdf5_location(entry.entry_id), 'a'
-                    ) as hdf5_source:
-                        group = hdf5_target.create_group(entry.entry_id)
+                    group = hdf5_target.create_group(entry.entry_id)
+                    hdf5_location = self.archive_hdf5_location(entry.entry_id)
+                    if not os.path.exists(hdf5_location):
+                        continue
+                    with h5py.File(hdf5_location, 'r') as hdf5_source:
                         for key in hdf5_source.keys():
                             hdf5_source.copy(key, group)
             other_file_object = _create_archive_hdf5_file_object(
@@ -1333,12 +1663,25 @@ class StagingUploadFiles(UploadFiles):
                     raw_zip.write(
                         self._raw_dir.join_file(path_info.path).os_path, path_info.path
                     )
+            RawDirectoryIndex.write(
+                raw_zip_file_object.os_path,
+                PublicUploadFiles._create_raw_index_file_object(
+                    target_dir, access
+                ).os_path,
+            )
             # Remove the zip file with the opposite access, if it exists
             other_raw_zip_file_object = PublicUploadFiles._create_raw_zip_file_object(
                 target_dir, other_access
             )
             if other_raw_zip_file_object.exists():
                 other_raw_zip_file_object.delete()  # This file should be empty, if it exists
+            other_raw_index_file_object = (
+                PublicUploadFiles._create_raw_index_file_object(
+                    target_dir, other_access
+                )
+            )
+            if other_raw_index_file_object.exists():
+                other_raw_index_file_object.delete()
         except Exception as e:
             self.logger.error('exception during packing raw files', exc_info=e)
             raise
@@ -1358,33 +1701,30 @@ class StagingUploadFiles(UploadFiles):
         if not mainfile_object.exists():
             raise KeyError(mainfile)
 
-        mainfile_basename = os.path.basename(mainfile)
         entry_dir = os.path.dirname(mainfile_object.os_path)
         entry_relative_dir = entry_dir[len(self._raw_dir.os_path) + 1 :]
 
-        file_count = 0
-        aux_files: List[str] = []
-        dir_elements = os.listdir(entry_dir)
-        dir_elements.sort()
-        for dir_element in dir_elements:
-            if dir_element != mainfile_basename and os.path.isfile(
-                os.path.join(entry_dir, dir_element)
-            ):
-                aux_files.append(os.path.join(entry_relative_dir, dir_element))
-                file_count += 1
-
-            if with_cutoff and file_count > config.process.auxfile_cutoff:
-                # If there are too many of them, its probably just a directory with lots of
-                # mainfiles/entries. In this case it does not make any sense to provide thousands of
-                # aux files.
-                break
-
-        aux_files = sorted(aux_files)
+        return _select_entry_files(
+            mainfile,
+            entry_relative_dir,
+            _directory_files(entry_dir),
+            with_mainfile=with_mainfile,
+            with_cutoff=with_cutoff,
+        )
 
-        if with_mainfile:
-            return [mainfile] + aux_files
-        else:
-            return aux_files
+    def entry_fingerprint(self, mainfile: str, mainfile_key: str) -> Optional[str]:
+        hash = hashlib.sha512()
+        now = time.time_ns()
+        for filepath in self.entry_files(mainfile):
+            stat = os.stat(self._raw_dir.join_file(filepath).os_path)
+            if now - stat.st_mtime_ns < _racy_interval_ns:
+                return None
+            hash.update(
+                f'{filepath}\0{stat.st_size}\0{stat.st_mtime_ns}\0{stat.st_ino}\0'.encode()
+            )
+        if mainfile_key:
+            hash.update(mainfile_key.encode('utf8'))
+        return f'stat:{utils.make_websave(hash)}'
 
     def entry_hash(self, mainfile: str, mainfile_key: str) -> str:
         """
@@ -1434,11 +1774,11 @@ class StagingUploadFiles(UploadFiles):
 class PublicUploadFiles(UploadFiles):
     def __init__(self, upload_id: str, create: bool = False):
         super().__init__(upload_id, create)
-        self._directories: Dict[str, Dict[str, RawPathInfo]] = None
+        self._raw_index: RawDirectoryIndex = None
         self._raw_zip_file_object: PathObject = None
         self._raw_zip_file: zipfile.ZipFile = None
         self._archive_msg_file_object: PathObject = None
-        self._archive_msg_file: ArchiveReader = None
+        self._archive_msg_file: Union[ArchiveReader, ArchiveReaderV2] = None
         self._access: str = None
         self._missing_raw_files: bool = None
 
@@ -1460,6 +1800,8 @@ class PublicUploadFiles(UploadFiles):
         if self._archive_msg_file is not None:
             self._archive_msg_file.close()
 
+        self._raw_index = None
+
     @property
     def access(self):
         """
@@ -1527,6 +1869,12 @@ class PublicUploadFiles(UploadFiles):
     ) -> PathObject:
         return target_dir.join_file(f'raw-{access}.plain.zip')
 
+    @staticmethod
+    def _create_raw_index_file_object(
+        target_dir: DirectoryObject, access: str
+    ) -> PathObject:
+        return target_dir.join_file(f'.raw-{access}.plain.zip.index')
+
     def raw_zip_file_object(self) -> PathObject:
         """
         Gets the raw zip file, either public or restricted, depending on which one is used.
@@ -1572,7 +1920,9 @@ class PublicUploadFiles(UploadFiles):
 
         return _versioned_archive_file_object(target_dir, versioned_file_name, fallback)
 
-    def _open_msg_file(self, use_blocked_toc: bool = True) -> ArchiveReader:
+    def _open_msg_file(
+        self, use_blocked_toc: bool = True
+    ) -> Union[ArchiveReader, ArchiveReaderV2]:
         if self._archive_msg_file is not None:
             if not self._archive_msg_file.is_closed():
                 return self._archive_msg_file
@@ -1584,7 +1934,16 @@ class PublicUploadFiles(UploadFiles):
         if not msg_file_object.exists():
             raise FileNotFoundError()
 
-        archive = read_archive(msg_file_object.os_path, use_blocked_toc=use_blocked_toc)
+        if config.archive.reader_cache_size > 0:
+            archive = archive_reader_cache.get(
+                msg_file_object.os_path,
+                group=self.upload_id,
+                use_blocked_toc=use_blocked_toc,
+            )
+        else:
+            archive = read_archive(
+                msg_file_object.os_path, use_blocked_toc=use_blocked_toc
+            )
         assert archive is not None
         self._archive_msg_file = archive
 
@@ -1629,53 +1988,50 @@ class PublicUploadFiles(UploadFiles):
 
         return staging_upload_files
 
-    def _parse_content(self):
+    def _open_raw_index(self) -> RawDirectoryIndex:
         """
-        Parses the content of files and folders and caches it in self._directories for
-        faster future access.
+        Opens the :class:`RawDirectoryIndex` of the raw zip file. The index is stored
+        next to the zip file and created on first use, if it does not exist yet.
         """
-        if self._directories is None:
-            self._directories = dict()
-            self._directories[''] = {}  # Root folder
-            directory_sizes: Dict[str, int] = {}
-            # Add file RawPathInfo objects and calculate directory sizes
+        if self._raw_index is None:
             try:
-                zf = self._open_raw_zip_file()
-                for path in zf.namelist():
-                    file_name = os.path.basename(path)
-                    directory_path = os.path.dirname(path)
-                    size = zf.getinfo(path).file_size if file_name else 0
-
-                    if directory_path:
-                        # Ensure that all parent directories are added
-                        sub_path = ''
-                        for directory in directory_path.split(os.path.sep):
-                            sub_path_next = os.path.join(sub_path, directory)
-                            if sub_path_next not in self._directories:
-                                self._directories[sub_path_next] = {}
-                                directory_sizes.setdefault(sub_path_next, 0)
-                            directory_sizes[sub_path_next] += size
-                            sub_path = sub_path_next
-
-                    if file_name:
-                        directory_content = self._directories[directory_path]
-                        directory_content[file_name] = RawPathInfo(
-                            path=path, is_file=True, size=size, access=self.access
-                        )
-                        self._directories[path] = directory_content[file_name]
-            except FileNotFoundError:
-                pass
-            # Add directories with the calculated sizes.
-            for path, size in directory_sizes.items():
-                basename = os.path.basename(path)
-                directory_path = os.path.dirname(path)
-                self._directories[directory_path][basename] = RawPathInfo(
-                    path=path, is_file=False, size=size, access=self.access
+                self._raw_index = RawDirectoryIndex.open(
+                    self.raw_zip_file_object().os_path,
+                    PublicUploadFiles._create_raw_index_file_object(
+                        self, self.access
+                    ).os_path,
                 )
+            except FileNotFoundError:
+                self._raw_index = RawDirectoryIndex.empty()
+
+        return self._raw_index
 
     def is_empty(self) -> bool:
-        self._parse_content()
-        return not self._directories.get('')
+        return len(self._open_raw_index()) == 0
+
+    def entry_fingerprint(self, mainfile: str, mainfile_key: str) -> Optional[str]:
+        index = self._open_raw_index()
+        i = index.find(mainfile)
+        if i is None or not index.is_file(i):
+            raise KeyError(mainfile)
+
+        directory = os.path.dirname(mainfile)
+        j = index.find(directory) if directory else None
+        positions = {
+            os.path.basename(index.path(child)): child
+            for child in index.children(j)
+            if index.is_file(child)
+        }
+
+        hash = hashlib.sha512()
+        for filepath in _select_entry_files(mainfile, directory, list(positions)):
+            child = positions[os.path.basename(filepath)]
+            hash.update(
+                f'{filepath}\0{index.size(child)}\0{index.crc32(child)}\0'.encode()
+            )
+        if mainfile_key:
+            hash.update(mainfile_key.encode('utf8'))
+        return f'zip:{utils.make_websave(hash)}'
 
     def raw_path_exists(self, path: str) -> bool:
         if not is_safe_relative_path(path):
@@ -1684,35 +2040,24 @@ class PublicUploadFiles(UploadFiles):
             return (
                 not path  # We consider the empty path (i.e. root) to always "exists".
             )
-        self._parse_content()
         explicit_directory_path = path.endswith(os.path.sep)
         path = path.rstrip(os.path.sep)
-        base_name = os.path.basename(path)
-        directory_path = os.path.dirname(path)
-        directory_content = self._directories.get(directory_path)
-        if directory_content is not None:
-            if not base_name:
-                return True
-            if base_name in directory_content:
-                path_info = directory_content[base_name]
-                if explicit_directory_path and path_info.is_file:
-                    return False
-                return True
-        return False
+        if not path:
+            return True
+        index = self._open_raw_index()
+        i = index.find(path)
+        if i is None:
+            return False
+        return not (explicit_directory_path and index.is_file(i))
 
     def raw_path_is_file(self, path: str) -> bool:
         if not is_safe_relative_path(path) or self.missing_raw_files:
             return False
-        self._parse_content()
-        base_name = os.path.basename(path)
-        directory_path = os.path.dirname(path)
-        if not base_name:
+        if not os.path.basename(path):
             return False  # Requested path is an explicit directory path
-        directory_content = self._directories.get(directory_path)
-        if directory_content and base_name in directory_content:
-            path_info = directory_content[base_name]
-            return path_info.is_file
-        return False
+        index = self._open_raw_index()
+        i = index.find(path)
+        return i is not None and index.is_file(i)
 
     def raw_directory_list(
         self,
@@ -1726,24 +2071,30 @@ class PublicUploadFiles(UploadFiles):
             return
         if not path and self.missing_raw_files:
             return
-        self._parse_content()
+        index = self._open_raw_index()
         path = path.rstrip(os.path.sep)
-        directory_content = self._directories.get(path)
-        if directory_content is not None:
-            if isinstance(directory_content, RawPathInfo):
-                directory_content = {directory_content.path: directory_content}
-            for __, path_info in sorted(directory_content.items()):
+        if path:
+            i = index.find(path)
+            if i is None:
+                return
+            if index.is_file(i):
+                path_info = index.path_info(i, self.access)
+                if not path_prefix or path_info.path.startswith(path_prefix):
+                    yield path_info
+                return
+        else:
+            i = None
+
+        def list_children(i: int | None, depth: int) -> Iterable[RawPathInfo]:
+            for child in index.children(i):
+                path_info = index.path_info(child, self.access)
                 if not files_only or path_info.is_file:
                     if not path_prefix or path_info.path.startswith(path_prefix):
                         yield path_info
-                if recursive and not path_info.is_file:
-                    for sub_path_info in self.raw_directory_list(
-                        path_info.path, recursive, files_only, depth=depth - 1
-                    ):
-                        if not path_prefix or sub_path_info.path.startswith(
-                            path_prefix
-                        ):
-                            yield sub_path_info
+                if recursive and not path_info.is_file and depth != 1:
+                    yield from list_children(child, depth - 1)
+
+        yield from list_children(i, depth)
 
     def scandir(self, path: str = '', depth: int = -1):
         raise NotImplementedError()
@@ -1796,6 +2147,27 @@ class PublicUploadFiles(UploadFiles):
 
         raise KeyError(entry_id)
 
+    def read_many(
+        self, entry_ids: Iterable[str], required: RequiredReader = None
+    ) -> Iterator[Tuple[str, Any]]:
+        try:
+            archive = self._open_msg_file()
+        except FileNotFoundError:
+            for entry_id in entry_ids:
+                yield entry_id, None
+            return
+
+        if not hasattr(archive, 'read_many'):
+            # legacy archive format
+            yield from super().read_many(entry_ids, required)
+            return
+
+        for entry_id, entry_archive in archive.read_many(entry_ids):
+            if entry_archive is None:
+                yield entry_id, None
+            else:
+                yield entry_id, self._apply_required(entry_archive, entry_id, required)
+
     def re_pack(self, with_embargo: bool) -> None:
         """
         Repacks the files when changing the embargo flag on the upload. That is: when lifting the
@@ -1828,6 +2200,17 @@ class PublicUploadFiles(UploadFiles):
             if raw_zip_file_object_new.exists():
                 raw_zip_file_object_new.delete()  # We have checked that the file is empty anyway
             os.rename(raw_zip_file_object.os_path, raw_zip_file_object_new.os_path)
+        raw_index_file_object = PublicUploadFiles._create_raw_index_file_object(
+            self, self.access
+        )
+        if raw_index_file_object.exists():
+            # Renaming keeps the modification time of the zip file, the index stays valid
+            os.replace(
+                raw_index_file_object.os_path,
+                PublicUploadFiles._create_raw_index_file_object(
+                    self, new_access
+                ).os_path,
+            )
         hdf5_file_object = _create_archive_hdf5_file_object(self, self.access)
         hdf5_file_object_new = _create_archive_hdf5_file_object(self, new_access)
         if hdf5_file_object.exists():
@@ -1836,6 +2219,7 @@ class PublicUploadFiles(UploadFiles):
             os.rename(hdf5_file_object.os_path, hdf5_file_object_new.os_path)
 
         # Clear the cached values
+        archive_reader_cache.invalidate(self.upload_id)
         self._access = None
         self._raw_zip_file = self._raw_zip_file_object = None
         self._archive_msg_file = self._archive_msg_file_object = None
@@ -24,7 +24,9 @@ import functools
 import itertools
 import os
 import re
-from collections.abc import Iterator, AsyncIterator
+from collections import OrderedDict
+from collections.abc import Awaitable, Iterator, AsyncIterator
+from contextvars import ContextVar
 from threading import Lock
 from typing import Any, Callable, Type, Union
 
@@ -34,6 +36,7 @@ from fastapi import HTTPException
 from mongoengine import Q
 
 from nomad import utils
+from nomad.config import config as nomad_config
 from nomad.app.v1.models import (
     MetadataPagination,
     Pagination,
@@ -120,6 +123,7 @@ class Token:
     MAINFILE = 'mainfile'
     RESPONSE = 'm_response'
     ERROR = 'm_errors'
+    DEBUG = 'm_debug'
 
 
 @dataclasses.dataclass(frozen=True)
@@ -162,12 +166,88 @@ class ConfigError(Exception):
     pass
 
 
+# the limiter of blocking reads shared by all readers of the current request
+_request_limiter: ContextVar[asyncio.Semaphore | None] = ContextVar(
+    '_request_limiter', default=None
+)
+
+
+def _concurrency() -> int:
+    return max(nomad_config.services.graph_concurrency, 1)
+
+
+def _limiter() -> asyncio.Semaphore:
+    """
+    Get the limiter of the current request, create one if there is none yet.
+    Tasks copy the context on creation, the limiter must hence be created before
+    fanning out to be shared by all tasks of the request.
+    """
+    if (limiter := _request_limiter.get()) is None:
+        limiter = asyncio.Semaphore(_concurrency())
+        _request_limiter.set(limiter)
+    return limiter
+
+
+async def _offload(func: Callable, *args, **kwargs):
+    """
+    Run the blocking call in a worker thread.
+    At most `graph_concurrency` blocking calls of the same request run at the same time.
+    """
+    async with _limiter():
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def _gather(calls: list[Callable[[], Awaitable]]) -> list:
+    """
+    Await the given calls concurrently and return their results in the given order.
+    At most `graph_concurrency` calls are pending at the same time.
+    If any of the calls fails, the pending calls are cancelled and the error is raised.
+    """
+    if _concurrency() == 1 or len(calls) < 2:
+        return [await call() for call in calls]
+
+    _limiter()
+
+    tasks: list[asyncio.Task] = []
+    pending: set[asyncio.Task] = set()
+    try:
+        for call in calls:
+            if len(pending) >= _concurrency():
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+            task = asyncio.ensure_future(call())
+            tasks.append(task)
+            pending.add(task)
+        if pending:
+            await asyncio.gather(*pending)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return [task.result() for task in tasks]
+
+
+def _is_lazy(data) -> bool:
+    """
+    Archive containers and user wrappers read their data (from the archive file or the
+    user database) on access.
+    """
+    return isinstance(
+        data,
+        (ArchiveList, ArchiveDict, ArchiveListNew, ArchiveDictNew, LazyUserWrapper),
+    )
+
+
 async def goto_child(container, key: str | int | list):
     if not isinstance(key, list):
         if isinstance(container, (list, dict)):
             return container[key]  # type: ignore
 
-        return await asyncio.to_thread(container.__getitem__, key)
+        return await _offload(container.__getitem__, key)
 
     target = container
     for v in key:
@@ -176,18 +256,17 @@ async def goto_child(container, key: str | int | list):
 
 
 async def async_get(container, key, default=None):
-    return container.get(key, default)
-
     if isinstance(container, dict):
         return container.get(key, default)
 
-    return await asyncio.to_thread(container.get, key, default)
+    return await _offload(container.get, key, default)
 
 
 async def async_to_json(data):
-    return to_json(data)
+    if not _is_lazy(data):
+        return to_json(data)
 
-    return await asyncio.to_thread(to_json, data)
+    return await _offload(to_json, data)
 
 
 class LazyUserWrapper:
@@ -292,7 +371,9 @@ class GraphNode:
             raise ArchiveError(f'Circular reference detected: {reference_url}.')
 
         try:
-            target = await self.__goto_path(self.archive_root, path_stack)
+            target = await self.__goto_path(
+                self.upload_id, self.entry_id, self.archive_root, path_stack
+            )
         except (KeyError, IndexError):
             raise ArchiveError(f'Archive {self.entry_id} does not contain {reference}.')
 
@@ -323,9 +404,9 @@ class GraphNode:
         if kind == 'raw':
             # it is a path to raw file
             # get the corresponding entry id
-            other_entry: Entry = Entry.objects(
-                upload_id=other_upload_id, mainfile=id_or_file
-            ).first()
+            other_entry: Entry = await _offload(
+                Entry.objects(upload_id=other_upload_id, mainfile=id_or_file).first
+            )
             if not other_entry:
                 # cannot find the entry, None will be identified in the caller
                 raise ArchiveError(
@@ -346,11 +427,15 @@ class GraphNode:
             raise ArchiveError(f'Circular reference detected: {reference_url}.')
 
         # get the archive
-        other_archive_root = self.reader.load_archive(other_upload_id, other_entry_id)
+        other_archive_root = await _offload(
+            self.reader.load_archive, other_upload_id, other_entry_id
+        )
 
         try:
             # now go to the target path
-            other_target = await self.__goto_path(other_archive_root, path_stack)
+            other_target = await self.__goto_path(
+                other_upload_id, other_entry_id, other_archive_root, path_stack
+            )
         except (KeyError, IndexError):
             raise ArchiveError(f'Archive {other_entry_id} does not contain {path}.')
 
@@ -385,16 +470,30 @@ class GraphNode:
             result_root=self.ref_result_root,
         )
 
-    @staticmethod
-    async def __goto_path(target_root: ArchiveDict | dict, path_stack: list) -> Any:
+    async def __goto_path(
+        self,
+        upload_id: str,
+        entry_id: str,
+        target_root: ArchiveDict | dict,
+        path_stack: list,
+    ) -> Any:
         """
         Go to the specified path in the data.
+        The targets in the cached archives are cached.
         """
+        cache: ArchiveCache = self.reader.archive_cache
+        path: str = '/'.join(path_stack)
+        if (
+            target := cache.get_target(upload_id, entry_id, target_root, path)
+        ) is not None:
+            return target
+
+        target = target_root
         for key in path_stack:
-            target_root = await goto_child(
-                target_root, int(key) if key.isdigit() else key
-            )
-        return target_root
+            target = await goto_child(target, int(key) if key.isdigit() else key)
+
+        cache.add_target(upload_id, entry_id, target_root, path, target)
+        return target
 
 
 async def _if_exists(target_root: dict, path_stack: list) -> bool:
@@ -529,9 +628,13 @@ async def _populate_result(
             container[k_or_i] = value_type()
         return container[k_or_i]
 
+    # convert before touching the container, the conversion may be offloaded
+    # and the container must not change while other tasks are populating it
+    new_value = await async_to_json(value)
+
     if len(path) == 0:
-        assert isinstance(container_root, dict) and isinstance(value, dict)
-        _merge_dict(container_root, value)
+        assert isinstance(container_root, dict) and isinstance(new_value, dict)
+        _merge_dict(container_root, new_value)
         return
 
     target_container: dict | list = container_root
@@ -554,7 +657,6 @@ async def _populate_result(
 
     # the target container does not necessarily have to be a dict or a list
     # if the result is striped due to large size, it will be replaced by a string
-    new_value = await async_to_json(value)
     if isinstance(target_container, list):
         assert isinstance(key_or_index, int)
         if target_container[key_or_index] is None:
@@ -805,6 +907,161 @@ def _unwrap_subsection(target):
     return target.sub_section.m_resolved() if isinstance(target, SubSection) else target
 
 
+def _archive_size(archive) -> int:
+    """
+    The size of the serialised archive.
+    It bounds the decoded data an archive retains once its children have been read.
+    Archives that are read as a whole are plain dicts, their serialised size is measured.
+    """
+    try:
+        if isinstance(archive, ArchiveDictNew):
+            start, end = archive._pos
+            return end - start
+        if isinstance(archive, ArchiveDict):
+            start, end = archive._toc_entry['pos']
+            return end - start
+    except (AttributeError, KeyError, TypeError, ValueError):
+        pass
+
+    try:
+        return len(
+            orjson.dumps(
+                to_json(archive),
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        )
+    except (TypeError, orjson.JSONEncodeError):
+        return 0
+
+
+def _archive_file_size(archive_reader, entry_id: str) -> int | None:
+    """
+    The size of the TOC and the data of the given entry in the archive file,
+    or None if the reader does not provide the positions.
+    """
+    try:
+        toc_position, data_position = archive_reader._locate_position(
+            utils.adjust_uuid_size(entry_id)
+        )
+        return max(toc_position[1], data_position[1]) - min(
+            toc_position[0], data_position[0]
+        )
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class ArchiveCache:
+    """
+    Caches the archives and the resolved reference targets of a graph request.
+
+    All readers of a request share the same cache. It owns the upload files the cached
+    archives are read from, the reader that creates the cache closes them once the
+    request is done. Archives are evicted in least recently used order once their total
+    size exceeds `max_size`, the reference targets in an archive are evicted with it.
+    """
+
+    def __init__(self, max_size: int = None):
+        self.max_size: int = (
+            nomad_config.services.graph_archive_cache_size
+            if max_size is None
+            else max_size
+        )
+
+        # upload files can only be closed as a whole, they are kept for the request
+        self.uploads: dict[str, UploadFiles] = {}
+        # archives are loaded in worker threads, uploads are opened once per request
+        self.upload_locks: dict[str, Lock] = {}
+
+        self.archive_hits: int = 0
+        self.archive_misses: int = 0
+        self.target_hits: int = 0
+        self.target_misses: int = 0
+        self.evictions: int = 0
+
+        self._lock = Lock()
+        # (upload_id, entry_id) -> [archive, size, {path: target}]
+        self._archives: OrderedDict[tuple[str, str], list] = OrderedDict()
+        self._size: int = 0
+
+    def get_archive(self, upload_id: str, entry_id: str):
+        with self._lock:
+            if (cached := self._archives.get((upload_id, entry_id))) is None:
+                self.archive_misses += 1
+                return None
+
+            self.archive_hits += 1
+            self._archives.move_to_end((upload_id, entry_id))
+            return cached[0]
+
+    def add_archive(self, upload_id: str, entry_id: str, archive, size: int = None):
+        """
+        Add the archive of the given entry. The size is measured from the archive,
+        if it is not given.
+        """
+        if size is None:
+            size = _archive_size(archive)
+        if self.max_size <= 0 or size > self.max_size:
+            return
+
+        with self._lock:
+            if (upload_id, entry_id) in self._archives:
+                return
+
+            self._archives[(upload_id, entry_id)] = [archive, size, {}]
+            self._size += size
+            while self._size > self.max_size:
+                _, (_, evicted_size, _) = self._archives.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def get_target(self, upload_id: str, entry_id: str, archive, path: str):
+        """
+        Get the resolved target at the given path of the given archive.
+        Only targets in cached archives are cached.
+        """
+        with self._lock:
+            cached = self._archives.get((upload_id, entry_id))
+            if cached is None or cached[0] is not archive:
+                return None
+
+            if path not in cached[2]:
+                self.target_misses += 1
+                return None
+
+            self.target_hits += 1
+            self._archives.move_to_end((upload_id, entry_id))
+            return cached[2][path]
+
+    def add_target(self, upload_id: str, entry_id: str, archive, path: str, target):
+        with self._lock:
+            cached = self._archives.get((upload_id, entry_id))
+            if cached is not None and cached[0] is archive:
+                cached[2][path] = target
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return dict(
+                archives=len(self._archives),
+                targets=sum(len(v[2]) for v in self._archives.values()),
+                size=self._size,
+                archive_hits=self.archive_hits,
+                archive_misses=self.archive_misses,
+                target_hits=self.target_hits,
+                target_misses=self.target_misses,
+                evictions=self.evictions,
+            )
+
+    def close(self):
+        with self._lock:
+            self._archives.clear()
+            self._size = 0
+
+        for upload in self.uploads.values():
+            upload.close()
+        self.uploads.clear()
+
+
 class GeneralReader:
     # controls the name of configuration
     # it will be extracted from the query dict to generate the configuration object
@@ -844,6 +1101,7 @@ class GeneralReader:
         init: bool = True,
         config: RequestConfig = None,
         global_root: dict = None,
+        archive_cache: ArchiveCache = None,
     ):
         """
         Supports two modes of initialisation:
@@ -861,6 +1119,7 @@ class GeneralReader:
             The parent configuration needs to be passed down to the children.
             The `global_root` is used in child readers to allow them to populate data to global root.
             This helps to reduce the nesting level of the final response dict.
+            The `archive_cache` is shared by all readers of a request, the reader creating it closes it.
         """
 
         # maybe used to retrieve additional information
@@ -870,9 +1129,13 @@ class GeneralReader:
         self.global_root: dict = global_root
 
         # for cacheing
-        # can only store uploads in the reader
+        # the cache keeps the uploads open for the whole request
         # due to limitations of upload class (open/close limitations)
-        self.upload_pool: dict[str, UploadFiles] = {}
+        self.archive_cache: ArchiveCache = (
+            ArchiveCache() if archive_cache is None else archive_cache
+        )
+        self._owns_archive_cache: bool = archive_cache is None
+        self.upload_pool: dict[str, UploadFiles] = self.archive_cache.uploads
 
         self.required_query: dict | RequestConfig
         if not init:
@@ -892,13 +1155,24 @@ class GeneralReader:
         if not self.errors:
             return
 
+        # concurrent visits log in the order they complete, the errors are sorted to
+        # make the response independent of that order
         error_list = container.setdefault(Token.ERROR, [])
-        for error_type, error_set in self.errors.items():
+        for error_type, error_set in sorted(self.errors.items()):
             error_list.extend(
                 {'error_type': error_type, 'message': error_item}
-                for error_item in error_set
+                for error_item in sorted(error_set)
             )
 
+    def _populate_debug_info(self, container: dict):
+        # only the reader that owns the cache reports it, once for the whole request
+        if not self._owns_archive_cache or not nomad_config.services.graph_debug_info:
+            return
+
+        container.setdefault(Token.DEBUG, {})['archive_cache'] = (
+            self.archive_cache.statistics()
+        )
+
     def __enter__(self):
         return self
 
@@ -906,8 +1180,8 @@ class GeneralReader:
         self.close()
 
     def close(self):
-        for upload in self.upload_pool.values():
-            upload.close()
+        if self._owns_archive_cache:
+            self.archive_cache.close()
 
     def _log(
         self,
@@ -957,7 +1231,7 @@ class GeneralReader:
             return User.get(user_id=user_id)
 
         try:
-            user: User = await asyncio.to_thread(_retrieve)
+            user: User = await _offload(_retrieve)
         except Exception as e:
             self._log(str(e), to_response=False)
             return user_id
@@ -997,7 +1271,7 @@ class GeneralReader:
             return UserGroup.objects(group_id=group_id).first()
 
         try:
-            group: UserGroup = await asyncio.to_thread(_retrieve)
+            group: UserGroup = await _offload(_retrieve)
         except Exception as e:
             self._log(str(e), to_response=False)
             return group_id
@@ -1013,13 +1287,19 @@ class GeneralReader:
 
     @staticmethod
     async def _overwrite_upload(item: Upload):
-        plain_dict = orjson.loads(upload_to_pydantic(item).json())
+        def _convert():
+            # the entry counts are queried from the database
+            return (
+                orjson.loads(upload_to_pydantic(item).json()),
+                item.processed_entries_count,
+                item.total_entries_count,
+            )
+
+        plain_dict, processed_entries, total_entries = await _offload(_convert)
         if n_entries := plain_dict.pop('entries', None):
             plain_dict['n_entries'] = n_entries
-        plain_dict['processing_successful'] = item.processed_entries_count
-        plain_dict['processing_failed'] = (
-            item.total_entries_count - item.processed_entries_count
-        )
+        plain_dict['processing_successful'] = processed_entries
+        plain_dict['processing_failed'] = total_entries - processed_entries
 
         if main_author := plain_dict.pop('main_author', None):
             plain_dict['main_author'] = LazyUserWrapper(main_author)
@@ -1031,7 +1311,7 @@ class GeneralReader:
 
     async def retrieve_upload(self, upload_id: str) -> str | dict:
         try:
-            upload: Upload = await asyncio.to_thread(
+            upload: Upload = await _offload(
                 get_upload_with_read_access, upload_id, self.user, include_others=True
             )
         except HTTPException as e:
@@ -1065,7 +1345,7 @@ class GeneralReader:
                 owner='all', query={'entry_id': entry_id}, user_id=self.user.user_id
             )
 
-        if (await asyncio.to_thread(_search)).pagination.total == 0:
+        if (await _offload(_search)).pagination.total == 0:
             self._log(
                 f'The value {entry_id} is not a valid entry id or not visible to current user.',
                 error_type=QueryError.NOACCESS,
@@ -1075,13 +1355,13 @@ class GeneralReader:
         def _retrieve():
             return Entry.objects(entry_id=entry_id).first()
 
-        return self._overwrite_entry(await asyncio.to_thread(_retrieve))
+        return self._overwrite_entry(await _offload(_retrieve))
 
     async def retrieve_dataset(self, dataset_id: str) -> str | dict:
         def _retrieve():
             return Dataset.m_def.a_mongo.objects(dataset_id=dataset_id).first()
 
-        if (dataset := await asyncio.to_thread(_retrieve)) is None:
+        if (dataset := await _offload(_retrieve)) is None:
             self._log(
                 f'The value {dataset_id} is not a valid dataset id.',
                 error_type=QueryError.NOTFOUND,
@@ -1097,29 +1377,39 @@ class GeneralReader:
         return dataset.to_mongo().to_dict()
 
     def load_archive(self, upload_id: str, entry_id: str) -> ArchiveDict:
-        if upload_id not in self.upload_pool:
-            # get the archive
-            # does the current user have access to the target archive?
+        if (archive := self.archive_cache.get_archive(upload_id, entry_id)) is not None:
+            return archive
+
+        with self.archive_cache.upload_locks.setdefault(upload_id, Lock()):
+            if upload_id not in self.upload_pool:
+                # get the archive
+                # does the current user have access to the target archive?
+                try:
+                    upload: Upload = get_upload_with_read_access(
+                        upload_id, self.user, include_others=True
+                    )
+                except HTTPException:
+                    raise ArchiveError(
+                        f'Current user does not have access to upload {upload_id}.'
+                    )
+
+                if upload.upload_files is None:
+                    raise ArchiveError(f'Upload {upload_id} does not exist.')
+
+                self.upload_pool[upload_id] = upload.upload_files
+
             try:
-                upload: Upload = get_upload_with_read_access(
-                    upload_id, self.user, include_others=True
-                )
-            except HTTPException:
+                archive_reader = self.upload_pool[upload_id].read_archive(entry_id)
+                archive = archive_reader[entry_id]
+            except KeyError:
                 raise ArchiveError(
-                    f'Current user does not have access to upload {upload_id}.'
+                    f'Archive {entry_id} does not exist in upload {entry_id}.'
                 )
 
-            if upload.upload_files is None:
-                raise ArchiveError(f'Upload {upload_id} does not exist.')
-
-            self.upload_pool[upload_id] = upload.upload_files
-
-        try:
-            return self.upload_pool[upload_id].read_archive(entry_id)[entry_id]
-        except KeyError:
-            raise ArchiveError(
-                f'Archive {entry_id} does not exist in upload {entry_id}.'
-            )
+        self.archive_cache.add_archive(
+            upload_id, entry_id, archive, _archive_file_size(archive_reader, entry_id)
+        )
+        return archive
 
     async def _apply_resolver(self, node: GraphNode, config: RequestConfig):
         if_skip: bool = config.property_name not in GeneralReader.__UPLOAD_ID__
@@ -1168,6 +1458,30 @@ class GeneralReader:
     ):
         raise NotImplementedError()
 
+    @staticmethod
+    async def _fan_out(node: GraphNode, visits: list[Callable]):
+        """
+        Call the given visits with the node, each visit handles an independent child.
+        The visits run concurrently, each populates its own result container.
+        The containers are merged into the result of the node in the order of the visits,
+        and the logged errors are sorted when the response is populated. The response thus
+        does not depend on the order in which the reads complete.
+        """
+        if _concurrency() == 1 or len(visits) < 2:
+            for visit in visits:
+                await visit(node)
+            return
+
+        result_roots: list[dict] = [{} for _ in visits]
+        await _gather(
+            [
+                functools.partial(visit, node.replace(result_root=result_root))
+                for visit, result_root in zip(visits, result_roots)
+            ]
+        )
+        for result_root in result_roots:
+            await _populate_result(node.result_root, [], result_root)
+
     async def _resolve(
         self,
         node: GraphNode,
@@ -1329,7 +1643,9 @@ class MongoReader(GeneralReader):
         if config.pagination and (not config.query or not config.query.pagination):  # type: ignore
             search_params['pagination'] = config.pagination
 
-        search_response = await asyncio.to_thread(perform_search, **search_params)
+        search_response = await _offload(
+            functools.partial(perform_search, **search_params)
+        )
         # overwrite the pagination to the new one from the search response
         config.pagination = search_response.pagination
 
@@ -1456,7 +1772,9 @@ class MongoReader(GeneralReader):
             pagination_response = config.pagination
         elif isinstance(config.pagination, Pagination):
             pagination_response = PaginationResponse(
-                total=mongo_result.count() if mongo_result else 0,
+                total=await _offload(
+                    lambda: mongo_result.count() if mongo_result else 0
+                ),
                 **config.pagination.dict(),
             )
 
@@ -1487,17 +1805,28 @@ class MongoReader(GeneralReader):
 
                 raise ValueError(f'Should not reach here.')
 
-            mongo_result = config.pagination.paginate_result(mongo_result, _pick_id)
+            paginate_result = config.pagination.paginate_result
+            mongo_result = await _offload(
+                lambda: list(paginate_result(mongo_result, _pick_id))
+            )
 
             if mongo_result:
                 pagination_response.next_page_after_value = _pick_id(
                     mongo_result[len(mongo_result) - 1]
                 )
 
+        # evaluate the query in a worker thread
+        mongo_result = await _offload(list, mongo_result)
+
         if transformer == upload_to_pydantic:
             mongo_dict = {
                 v['upload_id']: v
-                for v in [await self._overwrite_upload(item) for item in mongo_result]
+                for v in await _gather(
+                    [
+                        functools.partial(self._overwrite_upload, item)
+                        for item in mongo_result
+                    ]
+                )
             }
         elif transformer == dataset_to_pydantic:
             mongo_dict = {
@@ -1565,6 +1894,7 @@ class MongoReader(GeneralReader):
         )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         return response
 
@@ -1609,12 +1939,10 @@ class MongoReader(GeneralReader):
             'init': False,
             'config': current_config,
             'global_root': self.global_root,
+            'archive_cache': self.archive_cache,
         }
 
-        for key, value in required.items():
-            if key in (GeneralReader.__CONFIG__, GeneralReader.__WILDCARD__):
-                continue
-
+        async def _visit(node: GraphNode, key: str, value):
             async def offload_read(
                 reader_cls: Type[GeneralReader], *args, read_list=False
             ):
@@ -1640,39 +1968,39 @@ class MongoReader(GeneralReader):
             if key == Token.RAW and self.__class__ is UploadReader:
                 # hitting the bottom of the current scope
                 await offload_read(FileSystemReader, node.upload_id)
-                continue
+                return
 
             if key == Token.METADATA and self.__class__ is EntryReader:
                 # hitting the bottom of the current scope
                 await offload_read(ElasticSearchReader, node.entry_id)
-                continue
+                return
 
             if key == Token.UPLOAD and self.__class__ is EntryReader:
                 # hitting the bottom of the current scope
                 await offload_read(UploadReader, node.upload_id)
-                continue
+                return
 
             if key == Token.MAINFILE and self.__class__ is EntryReader:
                 # hitting the bottom of the current scope
                 await offload_read(
                     FileSystemReader, node.upload_id, node.archive['mainfile_path']
                 )
-                continue
+                return
 
             if key == Token.ARCHIVE and self.__class__ is EntryReader:
                 # hitting the bottom of the current scope
                 await offload_read(ArchiveReader, node.upload_id, node.entry_id)
-                continue
+                return
 
             if key == Token.ENTRIES and self.__class__ is ElasticSearchReader:
                 # hitting the bottom of the current scope
                 await offload_read(EntryReader, node.archive['entry_id'])
-                continue
+                return
 
             if key == Token.METAINFO and self.__class__ is MongoReader:
                 # hitting the bottom of the current scope
                 await offload_read(MetainfoBrowser)
-                continue
+                return
 
             if isinstance(node.archive, dict) and isinstance(value, dict):
                 # treat it as a normal key
@@ -1681,13 +2009,13 @@ class MongoReader(GeneralReader):
                     # offload to the upload reader if it is a nested query
                     if isinstance(entry_id := node.archive.get(key, None), str):
                         await offload_read(EntryReader, entry_id)
-                        continue
+                        return
 
                 if key in GeneralReader.__UPLOAD_ID__:
                     # offload to the entry reader if it is a nested query
                     if isinstance(upload_id := node.archive.get(key, None), str):
                         await offload_read(UploadReader, upload_id)
-                        continue
+                        return
 
                 if key in GeneralReader.__USER_ID__:
                     # offload to the user reader if it is a nested query
@@ -1695,7 +2023,7 @@ class MongoReader(GeneralReader):
                         await offload_read(
                             UserReader, user_id, read_list=isinstance(user_id, list)
                         )
-                        continue
+                        return
 
             if isinstance(value, RequestConfig):
                 child_config = value
@@ -1749,17 +2077,17 @@ class MongoReader(GeneralReader):
                 )
 
             if await self._offload_walk(__offload_walk, child_config, key, value):
-                continue
+                return
 
             if len(node.current_path) > 0 and node.current_path[-1] in __M_SEARCHABLE__:
                 await offload_read(__M_SEARCHABLE__[node.current_path[-1]], key)
-                continue
+                return
 
             # key may contain index, cached
             name, index = _parse_key(key)
 
             if name not in node.archive:
-                continue
+                return
 
             child_archive = node.archive[name]
             child_path: list = node.current_path + [name]
@@ -1772,18 +2100,25 @@ class MongoReader(GeneralReader):
                 # should never reach here in most cases
                 # most mongo data is a 1-level tree
                 # second level implies it's delegated to another reader
-                async def __walk(__archive, __path):
+                async def __walk(__archive, __path, __node):
                     await self._walk(
-                        node.replace(archive=__archive, current_path=__path),
+                        __node.replace(archive=__archive, current_path=__path),
                         value,
                         current_config,
                     )
 
                 if isinstance(child_archive, list):
-                    for i in _normalise_index(index, len(child_archive)):
-                        await __walk(child_archive[i], child_path + [str(i)])
+                    await self._fan_out(
+                        node,
+                        [
+                            functools.partial(
+                                __walk, child_archive[i], child_path + [str(i)]
+                            )
+                            for i in _normalise_index(index, len(child_archive))
+                        ],
+                    )
                 else:
-                    await __walk(child_archive, child_path)
+                    await __walk(child_archive, child_path, node)
             elif isinstance(value, list):
                 # optionally support alternative syntax
                 pass
@@ -1791,6 +2126,15 @@ class MongoReader(GeneralReader):
                 # should never reach here
                 raise ConfigError(f'Invalid required config: {value}.')
 
+        await self._fan_out(
+            node,
+            [
+                functools.partial(_visit, key=key, value=value)
+                for key, value in required.items()
+                if key not in (GeneralReader.__CONFIG__, GeneralReader.__WILDCARD__)
+            ],
+        )
+
     async def _offload_walk(
         self, offload_func: Callable, config: RequestConfig, key: str, value
     ) -> bool:
@@ -1860,6 +2204,7 @@ class MongoReader(GeneralReader):
                         init=False,
                         config=config,
                         global_root=self.global_root,
+                        archive_cache=self.archive_cache,
                     ) as reader,
                     timer(
                         logger,
@@ -1970,6 +2315,7 @@ class UploadReader(MongoReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         # if there is a global root, it is a sub-query, no need to clear it
         # if there is no global root, it is a top-level query, clear it
@@ -2031,6 +2377,7 @@ class DatasetReader(MongoReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -2084,6 +2431,7 @@ class EntryReader(MongoReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -2209,6 +2557,7 @@ class UserReader(MongoReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -2261,6 +2610,7 @@ class UserGroupReader(MongoReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -2325,6 +2675,7 @@ class FileSystemReader(GeneralReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -2516,6 +2867,7 @@ class FileSystemReader(GeneralReader):
                 init=False,
                 config=parent_config,
                 global_root=self.global_root,
+                archive_cache=self.archive_cache,
             ) as reader:
                 return await reader.read(entry.entry_id)
         return {}
@@ -2589,7 +2941,9 @@ class ArchiveReader(ArchiveLikeReader):
             1. archive: dict | ArchiveDict
             2. upload_id: str, entry_id: str
         """
-        archive = args[0] if len(args) == 1 else self.load_archive(*args)
+        archive = (
+            args[0] if len(args) == 1 else await _offload(self.load_archive, *args)
+        )
 
         metadata = await goto_child(archive, 'metadata')
 
@@ -2620,6 +2974,7 @@ class ArchiveReader(ArchiveLikeReader):
         )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -2660,17 +3015,13 @@ class ArchiveReader(ArchiveLikeReader):
         # in case of a reference, resolve it implicitly
         node = await self._check_reference(node, current_config, implicit_resolve=True)
 
-        # walk through the required fields
-        for key, value in required.items():
-            if key == GeneralReader.__CONFIG__:
-                continue
-
+        async def _visit(node: GraphNode, key: str, value):
             if key == Token.DEF:
                 if isinstance(node.definition, Quantity):
                     self._log(
                         f'Only support "m_def" token on sections, try defining "m_def" request on the parent.'
                     )
-                    continue
+                    return
                 with (
                     DefinitionReader(
                         value,
@@ -2678,6 +3029,7 @@ class ArchiveReader(ArchiveLikeReader):
                         init=False,
                         config=current_config,
                         global_root=self.global_root,
+                        archive_cache=self.archive_cache,
                     ) as reader,
                     timer(
                         logger,
@@ -2690,7 +3042,7 @@ class ArchiveReader(ArchiveLikeReader):
                         node.current_path + [Token.DEF],
                         await reader.read(node.definition),
                     )
-                continue
+                return
 
             # key may contain index, cached
             name, index = _parse_key(key)
@@ -2700,7 +3052,7 @@ class ArchiveReader(ArchiveLikeReader):
             except AttributeError as e:
                 # implicit resolve failed, or wrong path given
                 self._log(str(e), error_type=QueryError.NOTFOUND)
-                continue
+                return
 
             # this may be a dict, a list, or a primitive value
             if child_archive is None:
@@ -2708,14 +3060,14 @@ class ArchiveReader(ArchiveLikeReader):
                     f'Field {name} is not found in archive {node.generate_reference()}.',
                     error_type=QueryError.NOTFOUND,
                 )
-                continue
+                return
 
             child_definition = node.definition.all_properties.get(name, None)
             if child_definition is None:
                 self._log(
                     f'Definition {name} is not found.', error_type=QueryError.NOTFOUND
                 )
-                continue
+                return
 
             is_list: bool = isinstance(child_archive, GenericList)  # type: ignore
 
@@ -2725,7 +3077,7 @@ class ArchiveReader(ArchiveLikeReader):
                 and not child_definition.repeats
             ):
                 self._log(f'Definition {key} is not repeatable.')
-                continue
+                return
 
             child_path: list = node.current_path + [name]
 
@@ -2738,20 +3090,31 @@ class ArchiveReader(ArchiveLikeReader):
                 )
             elif isinstance(value, dict):
                 # this is a nested query, keep walking down the tree
-                async def __walk(__path, __archive):
+                async def __walk(__path, __archive, __node):
                     await self._walk(
-                        child(current_path=__path, archive=__archive),
+                        __node.replace(
+                            definition=child_definition,
+                            current_path=__path,
+                            archive=__archive,
+                        ),
                         value,
                         current_config,
                     )
 
                 if is_list:
                     # field[start:end]: dict
-                    for i in _normalise_index(index, len(child_archive)):
-                        await __walk(child_path + [str(i)], child_archive[i])
+                    await self._fan_out(
+                        node,
+                        [
+                            functools.partial(
+                                __walk, child_path + [str(i)], child_archive[i]
+                            )
+                            for i in _normalise_index(index, len(child_archive))
+                        ],
+                    )
                 else:
                     # field: dict
-                    await __walk(child_path, child_archive)
+                    await __walk(child_path, child_archive, node)
             elif isinstance(value, list):
                 # optionally support alternative syntax
                 pass
@@ -2759,6 +3122,16 @@ class ArchiveReader(ArchiveLikeReader):
                 # should never reach here
                 raise ConfigError(f'Invalid required config: {value}.')
 
+        # walk through the required fields
+        await self._fan_out(
+            node,
+            [
+                functools.partial(_visit, key=key, value=value)
+                for key, value in required.items()
+                if key != GeneralReader.__CONFIG__
+            ],
+        )
+
     async def _resolve(
         self,
         node: GraphNode,
@@ -2898,6 +3271,7 @@ class ArchiveReader(ArchiveLikeReader):
                             init=False,
                             config=config,
                             global_root=self.global_root,
+                            archive_cache=self.archive_cache,
                         ) as reader,
                         timer(
                             logger,
@@ -2931,6 +3305,7 @@ class ArchiveReader(ArchiveLikeReader):
                     init=False,
                     config=config,
                     global_root=self.global_root,
+                    archive_cache=self.archive_cache,
                 ) as reader,
                 timer(
                     logger,
@@ -3054,6 +3429,7 @@ class DefinitionReader(ArchiveLikeReader):
         )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -3558,6 +3934,7 @@ class MetainfoBrowser(DefinitionReader):
             )
 
         self._populate_error_list(response)
+        self._populate_debug_info(response)
 
         if not has_global_root:
             self.global_root = None
@@ -179,6 +179,8 @@ class Datatype:
                     ```
                 The value is the actual value, or the element in the array.
                 The path shall be None if the value is a scalar, or a list of indices if the value is an array.
+            ndarray: if true, numerical numpy arrays may be returned as they are, the result is then
+                not JSON serializable.
         """
         raise NotImplementedError()
 
@@ -385,6 +387,13 @@ class Primitive(Datatype):
 
         transform: typing.Callable | None = kwargs.get('transform', None)
 
+        if (
+            kwargs.get('ndarray', False)
+            and isinstance(value, np.ndarray)
+            and value.dtype.kind in 'biuf'
+        ):
+            return value
+
         def _convert(v, p=None):
             if isinstance(v, list):
                 return [
@@ -163,11 +163,13 @@ from typing import (
     Dict,
     cast,
     Set,
+    FrozenSet,
     List,
     Callable,
     Tuple,
     Optional,
     DefaultDict,
+    NamedTuple,
 )
 from collections import defaultdict
 from pint import Quantity as PintQuantity
@@ -234,6 +236,8 @@ class DocumentType:
         self.quantities: Dict[str, SearchQuantity] = {}
         self.suggestions: Dict[str, Elasticsearch] = {}
         self.metrics: Dict[str, Tuple[str, SearchQuantity]] = {}
+        self._index_doc_plans: Dict[Section, _IndexDocPlan] = {}
+        self._index_doc_plans_properties: FrozenSet[Definition] = frozenset()
 
     def _reset(self):
         self.indexed_properties.clear()
@@ -241,10 +245,40 @@ class DocumentType:
         self.nested_sections.clear()
         self.quantities.clear()
         self.metrics.clear()
+        self._index_doc_plans.clear()
 
-    def create_index_doc(self, root: MSection):
+    def _index_doc_plan(self, section_def: Section) -> '_IndexDocPlan':
+        """
+        Returns the plan to create the index document for sections of the given
+        definition. Plans are computed once per definition and reused for the same
+        set of indexed properties, see :func:`_validate_index_doc_plans`.
+        """
+        plan = self._index_doc_plans.get(section_def)
+        if plan is None:
+            plan = _IndexDocPlan(self, section_def)
+            self._index_doc_plans[section_def] = plan
+        return plan
+
+    def _validate_index_doc_plans(self):
+        """
+        Drops all plans, if the indexed properties changed since they were computed.
+        """
+        if self._index_doc_plans_properties != self.indexed_properties:
+            self._index_doc_plans.clear()
+            self._index_doc_plans_properties = frozenset(self.indexed_properties)
+
+    def create_index_doc(self, root: MSection, with_plan: bool = True):
         """
         Creates an indexable document from the given archive.
+
+        The document is the same as the result of `root.m_to_dict` with defaults,
+        derived values, and resolved references, where only the indexed properties are
+        included and the values are transformed according to the
+        :class:`Elasticsearch` annotations. Instead of evaluating the annotations
+        for each value, a plan is computed once per section definition
+        (see :class:`_IndexDocPlan`) and only the indexed properties are visited.
+        With `with_plan=False` the document is created with the generic
+        `m_to_dict` instead.
         """
         suggestions: DefaultDict = defaultdict(list)
 
@@ -312,7 +346,165 @@ class DocumentType:
             transform=transform,
         )
 
-        result = root.m_to_dict(**kwargs)
+        root_path_length = len(root.m_path())
+
+        def add_suggestions(suggestion_actions, section, value, path=None):
+            for elasticsearch_annotation in suggestion_actions:
+                transform_function = elasticsearch_annotation.value
+                variants = elasticsearch_annotation.variants
+                if transform_function is not None:
+                    if variants:
+                        suggestion_value = []
+                        for variant in variants(value):
+                            suggestion_value.extend(transform_function(variant))
+                        suggestion_value = list(set(suggestion_value))
+                    else:
+                        suggestion_value = transform_function(value)
+                else:
+                    suggestion_value = value
+                section_path = section.m_path()[root_path_length:]
+                name = elasticsearch_annotation.property_name
+                if path is not None:
+                    suggestion_path = f'{section_path}/{path}/{name}'
+                else:
+                    suggestion_path = f'{section_path}/{name}'
+                suggestions[suggestion_path].extend(suggestion_value)
+
+        def serialize_reference(section, name, quantity, value, actions):
+            path = f'{section.m_path()}/{name}'
+
+            if isinstance(quantity.type, QuantityReference):
+                target_name = quantity.type.target_quantity_def.name
+                target_type = quantity.type.target_quantity_def.type
+
+                def serialize_resolved(v, stack=None):
+                    if isinstance(v, list):
+                        return [
+                            serialize_resolved(x, [i] if stack is None else stack + [i])
+                            for i, x in enumerate(v)
+                        ]
+
+                    def transform_value(_value, _stack=None):
+                        _path = path
+                        if _stack is not None:
+                            _path += '/' + '/'.join(str(i) for i in _stack)
+                        return apply_actions(actions, section, _value, _path)
+
+                    resolved_section = v.m_resolved()
+                    try:
+                        resolved_value = resolved_section.__dict__[target_name]
+                    except KeyError:
+                        resolved_value = getattr(resolved_section, target_name)
+
+                    return target_type.serialize(
+                        resolved_value,
+                        section=resolved_section,
+                        transform=transform_value,
+                    )
+
+                return serialize_resolved(value)
+
+            # Referenced sections are serialized with the generic m_to_dict
+            def serialize_section(v, p):
+                if isinstance(v, list):
+                    return [serialize_section(x, f'{p}/{i}') for i, x in enumerate(v)]
+
+                def transform_referenced(_q, _s, _v, _):
+                    return transform(_q, _s, _v, p)
+
+                return v.m_resolved().m_to_dict(
+                    **dict(kwargs, transform=transform_referenced)
+                )
+
+            return serialize_section(value, path)
+
+        def apply_actions(actions, section, value, path=None):
+            suggestion_actions, value_action = actions
+            if suggestion_actions:
+                add_suggestions(suggestion_actions, section, value, path)
+            if value_action is not None:
+                return value_action(section)
+            return value
+
+        def to_dict(section: MSection) -> dict:
+            plan = self._index_doc_plan(section.m_def)
+            if (
+                plan.use_m_to_dict
+                or section.m_annotations
+                or section.__dict__.get('m_attributes')
+                or type(section).m_to_dict is not MSection.m_to_dict
+            ):
+                return section.m_to_dict(**kwargs)
+
+            result: Dict[str, Any] = {}
+            if (
+                section.m_parent
+                and section.m_parent_sub_section.sub_section != section.m_def
+            ):
+                result['m_def'] = section.m_def.definition_reference(section)
+
+            section_dict = section.__dict__
+            for (
+                name,
+                quantity,
+                storage_name,
+                derived,
+                default,
+                has_default,
+                quantity_type,
+                is_reference,
+                actions,
+            ) in plan.quantities:
+                try:
+                    if derived is not None:
+                        try:
+                            value = derived(section)
+                        except Exception:  # noqa
+                            value = default
+                    elif storage_name in section_dict:
+                        value = section_dict[storage_name]
+                    elif has_default:
+                        value = default
+                    else:
+                        continue
+
+                    if is_reference:
+                        result[name] = serialize_reference(
+                            section, name, quantity, value, actions
+                        )
+                    elif actions is None:
+                        result[name] = quantity_type.serialize(value, section=section)
+                    else:
+                        result[name] = quantity_type.serialize(
+                            value,
+                            section=section,
+                            transform=lambda v, p=None: apply_actions(
+                                actions, section, v
+                            ),
+                        )
+                except ValueError as e:
+                    raise ValueError(f'Value error ({str(e)}) for {quantity}')
+
+            for name, storage_name, repeats in plan.sub_sections:
+                sub_sections = section_dict.get(storage_name)
+                if sub_sections is None:
+                    continue
+                if repeats:
+                    if len(sub_sections) > 0:
+                        result[name] = [
+                            None if item is None else to_dict(item)
+                            for item in sub_sections
+                        ]
+                else:
+                    result[name] = to_dict(sub_sections)
+
+            return result
+
+        if with_plan:
+            self._validate_index_doc_plans()
+            result = to_dict(root)
+        else:
+            result = root.m_to_dict(**kwargs)
 
         # Add the collected suggestion values
         for path, value in suggestions.items():
@@ -587,6 +779,90 @@ class DocumentType:
         return self.name
 
 
+class _IndexedQuantity(NamedTuple):
+    name: str
+    definition: Quantity
+    storage_name: str
+    derived: Optional[Callable]
+    default: Any
+    has_default: bool
+    type: Any
+    is_reference: bool
+    actions: Optional[Tuple[List['Elasticsearch'], Optional[Callable]]]
+
+
+class _IndexDocPlan:
+    """
+    The indexed properties of a section definition and how to serialize them
+    for the documents of a :class:`DocumentType`. The properties of the definitions
+    are copied, because accessing them through the metainfo is comparably slow.
+
+    Attributes:
+        quantities: The indexed quantities. Their actions are the suggestion
+            annotations and the value transform function, or None if values are
+            not transformed.
+        sub_sections: Tuples with name, storage name, and repeats of all indexed
+            sub sections.
+        use_m_to_dict: Sections with properties that are not covered by the plan
+            have to be serialized with the generic `m_to_dict`.
+    """
+
+    def __init__(self, doc_type: DocumentType, section_def: Section):
+        self.quantities: List[_IndexedQuantity] = []
+        self.sub_sections: List[Tuple[str, str, bool]] = []
+        self.use_m_to_dict = False
+
+        for name, quantity in section_def.all_quantities.items():
+            if quantity not in doc_type.indexed_properties:
+                continue
+
+            if quantity.virtual and quantity.derived is None:
+                continue
+
+            if quantity.use_full_storage:
+                self.use_m_to_dict = True
+
+            suggestion_actions = []
+            value_action = None
+            for annotation in quantity.m_get_annotations(Elasticsearch, as_list=True):
+                if annotation.field is not None:
+                    continue
+                if annotation.suggestion:
+                    # The suggestions may have a different doc_type: we
+                    # don't serialize them if the doc types don't match.
+                    if doc_type != entry_type and annotation.doc_type != doc_type:
+                        continue
+                    suggestion_actions.append(annotation)
+                elif annotation.value is not None:
+                    value_action = annotation.value
+                    break
+
+            is_reference = not isinstance(quantity.type, Datatype)
+            actions = None
+            if suggestion_actions or value_action is not None or is_reference:
+                actions = (suggestion_actions, value_action)
+
+            self.quantities.append(
+                _IndexedQuantity(
+                    name=name,
+                    definition=quantity,
+                    storage_name=quantity.name,
+                    derived=quantity.derived,
+                    default=quantity.default,
+                    has_default=quantity.m_is_set(Quantity.default),
+                    type=quantity.type,
+                    is_reference=is_reference,
+                    actions=actions,
+                )
+            )
+
+        for name, sub_section_def in section_def.all_sub_sections.items():
+            if sub_section_def in doc_type.indexed_properties:
+                self.sub_sections.append(
+                    (name, sub_section_def.name, sub_section_def.repeats)
+                )
+
+
 class Index:
     """
     Allows to access an Elasticsearch index. It forwards method calls to Python's
@@ -1198,34 +1474,58 @@ def index_entries(entries: List, refresh: bool = False) -> Dict[str, str]:
     logger = utils.get_logger('nomad.search', n_entries=len(entries))
 
     with utils.timer(logger, 'prepare bulk index of entries actions and docs'):
-        actions_and_docs = []
-        for entry in entries:
-            try:
-                entry_index_doc = entry_type.create_index_doc(entry)
+        entry_docs = create_entry_index_docs(entries, logger=logger)
+
+    return index_entry_docs(entry_docs, refresh=refresh, logger=logger)
 
-                actions_and_docs.append(dict(index=dict(_id=entry['entry_id'])))
-                actions_and_docs.append(entry_index_doc)
-            except Exception as e:
-                logger.error(
-                    'could not create entry index doc',
-                    entry_id=entry['entry_id'],
-                    exc_info=e,
-                )
 
-        timer_kwargs: Dict[str, Any] = {}
+def create_entry_index_docs(entries: List, logger=None) -> List[Tuple[str, Dict]]:
+    """
+    Creates the entry index documents for the given entries. Returns a list of tuples
+    of the format (entry_id, index_doc). Entries that fail are logged and omitted.
+    """
+    if logger is None:
+        logger = utils.get_logger('nomad.search', n_entries=len(entries))
+
+    entry_docs = []
+    for entry in entries:
         try:
-            import json
+            entry_docs.append((entry['entry_id'], entry_type.create_index_doc(entry)))
+        except Exception as e:
+            logger.error(
+                'could not create entry index doc',
+                entry_id=entry['entry_id'],
+                exc_info=e,
+            )
 
-            timer_kwargs['size'] = len(json.dumps(actions_and_docs))
-            timer_kwargs['n_actions'] = len(actions_and_docs)
-        except Exception:
-            pass
+    return entry_docs
+
+
+def index_entry_docs(
+    entry_docs: List[Tuple[str, Dict]], refresh: bool = False, logger=None
+) -> Dict[str, str]:
+    """
+    Upserts the given (entry_id, index_doc) tuples in the entry index with a single bulk
+    request. Returns a dictionary of the format {entry_id: error_message} for all entries
+    that failed to index.
+    """
+    rv: Dict[str, str] = {}
+    if len(entry_docs) == 0:
+        return rv
+
+    if logger is None:
+        logger = utils.get_logger('nomad.search', n_entries=len(entry_docs))
+
+    actions_and_docs = []
+    for entry_id, entry_index_doc in entry_docs:
+        actions_and_docs.append(dict(index=dict(_id=entry_id)))
+        actions_and_docs.append(entry_index_doc)
 
     with utils.timer(
         logger,
         'perform bulk index of entries',
         lnr_event='failed to bulk index entries',
-        **timer_kwargs,
+        n_actions=len(actions_and_docs),
     ):
         indexing_result = entry_index.bulk(
             body=actions_and_docs,
@@ -1241,7 +1541,57 @@ def index_entries(entries: List, refresh: bool = False) -> Dict[str, str]:
         return rv
 
 
+_update_material_script = """
+def entries = ctx._source.entries;
+if (entries == null) {
+    entries = new ArrayList();
+}
+def remove = new HashSet(params.remove);
+def updates = new HashMap();
+for (entry in params.entries) {
+    updates.put(entry.entry_id, entry);
+}
+def updated = new ArrayList();
+for (entry in entries) {
+    if (!remove.contains(entry.entry_id)) {
+        def update = updates.remove(entry.entry_id);
+        updated.add(update == null ? entry : update);
+    }
+}
+for (entry in params.entries) {
+    if (updates.containsKey(entry.entry_id)) {
+        updated.add(entry);
+    }
+}
+entries = updated;
+if (entries.isEmpty()) {
+    ctx.op = ctx._source.isEmpty() ? 'none' : 'delete';
+} else {
+    if (params.material != null) {
+        ctx._source.putAll(params.material);
+    }
+    ctx._source.n_entries = entries.size();
+    if (entries.size() > params.cap) {
+        entries = new ArrayList(entries.subList(0, params.cap));
+    }
+    ctx._source.entries = entries;
+}
+"""
+"""
+The painless script that applies the delta of a material, i.e. removes the entries in
+`params.remove`, upserts the nested entries in `params.entries`, updates the material
+properties with `params.material` and deletes materials that run empty. Existing nested
+entries are replaced in place and new entries are appended. Capping the entries hence
+never drops an updated entry in favour of a new one.
+"""
+
+
 def update_materials(entries: List, refresh: bool = False):
+    """
+    Updates the materials of the given entries in the materials index. Instead of
+    re-indexing complete materials, each affected material gets a scripted partial
+    update that only replaces the nested entries of the given entries.
+    """
     # split into reasonably sized problems
     if len(entries) > config.elastic.bulk_size:
         for entries_part in [
@@ -1264,229 +1614,123 @@ def update_materials(entries: List, refresh: bool = False):
             pass
         return material_id
 
-    # Get all entry and material ids.
-    entry_ids, material_ids = set(), set()
-    entries_dict = {}
+    # Group the entries by their (new) material id. Each material gets a delta with
+    # the nested entries to upsert, the entries to remove, and the material properties.
+    material_entry_ids: Dict[str, List[str]] = defaultdict(list)
+    deltas: Dict[str, Dict[str, Any]] = {}
     for entry in entries:
-        entries_dict[entry.entry_id] = entry
-        entry_ids.add(entry.entry_id)
         material_id = get_material_id(entry)
-        if material_id is not None:
-            material_ids.add(material_id)
+        material_entry_ids[material_id].append(entry.entry_id)
+        if material_id is None:
+            continue
 
-    logger = logger.bind(n_materials=len(material_ids))
+        delta = deltas.setdefault(
+            material_id, dict(entries=[], remove=[], material=None)
+        )
+        try:
+            # There might be slight changes even if the material is made from entry
+            # properties that are "material defining", e.g. changed external material
+            # quantities like new AFLOW prototypes
+            delta['material'] = material_type.create_index_doc(entry.results.material)
+        except Exception as e:
+            logger.error('could not create material index doc', exc_info=e)
+        try:
+            delta['entries'].append(material_entry_type.create_index_doc(entry))
+        except Exception as e:
+            logger.error('could not create material entry index doc', exc_info=e)
 
-    # Get existing materials for entries' material ids (i.e. the entry needs to be added
-    # or updated).
-    with utils.timer(
-        logger, 'get existing materials', lnr_event='failed to get existing materials'
-    ):
-        if material_ids:
-            elasticsearch_results = material_index.mget(
-                body={'docs': [dict(_id=material_id) for material_id in material_ids]},
-                request_timeout=config.elastic.bulk_timeout,
-            )
-            existing_material_docs = [
-                doc['_source']
-                for doc in elasticsearch_results['docs']
-                if '_source' in doc
-            ]
-        else:
-            existing_material_docs = []
+    logger = logger.bind(n_materials=len(deltas))
 
-    # Get old materials that still have one of the entries, but the material id has changed
-    # (i.e. the materials where entries need to be removed due entries having different
-    # materials now).
+    # Get old materials that still have one of the entries, but the material id has
+    # changed (i.e. the materials where entries need to be removed due entries having
+    # different materials now). Only the ids of these (rare) materials are fetched.
     with utils.timer(
         logger, 'get old materials', lnr_event='failed to get old materials'
     ):
-        elasticsearch_results = material_index.search(
-            body={
-                'size': len(entry_ids),
-                'query': {
+        should = []
+        for material_id, entry_ids in material_entry_ids.items():
+            query: Dict[str, Any] = {
+                'nested': {
+                    'path': 'entries',
+                    'query': {'terms': {'entries.entry_id': entry_ids}},
+                }
+            }
+            if material_id is not None:
+                query = {
                     'bool': {
-                        'must': {
-                            'nested': {
-                                'path': 'entries',
-                                'query': {
-                                    'terms': {'entries.entry_id': list(entry_ids)}
-                                },
-                            }
-                        },
-                        'must_not': {'terms': {'material_id': list(material_ids)}},
+                        'must': query,
+                        'must_not': {'term': {'material_id': material_id}},
                     }
-                },
+                }
+            should.append(query)
+        elasticsearch_results = material_index.search(
+            body={
+                'size': len(entries),
+                '_source': False,
+                'query': {'bool': {'should': should, 'minimum_should_match': 1}},
             }
         )
-        old_material_docs = [
-            hit['_source'] for hit in elasticsearch_results['hits']['hits']
-        ]
-
-    # Compare and create the appropriate materials index actions
-    # First, we go through the existing materials. The following cases need to be covered:
-    # - an entry needs to be updated within its existing material (standard case)
-    # - an entry needs to be added to an existing material (new entry case)
-    # - there is an entry with no existing material (new material case)
-    # - there is an entry that moves from one existing material to another (super rare
-    #   case where an entry's material id changed within the set of other entries' material ids)
-    # This n + m complexity with n=number of materials and m=number of entries
+        old_material_ids = [hit['_id'] for hit in elasticsearch_results['hits']['hits']]
+
+    for old_material_id in old_material_ids:
+        delta = deltas.setdefault(
+            old_material_id, dict(entries=[], remove=[], material=None)
+        )
+        delta['remove'].extend(
+            entry_id
+            for material_id, entry_ids in material_entry_ids.items()
+            if material_id != old_material_id
+            for entry_id in entry_ids
+        )
 
     # We create lists of bulk operations. Each list only contains enough materials to
-    # have the ammount of entries in all these materials roughly match the desired bulk size.
-    # Using materials as a measure might not be good enough, if a single material has
-    # lots of nested entries.
-    _actions_and_docs_bulks: List[List[Any]] = []
-    _n_entries_in_bulk = [0]
-
-    def add_action_or_doc(action_or_doc):
-        if (
-            len(_actions_and_docs_bulks) == 0
-            or _n_entries_in_bulk[0] > config.elastic.bulk_size
-        ):
-            _n_entries_in_bulk[0] = 0
-            _actions_and_docs_bulks.append([])
-        _actions_and_docs_bulks[-1].append(action_or_doc)
-        if 'entries' in action_or_doc:
-            _n_entries_in_bulk[0] = _n_entries_in_bulk[0] + len(
-                action_or_doc['entries']
+    # have the amount of entries in all these materials roughly match the desired bulk size.
+    actions_bulks: List[List[Any]] = []
+    n_entries_in_bulk = 0
+    for material_id, delta in deltas.items():
+        if len(actions_bulks) == 0 or n_entries_in_bulk > config.elastic.bulk_size:
+            n_entries_in_bulk = 0
+            actions_bulks.append([])
+
+        action: Dict[str, Any] = dict(
+            script=dict(
+                source=_update_material_script,
+                lang='painless',
+                params=dict(delta, cap=config.elastic.entries_per_material_cap),
             )
-
-    material_docs = []
-    material_docs_dict = {}
-    remaining_entry_ids = set(entry_ids)
-    for material_doc in existing_material_docs:
-        material_id = material_doc['material_id']
-        material_docs_dict[material_id] = material_doc
-        material_entries = material_doc['entries']
-        material_entries_to_remove = []
-        for index, material_entry in enumerate(material_entries):
-            entry_id = material_entry['entry_id']
-            entry = entries_dict.get(entry_id)
-            if entry is None:
-                # The entry was not changed.
-                continue
-            else:
-                # Update the material, there might be slight changes even if it is made
-                # from entry properties that are "material defining", e.g. changed external
-                # material quantities like new AFLOW prototypes
-                try:
-                    material_doc.update(
-                        **material_type.create_index_doc(entry.results.material)
-                    )
-                except Exception as e:
-                    logger.error('could not create material index doc', exc_info=e)
-
-            new_material_id = get_material_id(entry)
-            if new_material_id != material_id:
-                # Remove the entry, it moved to another material. But the material cannot
-                # run empty, because another entry had this material id.
-                material_entries_to_remove.append(index)
-            else:
-                # Update the entry.
-                try:
-                    material_entries[index] = material_entry_type.create_index_doc(
-                        entry
-                    )
-                except Exception as e:
-                    logger.error('could not create material index doc', exc_info=e)
-                remaining_entry_ids.remove(entry_id)
-        for index in reversed(material_entries_to_remove):
-            del material_entries[index]
-
-        add_action_or_doc(dict(index=dict(_id=material_id)))
-        add_action_or_doc(material_doc)
-        material_docs.append(material_doc)
-
-    for entry_id in remaining_entry_ids:
-        entry = entries_dict.get(entry_id)
-        material_id = get_material_id(entry)
-        if material_id is not None:
-            material_doc = material_docs_dict.get(material_id)
-            if material_doc is None:
-                # The material does not yet exist. Create it.
-                try:
-                    material_doc = material_type.create_index_doc(
-                        entry.results.material
-                    )
-                except Exception as e:
-                    logger.error('could not create material index doc', exc_info=e)
-                material_docs_dict[material_id] = material_doc
-                add_action_or_doc(dict(create=dict(_id=material_id)))
-                add_action_or_doc(material_doc)
-                material_docs.append(material_doc)
-            # The material does exist (now), but the entry is new.
-            try:
-                material_doc.setdefault('entries', []).append(
-                    material_entry_type.create_index_doc(entry)
-                )
-            except Exception as e:
-                logger.error('could not create material entry index doc', exc_info=e)
-
-    # Second, we go through the old materials. The following cases need to be covered:
-    # - the old materials are empty (standard case)
-    # - an entry needs to be removed but the material still has entries (new material id case 1)
-    # - an entry needs to be removed and the material is now "empty" (new material id case 2)
-    for material_doc in old_material_docs:
-        material_id = material_doc['material_id']
-        material_entries = material_doc['entries']
-        material_entries_to_remove = []
-        for index, material_entry in enumerate(material_entries):
-            entry_id = material_entry['entry_id']
-            if entry_id in entry_ids:
-                # The entry does not belong to this material anymore and needs to be removed.
-                material_entries_to_remove.append(index)
-        for index in reversed(material_entries_to_remove):
-            del material_entries[index]
-        if len(material_entries) == 0:
-            # The material is empty now and needs to be removed.
-            add_action_or_doc(dict(delete=dict(_id=material_id)))
-        else:
-            # The material needs to be updated
-            add_action_or_doc(dict(index=dict(_id=material_id)))
-            add_action_or_doc(material_doc)
-            material_docs.append(material_doc)
-
-    # Third, we potentially cap the number of entries in a material. We ensure that only
-    # a certain amounts of entries are stored with all metadata. The rest will only
-    # have their entry id.
-    all_n_entries_capped = 0
-    all_n_entries = 0
-    for material_doc in material_docs:
-        material_entries = material_doc.get('entries', [])
-        material_doc['n_entries'] = len(material_entries)
-        if len(material_entries) > config.elastic.entries_per_material_cap:
-            material_doc['entries'] = material_entries[
-                0 : config.elastic.entries_per_material_cap
-            ]
-
-        all_n_entries_capped += len(material_entries)
-        all_n_entries += material_doc['n_entries']
+        )
+        if delta['entries']:
+            # new materials are created by running the script on an empty document
+            action.update(scripted_upsert=True, upsert={})
+        actions_bulks[-1].append(
+            dict(update=dict(_id=material_id, retry_on_conflict=3))
+        )
+        actions_bulks[-1].append(action)
+        n_entries_in_bulk += len(delta['entries']) + len(delta['remove'])
 
     # Execute the created actions in bulk.
-    timer_kwargs: Dict[str, Any] = {}
-    try:
-        import json
-
-        timer_kwargs['size'] = len(json.dumps(_actions_and_docs_bulks))
-        timer_kwargs['n_actions'] = sum([len(bulk) for bulk in _actions_and_docs_bulks])
-        timer_kwargs['n_entries'] = all_n_entries
-        timer_kwargs['n_entries_capped'] = all_n_entries_capped
-    except Exception:
-        pass
-
     with utils.timer(
         logger,
-        'perform bulk index of materials',
-        lnr_event='failed to bulk index materials',
-        **timer_kwargs,
+        'perform bulk update of materials',
+        lnr_event='failed to bulk update materials',
+        n_actions=len(deltas),
+        n_old_materials=len(old_material_ids),
     ):
-        for bulk in _actions_and_docs_bulks:
-            material_index.bulk(
+        for bulk in actions_bulks:
+            result = material_index.bulk(
                 body=bulk,
                 refresh=False,
                 timeout=f'{config.elastic.bulk_timeout}s',
                 request_timeout=config.elastic.bulk_timeout,
             )
+            if result['errors']:
+                for item in result['items']:
+                    if item['update']['status'] >= 400:
+                        logger.error(
+                            'could not update material',
+                            material_id=item['update']['_id'],
+                            error=str(item['update'].get('error')),
+                        )
 
     if refresh:
         entry_index.refresh()
@@ -832,6 +832,209 @@ class Context:
         raise NotImplementedError
 
 
+def _to_json(value):
+    return value.to_json() if hasattr(value, 'to_json') else value
+
+
+class _LazySectionDict(dict):
+    """
+    The `__dict__` of a section that was created lazily from serialized data, e.g.
+    an :class:`nomad.archive.storage_v2.ArchiveDict`, see :func:`MSection.from_dict`.
+    The properties are only deserialized from the data when they are accessed for
+    the first time. Subsections are created lazily as well. Operations that need
+    all properties, e.g. iterating, deserialize all remaining properties.
+    """
+
+    __slots__ = ('_section', '_data', '_pending', '_kwargs')
+
+    def __init__(self, section: MSection, data, pending: set[str], **kwargs):
+        super().__init__(section.__dict__)
+        self._section: MSection | None = section
+        self._data = data
+        self._pending: set[str] = pending
+        self._kwargs = kwargs
+
+    def _load(self, key) -> None:
+        if key not in self._pending:
+            return
+
+        self._pending.remove(key)
+        section, data = self._section, self._data
+        if not self._pending:
+            # release the data as early as possible
+            self._section, self._data = None, None
+
+        definition = section.m_def.all_properties[key]
+        value = data[key]
+
+        if isinstance(definition, Quantity):
+            section.m_set(definition, _to_json(value), **self._kwargs)
+            return
+
+        m_context = section.m_context if section.m_context else section
+
+        def create(item):
+            if item is None:
+                return None
+            return MSection.from_dict(
+                item,
+                cls=definition.sub_section.section_cls,
+                m_parent=section,
+                m_context=m_context,
+                lazy=True,
+                **self._kwargs,
+            )
+
+        if not definition.repeats:
+            section.m_set(definition, create(value))
+            return
+
+        if hasattr(value, 'values') and not isinstance(value, list):
+            value = sorted(value.values(), key=lambda x: x['m_parent_index'])
+        for item in value:
+            section.m_append(definition, create(item))
+
+    def _load_all(self) -> None:
+        while self._pending:
+            self._load(next(iter(self._pending)))
+
+    def __missing__(self, key):
+        self._load(key)
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        self._load(key)
+        return dict.__contains__(self, key)
+
+    def __setitem__(self, key, value):
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._load(key)
+        dict.__delitem__(self, key)
+
+    def get(self, key, default=None):
+        self._load(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self._load(key)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *args):
+        self._load(key)
+        return dict.pop(self, key, *args)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self._pending.difference_update(other)
+        dict.update(self, other)
+
+    def __iter__(self):
+        self._load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._load_all()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._load_all()
+        return dict.__eq__(self, other)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        self._load_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        # copies and pickles are plain dicts with all properties
+        return dict, (dict(self.items()),)
+
+    def keys(self):
+        self._load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):
+        self._load_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._load_all()
+        return dict.copy(self)
+
+    @staticmethod
+    def _property_kinds(m_def: Section) -> dict[str, str]:
+        # the kinds are cached with the section definition for as long as its
+        # properties do not change
+        all_properties = m_def.all_properties
+        cached = m_def.m_cache.get('lazy_property_kinds')
+        if cached is None or cached[0] is not all_properties:
+            cached = m_def.m_cache['lazy_property_kinds'] = (all_properties, {})
+        return cached[1]
+
+    @staticmethod
+    def _property_kind(m_def: Section, name: str) -> str:
+        """
+        Determines if the given key is deserialized `lazy`, `eager`, or is
+        `ignored` as it does not belong to a property.
+        """
+        definition = m_def.all_properties.get(name)
+        if definition is None or definition.name != name:
+            if name in m_def.all_aliases or m_def.has_variable_names:
+                return 'eager'
+            return 'ignored'
+
+        if isinstance(definition, Quantity):
+            if definition.use_full_storage:
+                return 'eager'
+            if definition.virtual:
+                return 'ignored'
+
+        return 'lazy'
+
+    @staticmethod
+    def install(section: MSection, data, **kwargs) -> None:
+        """
+        Makes the given section lazily deserialize its properties from the data.
+        Properties that cannot be loaded by name, e.g. aliases or variadic names,
+        are deserialized right away.
+        """
+        pending: set[str] = set()
+        eager: dict = {}
+        kinds = _LazySectionDict._property_kinds(section.m_def)
+        for name in data:
+            if name.startswith('m_'):
+                continue
+
+            if (kind := kinds.get(name)) is None:
+                kind = kinds[name] = _LazySectionDict._property_kind(
+                    section.m_def, name
+                )
+
+            if kind == 'lazy':
+                pending.add(name)
+            elif kind == 'eager':
+                eager[name] = _to_json(data[name])
+
+        if 'm_attributes' in data:
+            eager['m_attributes'] = _to_json(data['m_attributes'])
+
+        if pending:
+            section.__dict__ = _LazySectionDict(section, data, pending, **kwargs)
+
+        if eager:
+            section.m_update_from_dict(eager, **kwargs)
+
+
 # TODO find a way to make this a subclass of collections.abs.Mapping
 class MSection(metaclass=MObjectMeta):
     """
@@ -1812,6 +2015,7 @@ class MSection(metaclass=MObjectMeta):
         exclude: TypingCallable[[Definition, MSection], bool] = None,
         transform: TypingCallable[[Definition, MSection, Any, str], Any] = None,
         subsection_as_dict: bool = False,
+        keep_ndarray: bool = False,
     ) -> dict:
         """
         Returns the data of this section as a (json serializable) dictionary.
@@ -1862,6 +2066,10 @@ class MSection(metaclass=MObjectMeta):
                 type.
             subsection_as_dict: If true, try to serialize subsections as dictionaries.
                 Only possible when the keys are unique. Otherwise, serialize as list.
+            keep_ndarray: If true, numerical numpy arrays are not converted into
+                (nested) lists, but are kept as they are. The result is not JSON
+                serializable, but can be packed into archives more efficiently.
+                Has no effect, if a `transform` is given.
         """
         if isinstance(self, Definition) and not with_out_meta:
             with_meta = True
@@ -1880,6 +2088,7 @@ class MSection(metaclass=MObjectMeta):
             exclude=exclude,
             transform=transform,
             subsection_as_dict=subsection_as_dict,
+            keep_ndarray=keep_ndarray,
         )
 
         assert not (
@@ -1941,7 +2150,15 @@ class MSection(metaclass=MObjectMeta):
 
             quantity_type = quantity.type
 
-            if isinstance(quantity_type, Datatype) or not resolve_references:
+            if isinstance(quantity_type, Datatype):
+                return quantity_type.serialize(
+                    target_value,
+                    section=self,
+                    transform=_transform_wrapper,
+                    ndarray=keep_ndarray and transform is None,
+                )
+
+            if not resolve_references:
                 return quantity_type.serialize(
                     target_value, section=self, transform=_transform_wrapper
                 )
@@ -2209,9 +2426,15 @@ class MSection(metaclass=MObjectMeta):
         `m_from_dict`, but does not require a specific class. You can provide a class
         through the optional parameter. Otherwise, the section definition is read from
         the `m_def` key in the section data.
+
+        With `lazy`, the properties are not deserialized right away, but when they
+        are accessed for the first time. The data can then be any mapping, e.g.
+        an :class:`nomad.archive.storage_v2.ArchiveDict`, that needs to stay
+        readable for as long as the section is used.
         """
 
         treat_none_as_nan: bool = kwargs.pop('treat_none_as_nan', False)
+        lazy: bool = kwargs.pop('lazy', False)
 
         if 'm_ref_archives' in dct and isinstance(m_context, Context):
             # dct['m_ref_archives'] guarantees that 'm_def' exists
@@ -2219,10 +2442,11 @@ class MSection(metaclass=MObjectMeta):
                 m_context.cache_archive(
                     entry_url,
                     MSection.from_dict(
-                        archive_json, m_parent=m_parent, m_context=m_context
+                        _to_json(archive_json), m_parent=m_parent, m_context=m_context
                     ),
                 )
-            del dct['m_ref_archives']
+            if not lazy:
+                del dct['m_ref_archives']
 
         # first try to find a m_def in the data
         if 'm_def' in dct:
@@ -2266,7 +2490,7 @@ class MSection(metaclass=MObjectMeta):
         section.m_parent = m_parent
 
         if 'm_annotations' in dct:
-            m_annotations = dct['m_annotations']
+            m_annotations = _to_json(dct['m_annotations'])
             if not isinstance(m_annotations, dict):
                 raise MetainfoError(
                     f'The provided m_annotations is of a wrong type. {type(m_annotations).__name__} was provided.'
@@ -2274,7 +2498,10 @@ class MSection(metaclass=MObjectMeta):
             section.m_annotations.update(m_annotations)
             section.m_parse_annotations()
 
-        section.m_update_from_dict(dct, treat_none_as_nan=treat_none_as_nan)
+        if lazy:
+            _LazySectionDict.install(section, dct, treat_none_as_nan=treat_none_as_nan)
+        else:
+            section.m_update_from_dict(dct, treat_none_as_nan=treat_none_as_nan)
         return section
 
     def m_to_json(self, **kwargs):
@@ -16,10 +16,9 @@
 # limitations under the License.
 #
 
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 from collections import defaultdict
 import pathlib
-import json
 from math import isnan
 
 from ase import Atoms
@@ -63,8 +62,51 @@ from nomad.normalizing.common import (
 conventional_description = 'The conventional cell of the material from which the subsystem is constructed from.'
 subsystem_description = 'Automatically detected subsystem.'
 chemical_symbols = np.array(chemical_symbols)
-with open(pathlib.Path(__file__).parent / 'data/top_50k_material_ids.json', 'r') as fin:
-    top_50k_material_ids = json.load(fin)
+top_50k_material_ids_path = (
+    pathlib.Path(__file__).parent / 'data/top_50k_material_ids.npy'
+)
+
+
+class MaterialIds:
+    """
+    A set of material ids stored as a sorted array of fixed-width byte strings in a
+    numpy file. The file is memory mapped on first use, i.e. its pages are shared
+    between processes. Membership is tested with a binary search.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self._material_ids: np.ndarray = None
+
+    @property
+    def material_ids(self) -> np.ndarray:
+        if self._material_ids is None:
+            self._material_ids = np.load(self.path, mmap_mode='r')
+        return self._material_ids
+
+    def __contains__(self, material_id) -> bool:
+        if not isinstance(material_id, str):
+            return False
+        key = material_id.encode()
+        material_ids = self.material_ids
+        if len(key) > material_ids.dtype.itemsize:
+            return False
+        index = np.searchsorted(material_ids, key)
+        return bool(index < len(material_ids) and material_ids[index] == key)
+
+    def __len__(self) -> int:
+        return len(self.material_ids)
+
+    @staticmethod
+    def write(material_ids: Iterable[str], path: pathlib.Path):
+        """Writes the given material ids to a file that can be read with this class."""
+        with open(path, 'wb') as f:
+            np.save(f, np.array(sorted(set(material_ids)), dtype=np.bytes_))
+
+
+# The materials with the most entries, created with an ES terms aggregation, see
+# `nomad admin ops top-materials-update`.
+top_50k_material_ids = MaterialIds(top_50k_material_ids_path)
 
 
 def get_topology_id(index: int) -> str:
@@ -403,7 +445,7 @@ class TopologyNormalizer:
                     # 50k materials with most entries attached to them. This ensures
                     # that the material_id link points to valid materials and that we
                     # don't report anything too weird. The top 50k materials are
-                    # pre-stored in a pickle file that has been created by using ES
+                    # pre-stored in a numpy file that has been created by using ES
                     # terms aggregation.
                     if conventional_cell.material_id in top_50k_material_ids:
                         add_system(subsystem, topology, original)
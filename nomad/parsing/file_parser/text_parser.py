@@ -16,15 +16,72 @@
 import mmap
 import io
 import re
+import warnings
 import numpy as np
 import pint
-from typing import List, Union, Callable, Type, Any
+from typing import List, Sequence, Union, Callable, Type, Any
 
 from nomad.parsing.file_parser import FileParser
 from nomad.metainfo import Quantity as mQuantity
 from nomad.utils import get_logger
 
 
+_numeric_block_bytes = b'0123456789+-.eE \t\n\r\x0b\x0c'
+
+
+def _to_numeric_array(val_raw: bytes) -> np.ndarray:
+    """
+    Parses a block of whitespace separated numbers into a float array without creating
+    intermediate Python strings. Returns None if the block contains anything that does
+    not convert to the same numbers with `float`, e.g. other characters or malformed
+    tokens.
+    """
+    if val_raw.translate(None, _numeric_block_bytes):
+        return None
+
+    # all remaining characters besides whitespace have codes larger than ' '
+    is_token = np.frombuffer(val_raw, dtype=np.uint8) > 32
+    n_tokens = int(is_token[0]) + np.count_nonzero(is_token[1:] & ~is_token[:-1])
+
+    with warnings.catch_warnings():
+        # numpy warns (instead of raising) if it cannot parse all the data
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            data = np.fromstring(val_raw, dtype=np.float64, sep=' ')
+        except (DeprecationWarning, ValueError):
+            return None
+
+    # separators match zero or more whitespace, e.g. `1-2` is parsed as [1, -2]
+    if data.size != n_tokens:
+        return None
+
+    return data
+
+
+class _SharedMap:
+    """
+    A file mapping that is shared between a parser and the sub-parsers that work on
+    views of it. The mapping is closed once the parser and all sub-parsers released it.
+    """
+
+    def __init__(self, file_mmap: mmap.mmap):
+        self.mmap = file_mmap
+        self._users = 1
+
+    def acquire(self) -> '_SharedMap':
+        self._users += 1
+        return self
+
+    def release(self):
+        self._users -= 1
+        if self._users == 0:
+            try:
+                self.mmap.close()
+            except BufferError:
+                # someone else still holds a view, the map is closed when it is collected
+                pass
+
+
 class ParsePattern:
     def __init__(self, **kwargs):
         self._head = kwargs.get('head', '')
@@ -156,6 +213,20 @@ class Quantity:
         self.reduce: bool = kwargs.get('reduce', True)
         self.comment: str = kwargs.get('comment', None)
 
+    @property
+    def is_numeric(self) -> bool:
+        """
+        Whether matched blocks can be converted into float arrays directly from bytes.
+        """
+        return (
+            self.str_operation is None
+            and self.sub_parser is None
+            and self.flatten
+            and self.convert
+            and self.comment is None
+            and self.dtype in (None, float, np.float64)
+        )
+
     @property
     def re_pattern(self):
         """
@@ -170,9 +241,10 @@ class Quantity:
     def re_pattern(self, val: str):
         self._re_pattern = val
 
-    def to_data(self, val_raw: str):
+    def to_data(self, val_raw: Union[str, bytes]):
         """
-        Converts the parsed block into data.
+        Converts the parsed block into data. Blocks of numbers given as bytes are
+        parsed directly into arrays if the quantity :attr:`is_numeric`.
         """
 
         def convert(val):
@@ -216,6 +288,21 @@ class Quantity:
         if not val_raw:
             return
 
+        if isinstance(val_raw, bytes):
+            if self.is_numeric:
+                array = _to_numeric_array(val_raw)
+                if array is not None and (array.size > 1 or not self.reduce):
+                    if self.dtype is None and np.all(np.mod(array, 1) == 0):
+                        array = np.array(array, dtype=int)
+                    if self.shape:
+                        try:
+                            array = np.reshape(array, self.shape)
+                        except Exception:
+                            pass
+                    return array
+
+            val_raw = val_raw.decode()
+
         if self.comment is not None:
             if val_raw.strip()[0] == self.comment:
                 return
@@ -281,6 +368,8 @@ class TextParser(FileParser):
         self._file_length: int = kwargs.get('file_length', 0)
         self._file_offset: int = kwargs.get('file_offset', 0)
         self._file_pad: int = 0
+        # the mapping of the file that this parser or its view of a parent buffer uses
+        self._shared_map: _SharedMap = None
         if quantities is None:
             self.init_quantities()
         # check quantity patterns are valid
@@ -324,7 +413,7 @@ class TextParser(FileParser):
         """
         Sets the quantities list.
         """
-        self._file_handler = None
+        self._release_file()
         self._results = None
         self._quantities = val
 
@@ -375,6 +464,7 @@ class TextParser(FileParser):
                     )
                     # set the extra chunk loaded before the intended offset to empty
                     self._file_handler[: self._file_pad] = b' ' * self._file_pad
+                    self._shared_map = _SharedMap(self._file_handler)
                 else:
                     self._file_handler = f.read()
             self._file_pad = 0
@@ -393,7 +483,7 @@ class TextParser(FileParser):
         for key in self.keys():
             yield key, self.get(key)
 
-    def _add_value(self, quantity: Quantity, value: List[str], units):
+    def _add_value(self, quantity: Quantity, value: Sequence[Union[str, bytes]], units):
         """
         Converts the list of parsed blocks into data and apply the corresponding units.
         """
@@ -437,13 +527,13 @@ class TextParser(FileParser):
         matches = re.findall(re_findall_b, self.file_mmap)
         current_index = 0
         for quantity in quantities:
-            values = []
+            values: List[Union[str, bytes]] = []
             units = []
             n_groups = quantity.re_pattern.groups
 
             non_empty_matches = []
             for match in matches:
-                non_empty_match = [
+                non_empty_match: List[bytes] = [
                     m for m in match[current_index : current_index + n_groups] if m
                 ]
                 if not non_empty_match:
@@ -461,7 +551,10 @@ class TextParser(FileParser):
                     else:
                         units.append(None)
 
-                    values.append(' '.join([m.decode() for m in non_empty_match]))
+                    if quantity.is_numeric:
+                        values.append(b' '.join(non_empty_match))
+                    else:
+                        values.append(' '.join([m.decode() for m in non_empty_match]))
                 except Exception:
                     self.logger.error(
                         'Error parsing quantities.', data=dict(quantity=quantity.name)
@@ -476,7 +569,9 @@ class TextParser(FileParser):
 
     def _parse_quantity(self, quantity: Quantity):
         """
-        Parse a single quantity.
+        Parse a single quantity. Quantities with a sub_parser result in (a list of)
+        copies of the sub_parser. These operate on views of the matched blocks in this
+        parser's buffer and are only parsed when their results are accessed.
         """
         value = []
         units = []
@@ -485,6 +580,7 @@ class TextParser(FileParser):
             if quantity.repeats
             else [quantity.re_pattern.search(self.file_mmap)]
         )
+        buffer = memoryview(self.file_mmap) if quantity.sub_parser else None
         for res in re_matches:
             if res is None:
                 continue
@@ -492,22 +588,36 @@ class TextParser(FileParser):
                 sub_parser = quantity.sub_parser.copy()
                 sub_parser.mainfile = self.mainfile
                 sub_parser.logger = self.logger
-                sub_parser._file_handler = b' '.join([g for g in res.groups() if g])
-                value.append(sub_parser.parse())
+                groups = [
+                    index
+                    for index in range(1, len(res.groups()) + 1)
+                    if res.group(index)
+                ]
+                if len(groups) == 1:
+                    sub_parser._file_handler = buffer[
+                        res.start(groups[0]) : res.end(groups[0])
+                    ]
+                    if self._shared_map is not None:
+                        sub_parser._shared_map = self._shared_map.acquire()
+                else:
+                    sub_parser._file_handler = b' '.join(
+                        [res.group(index) for index in groups]
+                    )
+                value.append(sub_parser)
 
             else:
                 try:
                     unit = res.groupdict().get('__unit_%s' % quantity.name, None)
                     units.append(unit.decode() if unit is not None else None)
-                    value.append(
-                        ' '.join(
-                            [
-                                group.decode()
-                                for group in res.groups()
-                                if group and group != unit
-                            ]
+                    match_groups: List[bytes] = [
+                        group for group in res.groups() if group and group != unit
+                    ]
+                    if quantity.is_numeric:
+                        value.append(b' '.join(match_groups))
+                    else:
+                        value.append(
+                            ' '.join([group.decode() for group in match_groups])
                         )
-                    )
                 except Exception:
                     self.logger.error('Error parsing quantity.')
 
@@ -566,20 +676,46 @@ class TextParser(FileParser):
                         self._parse_quantity(quantity)
 
         # free up memory
-        if isinstance(self._file_handler, mmap.mmap) and self.findall:
-            self._file_handler.close()
+        if isinstance(self._file_handler, (mmap.mmap, memoryview)) and self.findall:
+            self._release_file()
             self._file_handler = b' '
 
         return self
 
+    def reset(self):
+        self._release_file()
+        super().reset()
+
+    def _release_file(self):
+        """
+        Releases the file mapping or the view of the parent's buffer. A shared mapping
+        is closed once the parser and all sub-parsers with views released it.
+        """
+        file_handler, self._file_handler = self._file_handler, None
+        if isinstance(file_handler, memoryview):
+            file_handler.release()
+            # the parent's buffer cannot be loaded again
+            self._file_handler = b' '
+        elif isinstance(file_handler, mmap.mmap) and self._shared_map is None:
+            file_handler.close()
+
+        if self._shared_map is not None:
+            shared_map, self._shared_map = self._shared_map, None
+            shared_map.release()
+
     def clear(self):
         """
-        Deletes the file mapping for all sub parsers.
+        Deletes the file mapping for all sub parsers and releases the views of the
+        sub parsers that were created from this parser's buffer.
         """
         for quantity in self.quantities:
             if quantity.sub_parser is not None:
                 quantity.sub_parser.clear()
-        self._file_handler = None
+                results = (self._results or {}).get(quantity.name)
+                for sub_parser in results if isinstance(results, list) else [results]:
+                    if isinstance(sub_parser, TextParser):
+                        sub_parser.clear()
+        self._release_file()
 
 
 class DataTextParser(TextParser):
@@ -17,7 +17,7 @@
 #
 
 import os.path
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Tuple, List, Dict, Iterator
 from collections.abc import Iterable
 
 from nomad.config import config
@@ -30,6 +30,7 @@ from .parser import (
     BrokenParser,
     Parser,
     ArchiveParser,
+    MatchingParser,
     MatchingParserInterface,
 )
 from .artificial import EmptyParser, GenerateRandomParser, TemplateParser, ChaosParser
@@ -57,6 +58,117 @@ except ImportError:
     pass
 
 
+class ParserMatchingIndex:
+    """
+    An index over a list of parsers that allows to quickly find the parsers that
+    can possibly match a given file. For :class:`MatchingParser` instances, the mime type,
+    compression, name, and binary header conditions are evaluated from the index: per mime
+    type and compression the plausible parsers are determined once, and each distinct
+    name regex is evaluated only once per file. Only the remaining candidates are asked to
+    perform the full (and more expensive) `is_mainfile` check, in their original order.
+
+    Parsers that override `is_mainfile` without first delegating to
+    :meth:`MatchingParser.is_mainfile` are always candidates.
+    """
+
+    prefilterable = {
+        MatchingParser.is_mainfile,
+        MatchingParserInterface.is_mainfile,
+        TabularDataParser.is_mainfile,
+    }
+
+    def __init__(self, parsers: List[Parser]):
+        self.parsers = list(parsers)
+        self._candidates: Dict[Tuple[str, str, bool, bool], list] = {}
+
+    def _mime_candidates(
+        self, mime_type: str, compression: str, decoded: bool, strict: bool
+    ) -> list:
+        key = (mime_type, compression, decoded, strict)
+        candidates = self._candidates.get(key)
+        if candidates is not None:
+            return candidates
+
+        candidates = []
+        for parser in self.parsers:
+            if strict and isinstance(parser, (MissingParser, EmptyParser)):
+                continue
+
+            if type(parser).is_mainfile not in self.prefilterable:
+                candidates.append((parser, None, False, None, None))
+                continue
+
+            assert isinstance(parser, MatchingParser)
+            if parser._mainfile_mime_re.match(mime_type) is None:
+                continue
+            if (
+                compression is not None
+                and compression not in parser._supported_compressions
+            ):
+                continue
+            if parser._mainfile_contents_re is not None and not decoded:
+                continue
+
+            candidates.append(
+                (
+                    parser,
+                    parser._mainfile_name_re,
+                    parser._mainfile_alternative,
+                    parser._mainfile_binary_header,
+                    parser._mainfile_binary_header_re,
+                )
+            )
+
+        self._candidates[key] = candidates
+        return candidates
+
+    def candidates(
+        self,
+        mainfile_path: str,
+        mime_type: str,
+        buffer: bytes,
+        decoded_buffer: Optional[str],
+        compression: Optional[str],
+        strict: bool = True,
+    ) -> Iterator[Parser]:
+        """
+        Yields the parsers that might match the given file in the order of the
+        indexed parsers.
+        """
+        name_matches: Dict[str, bool] = {}
+        for parser, name_re, alternative, header, header_re in self._mime_candidates(
+            mime_type, compression, decoded_buffer is not None, strict
+        ):
+            if header is not None and header not in buffer:
+                continue
+            if header_re is not None and header_re.search(buffer) is None:
+                continue
+            if name_re is not None and not alternative:
+                name_match = name_matches.get(name_re.pattern)
+                if name_match is None:
+                    name_match = name_re.fullmatch(mainfile_path) is not None
+                    name_matches[name_re.pattern] = name_match
+                if not name_match:
+                    continue
+
+            yield parser
+
+
+_parser_matching_index: ParserMatchingIndex = None
+
+
+def parser_matching_index() -> ParserMatchingIndex:
+    """
+    Returns the :class:`ParserMatchingIndex` for the registered parsers. The index is
+    created once per process and recreated if the registered parsers change.
+    """
+    global _parser_matching_index
+    if _parser_matching_index is None or _parser_matching_index.parsers != parsers:
+        _parser_matching_index = ParserMatchingIndex(parsers)
+
+    return _parser_matching_index
+
+
 def match_parser(
     mainfile_path: str, strict=True, parser_name: Optional[str] = None
 ) -> Tuple[Parser, List[str]]:
@@ -107,12 +219,15 @@ def match_parser(
                 decoded_buffer = buffer.decode(encoding)
             except Exception:
                 pass
+    parsers_to_check: Iterable[Parser]
     if parser_name:
         parser = parser_dict.get(parser_name)
         assert parser is not None, f'parser by the name `{parser_name}` does not exist'
         parsers_to_check = [parser]
     else:
-        parsers_to_check = parsers
+        parsers_to_check = parser_matching_index().candidates(
+            mainfile_path, mime_type, buffer, decoded_buffer, compression, strict
+        )
     for parser in parsers_to_check:
         if strict and isinstance(parser, (MissingParser, EmptyParser)):
             continue
@@ -16,7 +16,7 @@
 # limitations under the License.
 #
 
-from typing import Any, Tuple, List, Dict, NamedTuple
+from typing import Any, Tuple, List, Dict, NamedTuple, Optional, Type
 import logging
 import time
 import os
@@ -44,6 +44,7 @@ from mongoengine import (
     ValidationError,
 )
 from mongoengine.connection import ConnectionFailure
+from pymongo import ReturnDocument, UpdateOne
 from datetime import datetime
 import functools
 
@@ -257,6 +258,11 @@ class Proc(Document):
             to ensure state consistency and atomicity. There are three types of sync operations:
             when scheduling a process, starting a process, and completing a process.
             NOTE: This value is managed by the framework, do not tamper with this value.
+        pending_children: The number of scheduled child processes that have not completed
+            yet. Each completing child decrements it atomically, and only the child that
+            decrements it to zero tries to join the parent. If it stays positive, a
+            completing child that finds no processing siblings tries to join as well.
+            NOTE: This value is managed by the framework, do not tamper with this value.
     """
 
     id_field: str = None
@@ -278,6 +284,10 @@ class Proc(Document):
 
     queue = ListField()
     sync_counter = IntField(default=0)
+    pending_children = IntField(default=0)
+
+    # the parent's pending_children after this child process has completed
+    _parent_pending_children: int = None
 
     @property
     def process_running(self) -> bool:
@@ -366,6 +376,7 @@ class Proc(Document):
         self.errors = errors
         self.warnings = []
         self.worker_hostname = worker_hostname
+        self.pending_children = 0
         if clear_queue:
             self.queue = []
 
@@ -388,6 +399,7 @@ class Proc(Document):
             errors=errors,
             warnings=[],
             worker_hostname=worker_hostname,
+            pending_children=0,
         )
         if clear_queue:
             rv['queue'] = []
@@ -558,6 +570,137 @@ class Proc(Document):
             priority=priority,
         )
 
+    @classmethod
+    def process_batch(cls, procs: List['Proc'], func_name: str):
+        """
+        Schedules the @process function named `func_name` on all given proc objects and
+        sends them to a worker as a single celery task. The procs are set to PENDING
+        with one bulk update. Procs that are already processing are scheduled one by one,
+        as usual. Only processes without arguments can be batched.
+        """
+        if not procs:
+            return
+
+        flags = process_flags[cls.__name__][func_name]
+        assert not flags.is_local, 'local processes cannot be batched'
+        if len(procs) == 1:
+            getattr(procs[0], func_name)()
+            return
+
+        batch = [proc for proc in procs if not proc.process_running]
+        for proc in procs:
+            if proc.process_running:
+                getattr(proc, func_name)()
+
+        pending = {
+            '$set': dict(
+                process_status=ProcessStatus.PENDING,
+                current_process=func_name,
+                last_status_message='Pending: ' + func_name,
+            ),
+            '$inc': {'sync_counter': 1},
+        }
+        result = cls._get_collection().bulk_write(
+            [
+                UpdateOne(
+                    {
+                        '_id': proc.id,
+                        '$or': [
+                            {'sync_counter': proc.sync_counter},
+                            {'sync_counter': {'$exists': False}},
+                        ],
+                    },
+                    pending,
+                )
+                for proc in batch
+            ],
+            ordered=False,
+        )
+        if result.matched_count < len(batch):
+            # Someone else must have written a sync op in between, these procs are
+            # scheduled one by one.
+            scheduled = {
+                record['_id']
+                for record in cls._get_collection().find(
+                    {
+                        '$or': [
+                            {'_id': proc.id, 'sync_counter': proc.sync_counter + 1}
+                            for proc in batch
+                        ]
+                    },
+                    {'_id': 1},
+                )
+            }
+            for proc in batch:
+                if proc.id not in scheduled:
+                    proc.reload()
+                    getattr(proc, func_name)()
+            batch = [proc for proc in batch if proc.id in scheduled]
+
+        if batch:
+            if flags.is_child:
+                cls._add_pending_children(batch)
+            cls._send_batch_to_worker(batch, func_name)
+
+    @classmethod
+    def _send_batch_to_worker(cls, procs: List['Proc'], func_name: str):
+        """Invokes a celery task, which will prompt a worker to pick up these Proc objects."""
+        cls_name = cls.__name__
+        worker_hostname = procs[0].worker_hostname
+
+        queue = None
+        if (
+            config.celery.routing == CELERY_WORKER_ROUTING
+            and worker_hostname is not None
+        ):
+            queue = worker_direct(worker_hostname).name
+
+        priority = config.celery.priorities.get('%s.%s' % (cls_name, func_name), 1)
+
+        logger = utils.get_logger(
+            __name__, cls=cls_name, func=func_name, n_procs=len(procs)
+        )
+        logger.info(
+            'calling batch process function',
+            queue=queue,
+            priority=priority,
+            worker_hostname=worker_hostname,
+        )
+
+        soft_time_limit = min(
+            config.celery.timeout * len(procs),
+            max(config.celery.batch_timeout, config.celery.timeout),
+        )
+
+        try:
+            return proc_batch_task.apply_async(
+                args=[
+                    cls_name,
+                    [str(proc.id) for proc in procs],
+                    func_name,
+                    [],
+                    dict(_meta_label=config.meta.label),
+                ],
+                queue=queue,
+                priority=priority,
+                # the time limits apply to the whole batch
+                soft_time_limit=soft_time_limit,
+                time_limit=soft_time_limit * 2,
+            )
+        except Exception as e:
+            for proc in procs:
+                proc.reload()
+                proc.fail(e)
+            raise
+
+    @classmethod
+    def _prepare_batch(cls, procs: List['Proc']):
+        """
+        Override, if applicable, to share state between the proc objects of a batch
+        before their processes are executed one after another.
+        """
+        pass
+
     def __str__(self):
         return 'proc celery_task_id=%s worker_hostname=%s' % (
             self.celery_task_id,
@@ -579,6 +722,62 @@ class Proc(Document):
         """
         raise NotImplementedError('`child_cls` not implemented')
 
+    def parent_ref(self) -> Tuple[Type['Proc'], Any]:
+        """
+        Returns the class and id of the parent Proc of a child process. Override, if the
+        parent can be determined without loading it.
+        """
+        parent = self.parent()
+        return parent.__class__, parent.id
+
+    @classmethod
+    def _add_pending_children(cls, children: List['Proc']):
+        """
+        Increments the `pending_children` of the parents of the given, newly scheduled
+        child processes. Must happen before the children are sent to a worker.
+        """
+        counts: Dict[Tuple[Type[Proc], Any], int] = defaultdict(int)
+        for child in children:
+            counts[child.parent_ref()] += 1
+        for (parent_cls, parent_id), count in counts.items():
+            parent_cls._get_collection().update_one(
+                {'_id': parent_id}, {'$inc': {'pending_children': count}}
+            )
+
+    def _complete_child(self):
+        """
+        Decrements the `pending_children` of the parent of this completed child process
+        and remembers the result.
+        """
+        parent_cls, parent_id = self.parent_ref()
+        # The counter is never decremented below zero. A counter that is too low only
+        # causes additional join attempts, which are confirmed in `_try_to_join`.
+        record = parent_cls._get_collection().find_one_and_update(
+            {'_id': parent_id, 'pending_children': {'$gt': 0}},
+            {'$inc': {'pending_children': -1}},
+            projection={'pending_children': True},
+            return_document=ReturnDocument.AFTER,
+        )
+        self._parent_pending_children = (
+            None if record is None else record.get('pending_children')
+        )
+
+    def _siblings_processing(self) -> bool:
+        """
+        Returns True, if other child processes of the same parent are still processing.
+        This reconciles a `pending_children` counter that stays positive, e.g. because
+        a counted child was deleted or its worker was lost.
+        """
+        parent_cls, parent_id = self.parent_ref()
+        sibling = self._get_collection().find_one(
+            {
+                parent_cls.id_field: parent_id,
+                'process_status': {'$in': list(ProcessStatus.STATUSES_PROCESSING)},
+            },
+            projection={'_id': True},
+        )
+        return sibling is not None
+
     def _try_to_join(self) -> bool:
         """
         Called on the parent Proc object to join (resume) the current process.
@@ -594,6 +793,9 @@ class Proc(Document):
         if self.process_status != ProcessStatus.WAITING_FOR_RESULT:
             self.get_logger().debug('trying to join: not waiting for result')
             return False
+        # The counter might be off, e.g. for children that were not scheduled as child
+        # processes or that never completed. Therefore, we confirm with the actually
+        # processing children.
         children_processing = (
             self.child_cls()
             .objects(
@@ -605,7 +807,9 @@ class Proc(Document):
             .count()
         )
         self.get_logger().debug(
-            'trying to join', children_processing=children_processing
+            'trying to join',
+            children_processing=children_processing,
+            pending_children=self.pending_children,
         )
 
         if not children_processing:
@@ -613,7 +817,12 @@ class Proc(Document):
             # To join, we need to read and update the mongo record as a single atomic operation
             old_record = self._get_collection().find_one_and_update(
                 {'_id': self.id, 'process_status': ProcessStatus.WAITING_FOR_RESULT},
-                {'$set': {'process_status': ProcessStatus.RUNNING}},
+                {
+                    '$set': {
+                        'process_status': ProcessStatus.RUNNING,
+                        'pending_children': 0,
+                    }
+                },
             )
             if (
                 old_record
@@ -829,6 +1038,9 @@ class Proc(Document):
             try_counter += 1
             if old_record and old_record.get('sync_counter') == self.sync_counter:
                 # We have successfully completed the process
+                flags = self.current_process_flags
+                if next_process is None and flags is not None and flags.is_child:
+                    self._complete_child()
                 return next_process
             # Someone else must have written a sync op (ticked up the sync_counter) in between
             if try_counter >= 3:
@@ -868,6 +1080,15 @@ class NomadCeleryRequest(Request):
         if infrastructure.mongo_client is None:
             infrastructure.setup_mongo()
 
+        cls_name, self_ids = args[0], args[1]
+        if isinstance(self_ids, list):
+            # a batch task, fail all procs that have not completed yet
+            for self_id in self_ids:
+                proc = unwarp_task(self.task, cls_name, self_id)
+                if proc.process_running:
+                    proc.fail(event, **kwargs)
+            return
+
         proc = unwarp_task(self.task, *args)
         proc.fail(event, **kwargs)
 
@@ -954,6 +1175,92 @@ def proc_task(task, cls_name, self_id, func_name, args, kwargs):
         config.meta.label = kwargs['_meta_label']
         del kwargs['_meta_label']
 
+    _execute_process(task, proc, func_name, args, kwargs)
+
+
+@app.task(
+    bind=True,
+    base=NomadCeleryTask,
+    ignore_results=True,
+    max_retries=3,
+    acks_late=config.celery.acks_late,
+    soft_time_limit=config.celery.timeout,
+    time_limit=config.celery.timeout * 2,
+)
+def proc_batch_task(task, cls_name, self_ids, func_name, args, kwargs):
+    """
+    The celery task that is used to execute the same async process function on a batch
+    of proc objects (see :func:`Proc.process_batch`). The objects are loaded and set to
+    RUNNING with one query each and then processed one after another. A failing process
+    does not affect the other processes of the batch. Parents of child processes are
+    only joined once, after the whole batch.
+    """
+    logger = utils.get_logger(__name__, cls=cls_name, n_procs=len(self_ids))
+    logger.debug('Executing celery batch task')
+
+    if '_meta_label' in kwargs:
+        config.meta.label = kwargs['_meta_label']
+        del kwargs['_meta_label']
+
+    cls = all_proc_cls.get(cls_name, None)
+    if cls is None:
+        logger.critical('document not a subclass of Proc')
+        raise ProcNotRegistered('document %s not a subclass of Proc' % cls_name)
+
+    procs = list(cls.objects(pk__in=self_ids))
+    if len(procs) < len(self_ids):
+        logger.warning('some called objects are missing, they are skipped')
+    procs.sort(key=lambda proc: self_ids.index(str(proc.id)))
+
+    running = dict(
+        pending_children=0,
+        process_status=ProcessStatus.RUNNING,
+        last_status_message='Started: ' + func_name,
+        worker_hostname=worker_hostname,
+        celery_task_id=task.request.id,
+        errors=[],
+        warnings=[],
+    )
+    cls._get_collection().update_many(
+        {'_id': {'$in': [proc.id for proc in procs]}}, {'$set': running}
+    )
+    for proc in procs:
+        for key, value in running.items():
+            setattr(proc, key, value)
+        proc._clear_changed_fields()
+    cls._prepare_batch(procs)
+
+    # Only the transition to RUNNING is a bulk update. Each process still completes
+    # with its own sync op: completing saves the changes the process made to its
+    # object and atomically picks up processes that were queued in the meantime.
+    parents_to_join: Dict[Any, Proc] = {}
+    for proc in procs:
+        parent = _execute_process(
+            task, proc, func_name, args, kwargs, set_running=False, join_parent=False
+        )
+        if parent is not None:
+            parents_to_join[parent.id] = parent
+
+    for parent in parents_to_join.values():
+        _execute_join(parent)
+
+
+def _execute_process(
+    task,
+    proc: Proc,
+    func_name: str,
+    args,
+    kwargs,
+    set_running: bool = True,
+    join_parent: bool = True,
+) -> Optional[Proc]:
+    """
+    Executes the process function `func_name` on the given proc object and completes
+    the process. If `join_parent` is False, the parent of a completed child process is
+    returned instead of being joined.
+    """
+    cls_name = proc.__class__.__name__
+    logger = proc.get_logger()
     try_to_join = False
     deleting = False
 
@@ -965,28 +1272,30 @@ def proc_task(task, cls_name, self_id, func_name, args, kwargs):
             'called function %s is not a function of proc class %s'
             % (func_name, cls_name)
         )
-        return
+        return None
 
     # unwrap the process decorator
     unwrapped_func = getattr(func, '__process_unwrapped', None)
     if unwrapped_func is None:  # "Should not happen"
         logger.error('called function was not decorated with @process')
         proc.fail('called function %s was not decorated with @process' % func_name)
-        return
+        return None
 
     # call the process function
     try:
         is_child = process_flags[cls_name][func_name].is_child
         os.chdir(config.fs.working_directory)
         with utils.timer(logger, 'process executed on worker', log_memory=True):
-            # Set state to RUNNING
-            proc.process_status = ProcessStatus.RUNNING
-            proc.last_status_message = 'Started: ' + func_name
-            proc.worker_hostname = worker_hostname
-            proc.celery_task_id = task.request.id
-            proc.errors = []
-            proc.warnings = []
-            proc.save()
+            if set_running:
+                # Set state to RUNNING
+                proc.process_status = ProcessStatus.RUNNING
+                proc.last_status_message = 'Started: ' + func_name
+                proc.worker_hostname = worker_hostname
+                proc.celery_task_id = task.request.id
+                proc.errors = []
+                proc.warnings = []
+                proc.pending_children = 0
+                proc.save()
             # Actually call the process function
             rv = unwrapped_func(proc, *args, **kwargs)
             if proc.errors:
@@ -1026,7 +1335,7 @@ def proc_task(task, cls_name, self_id, func_name, args, kwargs):
                 raise ValueError('Invalid return value from process function')
     except SystemExit as e:
         proc.fail(e)
-        return
+        return None
     except SoftTimeLimitExceeded as e:
         logger.error('exceeded the celery task soft time limit')
         proc.fail(e, complete=False)
@@ -1044,16 +1353,32 @@ def proc_task(task, cls_name, self_id, func_name, args, kwargs):
                 # More jobs in the queue
                 func_name, args, kwargs = next_process
                 proc._send_to_worker(func_name, *args, **kwargs)
-                return
+                return None
             # Processing finished (successful or not)
+            if (proc._parent_pending_children or 0) > 0 and proc._siblings_processing():
+                # Other children are still processing, the last one joins the parent.
+                return None
             # Switch to the parent to try to join.
             proc = proc.parent()
+            if not join_parent:
+                return proc
             logger = proc.get_logger()
             try_to_join = True
         except Exception as e:  # "Should not happen"
             proc.fail(e)
-            return
+            return None
+
+    if try_to_join:
+        _execute_join(proc)
+    elif not deleting:
+        _complete_process(proc)
+    return None
+
 
+def _execute_join(proc: Proc):
+    """Tries to join the given proc object, and completes it if it is joined and done."""
+    logger = proc.get_logger()
+    try_to_join = True
     while try_to_join:
         try_to_join = False
         try:
@@ -1095,7 +1420,11 @@ def proc_task(task, cls_name, self_id, func_name, args, kwargs):
         except Exception as e:
             proc.fail(e, complete=False)
 
-    if not deleting and proc.process_status in ProcessStatus.STATUSES_COMPLETED:
+    _complete_process(proc)
+
+
+def _complete_process(proc: Proc):
+    if proc.process_status in ProcessStatus.STATUSES_COMPLETED:
         # We are about to transition from RUNNING to completed (FAILURE or SUCCESS)
         # But, if something is queued up we should actually go to PENDING instead, and
         # trigger celery again
@@ -1146,6 +1475,8 @@ def process(
             send_to_worker = self._sync_schedule_process(func_name, *args, **kwargs)
             if send_to_worker:
                 try:
+                    if is_child:
+                        self._add_pending_children([self])
                     self._send_to_worker(func_name, *args, **kwargs)
                 except Exception as e:
                     self.fail(e)
@@ -54,10 +54,14 @@ from mongoengine import (
     EmbeddedDocumentField,
 )
 from pymongo import UpdateOne
+from celery.signals import worker_process_shutdown
 from structlog import wrap_logger
 from contextlib import contextmanager
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import copy
 import os.path
+import time
 from datetime import datetime
 import hashlib
 from structlog.processors import StackInfoRenderer, format_exc_info, TimeStamper
@@ -158,6 +162,18 @@ def assert_user_group_exists(group_id: str):
     assert user_group_exists(group_id), f"User group '{group_id}' does not exist."
 
 
+def _processing_fingerprint() -> str:
+    """
+    A fingerprint of the software that processes entries, i.e. the NOMAD version and
+    the versions of all plugin packages with parsers, normalizers, and schemas.
+    """
+    hash = hashlib.sha512()
+    hash.update(f'nomad\0{config.meta.version}\0'.encode())
+    for name, plugin_package in sorted(config.plugins.plugin_packages.items()):
+        hash.update(f'{name}\0{plugin_package.version}\0'.encode())
+    return utils.make_websave(hash)
+
+
 def _pack_log_event(logger, method_name, event_dict):
     try:
         log_data = dict(event_dict)
@@ -905,6 +921,10 @@ class Entry(Proc):
         upload_id: the id of the upload to which this entry belongs
         entry_id: the id of this entry
         entry_hash: the hash of the entry files
+        entry_files_fingerprint: a cheap fingerprint of the entry files (see
+            :func:`UploadFiles.entry_fingerprint`) at the time the entry_hash was computed
+        processing_fingerprint: a fingerprint of the NOMAD and plugin versions used for
+            the last processing
         entry_create_time: the date and time of the creation of the entry
         last_processing_time: the date and time of the last processing
         last_edit_time: the date and time the user metadata was last edited
@@ -920,11 +940,18 @@ class Entry(Proc):
         entry_coauthors: a user provided list of co-authors specific for this entry. Note
             that normally, coauthors should be set on the upload level.
         datasets: a list of user curated datasets this entry belongs to
+        index_pending: `buffered` while the index document of the entry is buffered by
+            a processing worker, or the id of the flush that is sending it to
+            elasticsearch; unset once it is indexed or taken over by the upload cleanup
+        index_hash: the :func:`nomad.search.index_doc_hash` of the last index document
+            that was successfully indexed during processing
     """
 
     upload_id = StringField(required=True)
     entry_id = StringField(primary_key=True)
     entry_hash = StringField()
+    entry_files_fingerprint = StringField()
+    processing_fingerprint = StringField()
     entry_create_time = DateTimeField(required=True)
     last_processing_time = DateTimeField()
     last_edit_time = DateTimeField()
@@ -942,6 +969,9 @@ class Entry(Proc):
 
     entry_timestamp = EmbeddedDocumentField(Timestamp)
 
+    index_pending = StringField()
+    index_hash = StringField()
+
     meta: Any = {
         'strict': False,
         'indexes': [
@@ -1005,6 +1035,36 @@ class Entry(Proc):
         self._parser_results = EntryArchive(m_context=self.upload.archive_context)
         self._parser_results.metadata = self._entry_metadata
 
+    def _entry_files_fingerprint(self) -> Optional[str]:
+        """
+        The fingerprint of the entry files. For published uploads, the fingerprint is
+        based on the published raw files, as the staging copy is recreated with every
+        reprocessing.
+        """
+        upload_files = (
+            self.upload.upload_files if self.upload.published else self.upload_files
+        )
+        try:
+            return upload_files.entry_fingerprint(self.mainfile, self.mainfile_key)
+        except KeyError:
+            return None
+
+    def _entry_hash(self) -> str:
+        """
+        Returns the entry hash. The stored hash is reused, if the entry files did not
+        change since it was computed.
+        """
+        fingerprint = self._entry_files_fingerprint()
+        if (
+            fingerprint is not None
+            and fingerprint == self.entry_files_fingerprint
+            and self.entry_hash
+        ):
+            return self.entry_hash
+
+        self.entry_files_fingerprint = fingerprint
+        return self.upload_files.entry_hash(self.mainfile, self.mainfile_key)
+
     def _apply_metadata_from_process(self, entry_metadata: EntryMetadata):
         """
         Applies metadata generated when processing or re-processing an entry to `entry_metadata`.
@@ -1020,9 +1080,8 @@ class Entry(Proc):
         """
         entry_metadata.nomad_version = config.meta.version
         entry_metadata.nomad_commit = ''
-        entry_metadata.entry_hash = self.upload_files.entry_hash(
-            self.mainfile, self.mainfile_key
-        )
+        entry_metadata.entry_hash = self._entry_hash()
+        self.processing_fingerprint = _processing_fingerprint()
 
         stored_seed, stored_token, stored_server = None, None, None
         if self.entry_timestamp:
@@ -1266,6 +1325,16 @@ class Entry(Proc):
         """Processes or reprocesses an entry."""
         self._process_entry_local()
 
+    @classmethod
+    def _prepare_batch(cls, procs: List['Entry']):
+        # the entries of a batch share their upload
+        uploads: Dict[str, Upload] = {}
+        for entry in procs:
+            if entry.upload_id in uploads:
+                entry._upload = uploads[entry.upload_id]
+            else:
+                uploads[entry.upload_id] = entry.upload
+
     @process_local
     def process_entry_local(self):
         """Processes or reprocesses an entry locally."""
@@ -1314,12 +1383,25 @@ class Entry(Proc):
         self._perform_index = (
             self._is_initial_processing or settings.index_individual_entries
         )
+        # A rematch might change the parser, even if nothing else changed
+        rematch = settings.rematch_published and not settings.use_original_parser
         if not self.upload.published or self._is_initial_processing:
             should_parse = True
         elif not settings.reprocess_existing_entries:
             should_parse = False
+        elif (
+            settings.skip_unchanged_entries
+            and not rematch
+            and self.processing_fingerprint == _processing_fingerprint()
+            and self.entry_files_fingerprint is not None
+            and self.entry_files_fingerprint == self._entry_files_fingerprint()
+        ):
+            logger.info(
+                'entry files, nomad and plugin versions are unchanged, skip parsing'
+            )
+            should_parse = False
         else:
-            if settings.rematch_published and not settings.use_original_parser:
+            if rematch:
                 with utils.timer(logger, 'parser matching executed'):
                     parser, _mainfile_keys = match_parser(
                         self.mainfile_file.os_path, strict=False
@@ -1442,7 +1524,17 @@ class Entry(Proc):
                 'could not create minimal metadata after processing failure', exc_info=e
             )
 
+        # the entry must be reprocessed, even if its files do not change
+        self.entry_files_fingerprint = None
+        self.processing_fingerprint = None
+
         if self._perform_index:
+            index_buffer.discard(self.entry_id)
+            self.index_hash = None
+            Entry._get_collection().update_one(
+                {'_id': self.entry_id},
+                {'$unset': {'index_pending': '', 'index_hash': ''}},
+            )
             try:
                 indexing_errors = search.index(self._parser_results)
                 assert not indexing_errors
@@ -1476,6 +1568,9 @@ class Entry(Proc):
     def parent(self) -> 'Upload':
         return self.upload
 
+    def parent_ref(self):
+        return Upload, self.upload_id
+
     def parsing(self):
         """The process step that encapsulates all parsing related actions."""
         self.set_last_status_message('Parsing mainfile')
@@ -1585,7 +1680,22 @@ class Entry(Proc):
         if self._perform_index:
             with utils.timer(logger, 'entry metadata indexed'):
                 assert self._parser_results.metadata == self._entry_metadata
-                indexing_errors = search.index(self._parser_results)
+                if index_buffer.enabled and not self.current_process_flags.is_local:
+                    # the upload cleanup takes over entries that are still buffered,
+                    # the index hash is stored when the buffer is flushed
+                    Entry._get_collection().update_one(
+                        {'_id': self.entry_id},
+                        {
+                            '$set': {'index_pending': 'buffered'},
+                            '$unset': {'index_hash': ''},
+                        },
+                    )
+                    indexing_errors = index_buffer.add(self._parser_results)
+                else:
+                    entry_docs = search.create_entry_index_docs([self._parser_results])
+                    indexing_errors = search.index_docs(entry_docs)
+                    if entry_docs and not indexing_errors:
+                        self.index_hash = search.index_doc_hash(entry_docs[0][1])
                 if indexing_errors:
                     raise RuntimeError(
                         'Failed to index in ES: ' + indexing_errors[self.entry_id]
@@ -1641,7 +1751,8 @@ class Entry(Proc):
             return self.upload_files.write_archive(
                 self.entry_id,
                 archive.m_to_dict(
-                    with_def_id=config.process.write_definition_id_to_archive
+                    with_def_id=config.process.write_definition_id_to_archive,
+                    keep_ndarray=config.archive.ndarray_ext,
                 ),
             )
         except Exception:
@@ -1668,6 +1779,76 @@ class Entry(Proc):
         )
 
 
+def _mark_index_failures(indexing_errors: Dict[str, str]):
+    """Sets the entries that could not be indexed in ES to failed."""
+    Entry._get_collection().bulk_write(
+        [
+            UpdateOne(
+                {'_id': entry_id},
+                {
+                    '$set': dict(
+                        process_status=ProcessStatus.FAILURE,
+                        last_status_message='Failed to index in ES',
+                    ),
+                    '$push': dict(errors=f'Failed to index in ES: {error}'),
+                    '$unset': dict(index_hash=''),
+                },
+            )
+            for entry_id, error in indexing_errors.items()
+        ]
+    )
+
+
+def _claim_index_buffer_entries(entry_ids: List[str]) -> Set[str]:
+    flush_id = utils.create_uuid()
+    collection = Entry._get_collection()
+    collection.update_many(
+        {'_id': {'$in': entry_ids}, 'index_pending': 'buffered'},
+        {'$set': {'index_pending': flush_id}},
+    )
+    return {
+        entry['_id']
+        for entry in collection.find(
+            {'_id': {'$in': entry_ids}, 'index_pending': flush_id}, {'_id': 1}
+        )
+    }
+
+
+def _on_index_buffer_flushed(
+    entry_hashes: Dict[str, Optional[str]], indexing_errors: Dict[str, str]
+):
+    Entry._get_collection().bulk_write(
+        [
+            UpdateOne(
+                {'_id': entry_id},
+                {'$unset': {'index_pending': ''}}
+                if entry_id in indexing_errors or entry_hash is None
+                else {
+                    '$unset': {'index_pending': ''},
+                    '$set': {'index_hash': entry_hash},
+                },
+            )
+            for entry_id, entry_hash in entry_hashes.items()
+        ],
+        ordered=False,
+    )
+    if indexing_errors:
+        _mark_index_failures(indexing_errors)
+
+
+index_buffer = search.IndexBuffer(
+    on_flushed=_on_index_buffer_flushed, claim=_claim_index_buffer_entries
+)
+"""
+The buffer for the index documents of the entries processed by this worker.
+"""
+
+
+@worker_process_shutdown.connect
+def flush_index_buffer(*args, **kwargs):
+    index_buffer.flush()
+
+
 class Upload(Proc):
     """
     Represents uploads in the databases. Provides persistence access to the files storage,
@@ -1886,6 +2067,7 @@ class Upload(Proc):
                         self.staging_upload_files.pack(
                             entries, with_embargo=self.with_embargo
                         )
+                    self._publish_entry_files_fingerprints()
 
                 with utils.timer(logger, 'index updated'):
                     search.publish(entries)
@@ -2350,36 +2532,87 @@ class Upload(Proc):
             scan = [('', True)]
 
         for path, recursive in scan:
-            path_infos: Iterable[RawPathInfo] = (
-                [RawPathInfo(path=path, is_file=True, size=None, access=None)]
-                if staging_upload_files.raw_path_is_file(path)
-                else staging_upload_files.raw_directory_list(
-                    path, recursive, files_only=True
+
+            def list_path_infos(
+                path=path, recursive=recursive
+            ) -> Iterable[RawPathInfo]:
+                return (
+                    [RawPathInfo(path=path, is_file=True, size=None, access=None)]
+                    if staging_upload_files.raw_path_is_file(path)
+                    else staging_upload_files.raw_directory_list(
+                        path, recursive, files_only=True
+                    )
                 )
-            )
 
-            for path_info in path_infos:
+            # Preprocessing creates and overwrites files, e.g. stripped POTCARs. It
+            # has to be finished before the files are listed and matched concurrently.
+            for path_info in list_path_infos():
                 self._preprocess_files(path_info.path)
 
-                if skip_matching and path_info.path not in entries_metadata:
-                    continue
+            paths_to_match = (
+                path_info.path
+                for path_info in list_path_infos()
+                if not skip_matching or path_info.path in entries_metadata
+            )
+
+            for mainfile, parser, mainfile_keys in self._match_files(paths_to_match):
+                mainfile_keys_including_main_entry: List[str] = [None] + (
+                    mainfile_keys or []
+                )  # type: ignore
+                for mainfile_key in mainfile_keys_including_main_entry:
+                    yield mainfile, mainfile_key, parser
 
-                try:
-                    parser, mainfile_keys = match_parser(
-                        staging_upload_files.raw_file_object(path_info.path).os_path
-                    )
+    def _match_file(self, path: str) -> Tuple[Parser, List[str]]:
+        try:
+            return match_parser(self.staging_upload_files.raw_file_object(path).os_path)
+        except Exception as e:
+            self.get_logger().error(
+                'exception while matching pot. mainfile',
+                mainfile=path,
+                exc_info=e,
+            )
+            return None, None
+
+    def _match_files(
+        self, paths: Iterable[str]
+    ) -> Iterator[Tuple[str, Parser, List[str]]]:
+        """
+        Matches the given files to parsers and yields tuples of (path, parser,
+        mainfile_keys) for all matched files in the order of the given paths. The files
+        are matched concurrently by `config.process.matching_workers` threads, only a
+        bounded number of files is matched ahead of the consumer.
+        """
+        workers = config.process.matching_workers
+        if workers <= 1:
+            for path in paths:
+                parser, mainfile_keys = self._match_file(path)
+                if parser is not None:
+                    yield path, parser, mainfile_keys
+            return
+
+        pending: deque[Tuple[str, Future]] = deque()
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='matching'
+        ) as executor:
+            try:
+                for path in paths:
+                    pending.append((path, executor.submit(self._match_file, path)))
+                    while len(pending) > 4 * workers or (
+                        pending and pending[0][1].done()
+                    ):
+                        path, future = pending.popleft()
+                        parser, mainfile_keys = future.result()
+                        if parser is not None:
+                            yield path, parser, mainfile_keys
+
+                while pending:
+                    path, future = pending.popleft()
+                    parser, mainfile_keys = future.result()
                     if parser is not None:
-                        mainfile_keys_including_main_entry: List[str] = [None] + (
-                            mainfile_keys or []
-                        )  # type: ignore
-                        for mainfile_key in mainfile_keys_including_main_entry:
-                            yield path_info.path, mainfile_key, parser
-                except Exception as e:
-                    self.get_logger().error(
-                        'exception while matching pot. mainfile',
-                        mainfile=path_info.path,
-                        exc_info=e,
-                    )
+                        yield path, parser, mainfile_keys
+            finally:
+                for _, future in pending:
+                    future.cancel()
 
     def match_all(
         self,
@@ -2424,6 +2657,7 @@ class Upload(Proc):
 
                 with utils.timer(logger, 'matching completed'):
                     entries = []
+                    batch_size = config.process.matching_insert_batch_size
                     for mainfile, mainfile_key, parser in self.match_mainfiles(
                         path_filter, updated_files
                     ):
@@ -2444,10 +2678,9 @@ class Upload(Proc):
 
                         if was_created:
                             entries.append(entry)
-                            # batched write if memory is an issue
-                            # if len(entries) > 1000:
-                            #     Entry.objects.insert(entries)
-                            #     entries = []
+                            if len(entries) >= batch_size:
+                                Entry.objects.insert(entries)
+                                entries = []
                         elif entry is not None:
                             old_entries.remove(entry.entry_id)
 
@@ -2518,6 +2751,7 @@ class Upload(Proc):
             # Ensure that we update the parser if in staging
             if not self.published and parser.name != entry.parser_name:
                 entry.parser_name = parser.name
+                entry.entry_files_fingerprint = None
                 entry.save()
         except KeyError:
             # No existing entry found
@@ -2584,7 +2818,8 @@ class Upload(Proc):
                     with utils.timer(logger, 'processes triggered'):
                         for entry in next_entries:
                             entry.worker_hostname = self.worker_hostname
-                            entry.process_entry()
+                        for batch in self._entry_batches(next_entries):
+                            Entry.process_batch(batch, 'process_entry')
                     return True
             return False
         except Exception as e:
@@ -2594,6 +2829,47 @@ class Upload(Proc):
                 self._cleanup_staging_files()
             raise
 
+    def _entry_batches(self, entries: List[Entry]) -> List[List[Entry]]:
+        """
+        Splits the given entries into the batches that are processed by one task each.
+        A batch contains entries of one parser and is limited by the number of entries
+        (`config.process.entry_batch_size` or the parser specific value in
+        `config.process.entry_batch_parsers`) and the summed mainfile sizes
+        (`config.process.entry_batch_bytes`).
+        """
+        parser_entries: Dict[str, List[Entry]] = defaultdict(list)
+        for entry in entries:
+            parser_entries[entry.parser_name].append(entry)
+
+        batches: List[List[Entry]] = []
+        for parser_name, same_parser_entries in parser_entries.items():
+            batch_size = config.process.entry_batch_parsers.get(
+                parser_name, config.process.entry_batch_size
+            )
+            if batch_size <= 1:
+                batches.extend([entry] for entry in same_parser_entries)
+                continue
+
+            batch: List[Entry] = []
+            batch_bytes = 0
+            for entry in same_parser_entries:
+                try:
+                    size = self.upload_files.raw_file_size(entry.mainfile)
+                except Exception:
+                    size = 0
+                if batch and (
+                    len(batch) >= batch_size
+                    or batch_bytes + size > config.process.entry_batch_bytes
+                ):
+                    batches.append(batch)
+                    batch, batch_bytes = [], 0
+                batch.append(entry)
+                batch_bytes += size
+            if batch:
+                batches.append(batch)
+
+        return batches
+
     def process_updated_raw_file(self, path: str, allow_modify: bool):
         """
         Used when parsers add/modify raw files during processing.
@@ -2657,6 +2933,153 @@ class Upload(Proc):
             return ProcessStatus.WAITING_FOR_RESULT
         self.cleanup()
 
+    def _claim_buffered_index_docs(self, logger):
+        """
+        Takes over the entries of this upload whose index documents are still buffered
+        by processing workers. Their index hash is not set, they are hence indexed
+        during cleanup and the workers drop their documents. Waits for the documents
+        that workers are sending to elasticsearch right now, otherwise these could
+        overwrite the documents that are indexed during cleanup.
+        """
+        index_buffer.flush()
+        collection = Entry._get_collection()
+        collection.update_many(
+            {'upload_id': self.upload_id, 'index_pending': 'buffered'},
+            {'$unset': {'index_pending': ''}},
+        )
+        flushing = {'upload_id': self.upload_id, 'index_pending': {'$ne': None}}
+        timeout = time.monotonic() + config.elastic.bulk_timeout
+        while collection.count_documents(flushing, limit=1) > 0:
+            if time.monotonic() > timeout:
+                # the entries are indexed during cleanup, but a stuck worker could still
+                # overwrite their documents
+                logger.error('timeout while waiting for buffered index documents')
+                collection.update_many(flushing, {'$unset': {'index_pending': ''}})
+                break
+            time.sleep(0.1)
+
+    def _index_entries(self, logger):
+        """
+        Indexes all entries of this upload and their materials. The entries are read
+        in chunks of `config.elastic.bulk_size` and the index documents of the next chunk
+        are created while the previous chunk is indexed. Entries with an index document
+        that did not change since it was indexed during processing are not indexed again.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            indexing: Future = None
+            try:
+                for entries in self._entries_chunks(config.elastic.bulk_size):
+                    archives = [
+                        entry.full_entry_metadata(self).m_parent for entry in entries
+                    ]
+                    index_hashes = {
+                        entry.entry_id: entry.index_hash for entry in entries
+                    }
+                    entry_docs = search.create_entry_index_docs(archives, logger=logger)
+                    if indexing is not None:
+                        indexing.result()
+                    indexing = executor.submit(
+                        self._index_entries_chunk,
+                        archives,
+                        entry_docs,
+                        index_hashes,
+                        logger,
+                    )
+                if indexing is not None:
+                    indexing.result()
+            finally:
+                self.upload_files.close()  # Because full_entry_metadata reads the archive files.
+
+        search.refresh(materials=True)
+
+    def _entries_chunks(self, chunk_size: int) -> Iterator[List[Entry]]:
+        """Yields all entries of this upload in chunks, ordered by entry_id."""
+        last_entry_id = None
+        while True:
+            query = Entry.objects(upload_id=self.upload_id)
+            if last_entry_id is not None:
+                query = query.filter(entry_id__gt=last_entry_id)
+            # read the chunk first to avoid missing cursor errors
+            entries = list(query.order_by('entry_id').limit(chunk_size))
+            if not entries:
+                return
+            last_entry_id = entries[-1].entry_id
+            yield entries
+
+    def _index_entries_chunk(
+        self,
+        archives: List[EntryArchive],
+        entry_docs: List[Tuple[str, Dict]],
+        index_hashes: Dict[str, Optional[str]],
+        logger,
+    ):
+        changed_docs = []
+        changed_hashes: Dict[str, Optional[str]] = {}
+        for entry_id, entry_doc in entry_docs:
+            entry_hash = search.index_doc_hash(entry_doc)
+            # entries without hash are always indexed and their stored hash is reset
+            if entry_hash is None or entry_hash != index_hashes.get(entry_id):
+                changed_docs.append((entry_id, entry_doc))
+                changed_hashes[entry_id] = entry_hash
+
+        logger.info(
+            'index chunk of upload entries',
+            n_entries=len(archives),
+            n_changed=len(changed_docs),
+        )
+        indexing_errors = search.index_docs(changed_docs)
+        if config.process.index_materials:
+            search.index_materials(archives)
+
+        if changed_hashes.keys() - indexing_errors.keys():
+            Entry._get_collection().bulk_write(
+                [
+                    UpdateOne({'_id': entry_id}, {'$set': {'index_hash': entry_hash}})
+                    for entry_id, entry_hash in changed_hashes.items()
+                    if entry_id not in indexing_errors
+                ],
+                ordered=False,
+            )
+
+        if indexing_errors:
+            # Some entries could not be indexed in ES
+            # Set entry status to failed for the affected entries
+            with utils.timer(logger, 'updated mongo entries failing to index'):
+                _mark_index_failures(indexing_errors)
+            # Try indexing minimal archives in ES for the ones that failed
+            failed_archives = []
+            with utils.timer(logger, 'created minimal archives to re-index'):
+                for archive in archives:
+                    if archive.entry_id in indexing_errors:
+                        try:
+                            archive.metadata.processed = False
+                            if not archive.metadata.processing_errors:
+                                archive.metadata.processing_errors = []
+                            archive.metadata.processing_errors.append(
+                                f'Failed to index in ES: {indexing_errors[archive.entry_id]}'
+                            )
+                            failed_archives.append(
+                                EntryArchive(
+                                    m_context=self.archive_context,
+                                    metadata=archive.metadata,
+                                )
+                            )
+                        except Exception as e:
+                            logger.warn(
+                                'could not create minimal failed archive',
+                                entry_id=archive.entry_id,
+                                exc_info=e,
+                            )
+            with utils.timer(logger, 're-indexed failed entries'):
+                indexing_errors = search.index(
+                    failed_archives, update_materials=config.process.index_materials
+                )
+                if indexing_errors:
+                    logger.warn(
+                        'some failed entries could not be re-indexed',
+                        entry_ids=sorted(indexing_errors.keys()),
+                    )
+
     def cleanup(self):
         """
         The process step that "cleans" the processing, i.e. removed obsolete files and performs
@@ -2697,6 +3120,7 @@ class Upload(Proc):
                         self.staging_upload_files.pack(
                             entries, with_embargo=self.with_embargo
                         )
+                    self._publish_entry_files_fingerprints()
 
                 with utils.timer(logger, 'upload staging files deleted'):
                     self.staging_upload_files.delete()
@@ -2705,70 +3129,11 @@ class Upload(Proc):
                 self.last_update = datetime.utcnow()
                 self.save()
 
-        with self.entries_metadata() as entries:
-            with utils.timer(logger, 'upload entries and materials indexed'):
-                archives = [entry.m_parent for entry in entries]
-                indexing_errors = search.index(
-                    archives,
-                    update_materials=config.process.index_materials,
-                    refresh=True,
-                )
+        with utils.timer(logger, 'buffered entry index documents claimed'):
+            self._claim_buffered_index_docs(logger)
 
-                if indexing_errors:
-                    # Some entries could not be indexed in ES
-                    # Set entry status to failed for the affected entries
-                    with utils.timer(logger, 'updated mongo entries failing to index'):
-                        entry_mongo_writes = [
-                            UpdateOne(
-                                {'_id': entry_id},
-                                {
-                                    '$set': dict(
-                                        process_status=ProcessStatus.FAILURE,
-                                        last_status_message='Failed to index in ES',
-                                    ),
-                                    '$push': dict(
-                                        errors=f'Failed to index in ES: {error}'
-                                    ),
-                                },
-                            )
-                            for entry_id, error in indexing_errors.items()
-                        ]
-                        Entry._get_collection().bulk_write(entry_mongo_writes)
-                    # Try indexing minimal archives in ES for the ones that failed
-                    failed_archives = []
-                    with utils.timer(logger, 'created minimal archives to re-index'):
-                        for archive in archives:
-                            if archive.entry_id in indexing_errors:
-                                try:
-                                    archive.metadata.processed = False
-                                    if not archive.metadata.processing_errors:
-                                        archive.metadata.processing_errors = []
-                                    archive.metadata.processing_errors.append(
-                                        f'Failed to index in ES: {indexing_errors[archive.entry_id]}'
-                                    )
-                                    failed_archives.append(
-                                        EntryArchive(
-                                            m_context=self.archive_context,
-                                            metadata=archive.metadata,
-                                        )
-                                    )
-                                except Exception as e:
-                                    logger.warn(
-                                        'could not create minimal failed archive',
-                                        entry_id=archive.entry_id,
-                                        exc_info=e,
-                                    )
-                    with utils.timer(logger, 're-indexed failed entries'):
-                        indexing_errors = search.index(
-                            failed_archives,
-                            update_materials=config.process.index_materials,
-                            refresh=True,
-                        )
-                        if indexing_errors:
-                            logger.warn(
-                                'some failed entries could not be re-indexed',
-                                entry_ids=sorted(indexing_errors.keys()),
-                            )
+        with utils.timer(logger, 'upload entries and materials indexed'):
+            self._index_entries(logger)
 
         # send email about process finish
         if not self.publish_directly and self.main_author_user.email:
@@ -2799,6 +3164,47 @@ class Upload(Proc):
                 # don't fail or present this error to clients
                 logger.error('could not send after processing email', exc_info=e)
 
+    def _publish_entry_files_fingerprints(self):
+        """
+        Replaces the entry files fingerprints that were computed from the staging files
+        with fingerprints of the packed public files. Reprocessing of published uploads
+        computes fingerprints from the public files and would not recognize the staging
+        fingerprints otherwise. Must be called after packing and before the staging files
+        are deleted.
+        """
+        staging_upload_files = self.staging_upload_files
+        public_upload_files = PublicUploadFiles(self.upload_id)
+        updates = []
+        try:
+            for entry in Entry.objects(
+                upload_id=self.upload_id, entry_files_fingerprint__ne=None
+            ).only('entry_id', 'mainfile', 'mainfile_key', 'entry_files_fingerprint'):
+                fingerprint = None
+                try:
+                    # Files that changed since the entry hash was computed keep no
+                    # fingerprint and are hashed again on the next processing.
+                    if entry.entry_files_fingerprint == (
+                        staging_upload_files.entry_fingerprint(
+                            entry.mainfile, entry.mainfile_key
+                        )
+                    ):
+                        fingerprint = public_upload_files.entry_fingerprint(
+                            entry.mainfile, entry.mainfile_key
+                        )
+                except KeyError:
+                    pass
+                updates.append(
+                    UpdateOne(
+                        {'_id': entry.entry_id},
+                        {'$set': {'entry_files_fingerprint': fingerprint}},
+                    )
+                )
+        finally:
+            public_upload_files.close()
+
+        if updates:
+            Entry._get_collection().bulk_write(updates)
+
     def _cleanup_staging_files(self):
         if self.published and PublicUploadFiles.exists_for(self.upload_id):
             if StagingUploadFiles.exists_for(self.upload_id):
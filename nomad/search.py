@@ -32,12 +32,17 @@ update the v1 materials index according to the performed changes. TODO this is o
 partially implemented.
 """
 
+import hashlib
 import json
 import math
+import threading
+import time
+from collections import OrderedDict
 from enum import Enum
 from typing import (
     Any,
     Callable,
+    Collection,
     Dict,
     Generator,
     Iterable,
@@ -50,10 +55,12 @@ from typing import (
 )
 
 import elasticsearch.helpers
+import orjson
 from elasticsearch.exceptions import RequestError, TransportError
 from elasticsearch_dsl import A, Q, Search
 from elasticsearch_dsl.query import Query as EsQuery
 from pydantic import ValidationError
+from pydantic.json import pydantic_encoder
 from pydantic.error_wrappers import ErrorWrapper
 
 from nomad import datamodel, infrastructure, utils
@@ -102,10 +109,12 @@ from nomad.metainfo.elasticsearch_extension import (
     Index,
     SearchQuantity,
     create_dynamic_quantity_annotation,
+    create_entry_index_docs,
     entry_index,
     entry_type,
     get_searchable_quantity_value_field,
     index_entries,
+    index_entry_docs,
     material_entry_type,
     material_type,
     nexus_prefix,
@@ -174,6 +183,7 @@ def update_by_query(
         )
         raise SearchError(e)
 
+    search_cache.clear()
     if refresh:
         _refresh()
 
@@ -209,6 +219,7 @@ def delete_by_query(
         )
         raise SearchError(e)
 
+    search_cache.clear()
     if refresh:
         _refresh()
 
@@ -219,15 +230,20 @@ def delete_by_query(
     return result
 
 
-def refresh():
+def refresh(materials: bool = False):
     """
-    Refreshes the specified indices.
+    Refreshes the entries index, and optionally the materials index.
     """
+    search_cache.clear()
 
     try:
         infrastructure.elastic_client.indices.refresh(
             index=config.elastic.entries_index
         )
+        if materials:
+            infrastructure.elastic_client.indices.refresh(
+                index=config.elastic.materials_index
+            )
     except TransportError as e:
         utils.get_logger(__name__).error(
             'es delete_by_query error', exc_info=e, es_info=json.dumps(e.info, indent=2)
@@ -255,6 +271,7 @@ def index(
     errors = index_entries(entries, refresh=refresh or update_materials)
     if update_materials:
         index_materials(entries, refresh=refresh)
+    search_cache.clear()
     return errors
 
 
@@ -268,6 +285,223 @@ def index_materials(entries: Union[EntryArchive, List[EntryArchive]], **kwargs):
         entries = [entries]
 
     update_materials(entries=entries, **kwargs)
+    search_cache.clear()
+
+
+class IndexBuffer:
+    """
+    Accumulates the index documents of entries from many entry processes of a worker and
+    upserts them with fewer bulk requests.
+
+    The buffer is flushed when it holds `config.process.index_buffer_entries` documents
+    or `config.process.index_buffer_bytes` bytes, and by a background thread once the
+    oldest document was added more than `config.process.index_buffer_delay` seconds ago.
+    After each flush, the `on_flushed` callback is called with the ids and
+    :func:`index_doc_hash` of all flushed entries and the error messages of the entries
+    that failed to index. Documents are taken out of the buffer under a lock, the bulk
+    requests and the callbacks run without it.
+
+    Before documents are indexed, the optional `claim` callback is called with their
+    entry ids. It returns the ids of the documents that may still be indexed, the other
+    documents were taken over by someone else and are dropped.
+    """
+
+    def __init__(
+        self,
+        on_flushed: Callable[[Dict[str, Optional[str]], Dict[str, str]], None] = None,
+        claim: Callable[[List[str]], Collection[str]] = None,
+    ):
+        self.on_flushed = on_flushed
+        self.claim = claim
+        self._lock = threading.Lock()
+        # entry_id -> (index_doc, size, hash)
+        self._docs: Dict[str, Tuple[Dict[str, Any], int, Optional[str]]] = {}
+        self._size = 0
+        self._oldest: float = None
+        self._flusher: threading.Thread = None
+
+    @property
+    def enabled(self) -> bool:
+        return config.process.index_buffer_entries > 1
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, entry: EntryArchive) -> Dict[str, str]:
+        """
+        Adds the index document of the given entry. Returns a dictionary with the error
+        message of the given entry, if it was indexed right away and failed. The
+        errors of other flushed entries are only passed to `on_flushed`.
+        """
+        entry_id = entry['entry_id']
+        entry_docs = create_entry_index_docs([entry])
+        if not entry_docs:
+            return {entry_id: 'could not create index document'}
+
+        with self._lock:
+            for doc_entry_id, entry_doc in entry_docs:
+                # an entry that is added again replaces its buffered document
+                self._discard(doc_entry_id)
+                serialized = _serialize_index_doc(entry_doc)
+                if serialized is None:
+                    size, entry_hash = 0, None
+                else:
+                    size = len(serialized)
+                    entry_hash = hashlib.sha1(serialized).hexdigest()
+                self._docs[doc_entry_id] = (entry_doc, size, entry_hash)
+                self._size += size
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+
+            self._start_flusher()
+            if (
+                len(self._docs) < config.process.index_buffer_entries
+                and self._size < config.process.index_buffer_bytes
+            ):
+                return {}
+
+            docs = self._take()
+
+        entry_hashes, errors = self._index(docs)
+        self._report(entry_hashes, {k: v for k, v in errors.items() if k != entry_id})
+        return {entry_id: errors[entry_id]} if entry_id in errors else {}
+
+    def discard(self, entry_id: str) -> bool:
+        """Removes the buffered document of the given entry, if there is one."""
+        with self._lock:
+            return self._discard(entry_id)
+
+    def _discard(self, entry_id: str) -> bool:
+        if (buffered := self._docs.pop(entry_id, None)) is None:
+            return False
+        self._size -= buffered[1]
+        if not self._docs:
+            self._oldest = None
+        return True
+
+    def flush(self) -> Dict[str, str]:
+        """
+        Indexes all buffered documents. Returns a dictionary of the format
+        {entry_id: error_message} for all entries that failed to index.
+        """
+        with self._lock:
+            docs = self._take()
+
+        entry_hashes, errors = self._index(docs)
+        self._report(entry_hashes, errors)
+        return errors
+
+    def _take(self) -> Dict[str, Tuple[Dict[str, Any], int, Optional[str]]]:
+        docs = self._docs
+        self._docs = {}
+        self._size = 0
+        self._oldest = None
+        return docs
+
+    def _index(
+        self, docs: Dict[str, Tuple[Dict[str, Any], int, Optional[str]]]
+    ) -> Tuple[Dict[str, Optional[str]], Dict[str, str]]:
+        if docs and self.claim is not None:
+            try:
+                claimed = self.claim(list(docs))
+            except Exception as e:
+                return (
+                    {k: v[2] for k, v in docs.items()},
+                    {k: f'could not claim index document: {e}' for k in docs},
+                )
+            docs = {k: v for k, v in docs.items() if k in claimed}
+
+        entry_docs = [(k, v[0]) for k, v in docs.items()]
+        entry_hashes = {k: v[2] for k, v in docs.items()}
+
+        errors: Dict[str, str] = {}
+        if entry_docs:
+            search_cache.clear()
+        for i in range(0, len(entry_docs), config.elastic.bulk_size):
+            try:
+                errors.update(
+                    index_entry_docs(entry_docs[i : i + config.elastic.bulk_size])
+                )
+            except Exception as e:
+                errors.update(
+                    {
+                        entry_id: f'bulk request failed: {e}'
+                        for entry_id, _ in entry_docs[i : i + config.elastic.bulk_size]
+                    }
+                )
+        return entry_hashes, errors
+
+    def _report(self, entry_hashes: Dict[str, Optional[str]], errors: Dict[str, str]):
+        if entry_hashes and self.on_flushed is not None:
+            try:
+                self.on_flushed(entry_hashes, errors)
+            except Exception as e:
+                utils.get_logger(__name__).error(
+                    'could not report flushed index documents', exc_info=e
+                )
+
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._flusher = threading.Thread(target=self._run_flusher, daemon=True)
+        self._flusher.start()
+
+    def _run_flusher(self):
+        delay = config.process.index_buffer_delay
+        while True:
+            with self._lock:
+                if self._oldest is None:
+                    self._flusher = None
+                    return
+                wait = self._oldest + delay - time.monotonic()
+            if wait <= 0:
+                self.flush()
+            else:
+                time.sleep(wait)
+
+
+def _serialize_index_doc(entry_doc: Dict[str, Any]) -> Optional[bytes]:
+    try:
+        return orjson.dumps(
+            entry_doc,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SORT_KEYS,
+        )
+    except Exception:
+        return None
+
+
+def index_doc_hash(entry_doc: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns a hash of the given entry index document. Documents with the same hash do
+    not need to be indexed again. Returns None, if the document cannot be serialized;
+    such documents always have to be indexed.
+    """
+    serialized = _serialize_index_doc(entry_doc)
+    if serialized is None:
+        return None
+    return hashlib.sha1(serialized).hexdigest()
+
+
+def index_docs(
+    entry_docs: List[Tuple[str, Dict]], refresh: bool = False
+) -> Dict[str, str]:
+    """
+    Upserts the given entry index documents, see :func:`create_entry_index_docs`.
+    Returns a dictionary of the format {entry_id: error_message} for all entries that
+    failed to index.
+    """
+    errors: Dict[str, str] = {}
+    for i in range(0, len(entry_docs), config.elastic.bulk_size):
+        errors.update(
+            index_entry_docs(
+                entry_docs[i : i + config.elastic.bulk_size], refresh=refresh
+            )
+        )
+    search_cache.clear()
+    return errors
 
 
 # TODO this depends on how we merge section metadata
@@ -316,6 +550,7 @@ def update_metadata(
         infrastructure.elastic_client, updates, stats_only=True
     )
     failed = cast(int, failed)
+    search_cache.clear()
 
     if update_materials:
         # TODO update the matrials index at least for v1
@@ -1717,6 +1952,109 @@ def _buckets_to_interval(
     return aggregations, histogram_responses, bucket_values
 
 
+class SearchCache:
+    """
+    A LRU cache for the responses of :func:`search` with a time to live of
+    `config.elastic.search_cache_ttl` seconds. Only the responses for the owners in
+    `config.elastic.search_cache_owners` are cached. The responses for the `public`
+    owner do not depend on the user and are shared between all users.
+
+    The cache is cleared by all index modifications in this process. Modifications by
+    other processes, e.g. processing workers, become visible after the time to live.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (response, expiry time)
+        self._responses: OrderedDict[str, Tuple[MetadataResponse, float]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return config.elastic.search_cache_size > 0
+
+    def key(
+        self,
+        owner: str,
+        query: Union[Query, EsQuery],
+        pagination: MetadataPagination,
+        required: MetadataRequired,
+        aggregations: Dict[str, Aggregation],
+        user_id: str,
+        index: Index,
+    ) -> Optional[str]:
+        """
+        Returns the key for the given search parameters or None, if the search cannot
+        be cached.
+        """
+        if owner not in config.elastic.search_cache_owners:
+            return None
+        if isinstance(query, EsQuery):
+            query = query.to_dict()
+        try:
+            return json.dumps(
+                [
+                    index.index_name,
+                    owner,
+                    None if owner == 'public' else user_id,
+                    query,
+                    pagination,
+                    required,
+                    aggregations,
+                ],
+                sort_keys=True,
+                default=pydantic_encoder,
+            )
+        except Exception:
+            return None
+
+    def get(self, key: str) -> Optional[MetadataResponse]:
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is None or cached[1] < time.monotonic():
+                if cached is not None:
+                    del self._responses[key]
+                self.misses += 1
+                return None
+            self._responses.move_to_end(key)
+            self.hits += 1
+        return cached[0].copy(deep=True)
+
+    def add(self, key: str, response: MetadataResponse):
+        response = response.copy(deep=True)
+        with self._lock:
+            self._responses[key] = (
+                response,
+                time.monotonic() + config.elastic.search_cache_ttl,
+            )
+            self._responses.move_to_end(key)
+            while len(self._responses) > config.elastic.search_cache_size:
+                self._responses.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+
+    def statistics(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return dict(
+                responses=len(self._responses),
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                hit_rate=self.hits / requests if requests else 0.0,
+            )
+
+
+search_cache = SearchCache()
+
+
 def search(
     owner: str = 'public',
     query: Union[Query, EsQuery] = None,
@@ -1725,6 +2063,30 @@ def search(
     aggregations: Dict[str, Aggregation] = {},
     user_id: str = None,
     index: Index = entry_index,
+) -> MetadataResponse:
+    key = None
+    if search_cache.enabled:
+        key = search_cache.key(
+            owner, query, pagination, required, aggregations, user_id, index
+        )
+        if key is not None and (response := search_cache.get(key)) is not None:
+            return response
+
+    response = _search(owner, query, pagination, required, aggregations, user_id, index)
+
+    if key is not None:
+        search_cache.add(key, response)
+    return response
+
+
+def _search(
+    owner: str = 'public',
+    query: Union[Query, EsQuery] = None,
+    pagination: MetadataPagination = None,
+    required: MetadataRequired = None,
+    aggregations: Dict[str, Aggregation] = {},
+    user_id: str = None,
+    index: Index = entry_index,
 ) -> MetadataResponse:
     # If histogram aggregations only provide the number of buckets, we need to
     # separately query the min/max values before forming the histogram
@@ -16,12 +16,17 @@
 # limitations under the License.
 #
 
+import asyncio
 import pytest
+import time
 from urllib.parse import urlencode
 import zipfile
 import io
 import json
+import httpx
+from fastapi import HTTPException, status
 
+from nomad.app.main import app
 from nomad.metainfo.elasticsearch_extension import entry_type, schema_separator
 from nomad.utils.exampledata import ExampleData
 
@@ -1064,6 +1069,134 @@ def test_entries_archive(client, example_data, required, status_code):
     )
 
 
+@pytest.mark.parametrize(
+    'required',
+    [pytest.param('*', id='full'), pytest.param({'metadata': '*'}, id='partial')],
+)
+def test_entries_archive_ndjson(client, example_data, required):
+    body = {'required': required, 'pagination': {'page_size': 10}}
+    response = client.post('entries/archive/query', json=body)
+    assert_response(response, 200)
+    expected = response.json()
+
+    response = client.post(
+        'entries/archive/query',
+        json=body,
+        headers={'Accept': 'application/x-ndjson'},
+    )
+    assert_response(response, 200)
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    header, *lines = response.text.splitlines()
+    data = [json.loads(line) for line in lines]
+
+    assert json.loads(header) == {
+        key: value for key, value in expected.items() if key != 'data'
+    }
+    assert sorted(data, key=lambda entry: entry['entry_id']) == sorted(
+        expected['data'], key=lambda entry: entry['entry_id']
+    )
+
+
+def test_entries_archive_ndjson_error(client, example_data, monkeypatch):
+    def read_upload_archives(*args, **kwargs):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail='test error')
+
+    monkeypatch.setattr(
+        'nomad.app.v1.routers.entries._read_upload_archives', read_upload_archives
+    )
+    response = client.post(
+        'entries/archive/query',
+        json={'pagination': {'page_size': 10}},
+        headers={'Accept': 'application/x-ndjson'},
+    )
+    assert_response(response, 200)
+    header, *lines = response.text.splitlines()
+    assert 'pagination' in json.loads(header)
+    assert [json.loads(line) for line in lines] == [{'detail': 'test error'}]
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('workers', [0, 1, 4, 8])
+def test_entries_archive_benchmark(
+    benchmark,
+    monkeypatch,
+    elastic_function,
+    raw_files_function,
+    mongo_function,
+    user1,
+    workers,
+):
+    """
+    Measures full archive pages read by concurrent clients. The latency of a cheap
+    request that is served concurrently by the same app worker is recorded as extra
+    info.
+    """
+    from nomad.app.v1.routers import entries
+
+    n_uploads, n_entries, n_clients, n_pages = 10, 10, 8, 4
+    data = ExampleData(main_author=user1)
+    for i in range(n_uploads):
+        upload_id = f'id_benchmark_{i}'
+        data.create_upload(upload_id=upload_id, published=True)
+        for j in range(n_entries):
+            data.create_entry(
+                upload_id=upload_id,
+                entry_id=f'{upload_id}_{j}',
+                mainfile=f'test_content/{j}/mainfile.json',
+            )
+    data.save(with_files=True)
+
+    monkeypatch.setattr('nomad.config.services.archive_read_workers', workers)
+    monkeypatch.setattr(entries, '_archive_read_executor', None)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://testserver/api/v1/'
+        ) as client:
+            page_latencies: list[float] = []
+            probe_latencies: list[float] = []
+            done = asyncio.Event()
+
+            async def read_pages():
+                for _ in range(n_pages):
+                    start = time.perf_counter()
+                    response = await client.post(
+                        'entries/archive/query',
+                        json={
+                            'owner': 'visible',
+                            'pagination': {'page_size': n_uploads * n_entries},
+                        },
+                    )
+                    assert response.status_code == 200
+                    page_latencies.append(time.perf_counter() - start)
+
+            async def probe():
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await client.get('info')
+                    probe_latencies.append(time.perf_counter() - start)
+                    await asyncio.sleep(0.01)
+
+            prober = asyncio.create_task(probe())
+            await asyncio.gather(*[read_pages() for _ in range(n_clients)])
+            done.set()
+            await prober
+            return page_latencies, probe_latencies
+
+    page_latencies, probe_latencies = benchmark.pedantic(
+        lambda: asyncio.run(run()), rounds=3
+    )
+    page_latencies.sort()
+    probe_latencies.sort()
+    benchmark.extra_info.update(
+        pages=len(page_latencies),
+        page_p50=page_latencies[len(page_latencies) // 2],
+        probe_p50=probe_latencies[len(probe_latencies) // 2],
+        probe_max=probe_latencies[-1],
+    )
+
+
 @pytest.mark.parametrize(
     'user, entry_id, status_code',
     [
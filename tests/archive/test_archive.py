@@ -23,6 +23,7 @@ from io import BytesIO
 import os.path
 import json
 
+import numpy as np
 import yaml
 
 from nomad import utils
@@ -40,6 +41,7 @@ from nomad.metainfo import (
 )
 from nomad.datamodel import EntryArchive, ClientContext
 from nomad.archive.storage import _decode, _entries_per_block, to_json
+from nomad.archive.storage_v2 import MappedFile, combine_archive
 from nomad.archive import (
     write_archive,
     read_archive,
@@ -221,6 +223,196 @@ def test_read_archive_multi(monkeypatch, example_uuid, example_entry, use_blocke
             assert float(i) == entry['large_list'][i]
 
 
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_read_archive_mmap(tmp, example_uuid, example_entry, use_mmap):
+    path = os.path.join(tmp, 'test.msg')
+    write_archive(path, 1, [(example_uuid, example_entry)])
+
+    with read_archive(path, use_mmap=use_mmap) as reader:
+        assert isinstance(reader._f, MappedFile) == use_mmap
+        assert example_uuid in reader
+        assert reader[example_uuid]['large_list'][10] == 10.0
+        assert to_json(reader[example_uuid]) == example_entry
+
+    assert reader.is_closed()
+
+
+def test_read_archive_mmap_unsafe_filesystem(tmp, monkeypatch, example_uuid):
+    path = os.path.join(tmp, 'test.msg')
+    write_archive(path, 1, [(example_uuid, {'archive': 'test'})])
+
+    monkeypatch.setattr('nomad.archive.storage_v2.mmap_supported', lambda _: False)
+    with read_archive(path, use_mmap=True) as reader:
+        assert not isinstance(reader._f, MappedFile)
+        assert to_json(reader[example_uuid]) == {'archive': 'test'}
+
+
+@pytest.mark.parametrize('use_blocked_toc', [False, True])
+def test_read_many(monkeypatch, example_entry, use_blocked_toc):
+    # small reads to have several coalesced blocks and entries that are read lazily
+    monkeypatch.setattr('nomad.config.archive.coalesce_read_size', 4096)
+    monkeypatch.setattr('nomad.config.archive.small_obj_optimization_threshold', 256)
+
+    entries = {
+        create_example_uuid(i): dict(example_entry, index=[i] * (i % 5) * 200)
+        for i in range(50)
+    }
+    f = BytesIO()
+    write_archive(f, len(entries), entries.items())
+
+    keys = list(reversed(entries)) + ['does not exist']
+    with read_archive(f, use_blocked_toc=use_blocked_toc) as reader:
+        _ = reader[keys[0]]
+        results = list(reader.read_many(keys))
+
+    assert [key for key, _ in results] != keys
+    assert sorted(key for key, _ in results) == sorted(keys)
+    for key, archive in results:
+        if key == 'does not exist':
+            assert archive is None
+        else:
+            assert to_json(archive) == entries[key]
+
+
+def create_ndarray_entry(size: int = 10):
+    return {
+        'positions': np.arange(size * 3, dtype=np.float64).reshape(size, 3),
+        'labels': np.array([1, 2, 3], dtype=np.int32),
+        'mask': np.array([True, False]),
+        'scalar': np.array(1.5, dtype=np.float32),
+        'strings': np.array(['a', 'b']),
+        'frames': [np.array([i], dtype=np.int8) for i in range(size * 20)],
+        'calculations': [
+            {'energies': np.linspace(0, 1, 5), 'step': i} for i in range(100)
+        ],
+    }
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_read_write_archive_ndarray(tmp, monkeypatch, example_uuid, use_mmap):
+    monkeypatch.setattr('nomad.config.archive.small_obj_optimization_threshold', 256)
+    entry = create_ndarray_entry()
+    expected = json.loads(json.dumps(entry, default=lambda v: v.tolist()))
+    path = os.path.join(tmp, 'test.msg')
+    write_archive(path, 1, [(example_uuid, entry)])
+
+    with read_archive(path, use_mmap=use_mmap) as reader:
+        archive = reader[example_uuid]
+        assert archive['positions'] == expected['positions']
+        assert (
+            archive['calculations'][10]['energies']
+            == expected['calculations'][10]['energies']
+        )
+        assert to_json(archive) == expected
+
+    with read_archive(path, use_mmap=use_mmap, ndarray=True) as reader:
+        archive = reader[example_uuid]
+        positions = archive['positions']
+        assert isinstance(positions, np.ndarray)
+        assert positions.dtype == np.float64
+        assert positions.shape == (10, 3)
+        assert np.array_equal(positions, entry['positions'])
+        assert archive['labels'].dtype == np.int32
+        assert archive['mask'].dtype == np.bool_
+        assert archive['scalar'].shape == ()
+        assert archive['strings'] == ['a', 'b']
+        assert archive['frames'][50].dtype == np.int8
+        assert np.array_equal(
+            archive['calculations'][10]['energies'],
+            entry['calculations'][10]['energies'],
+        )
+        assert to_json(archive) == expected
+
+    assert reader.is_closed()
+
+
+def test_m_to_dict_keep_ndarray():
+    class TestSection(MSection):
+        values = Quantity(type=np.float64, shape=['*', 3])
+        indices = Quantity(type=np.int32, shape=['*'])
+        labels = Quantity(type=str, shape=['*'])
+
+    section = TestSection(
+        values=np.ones((2, 3)), indices=np.array([1, 2]), labels=['a', 'b']
+    )
+
+    data = section.m_to_dict(keep_ndarray=True)
+    assert isinstance(data['values'], np.ndarray)
+    assert isinstance(data['indices'], np.ndarray)
+    assert data['labels'] == ['a', 'b']
+    assert section.m_to_dict() == {
+        'values': [[1.0] * 3] * 2,
+        'indices': [1, 2],
+        'labels': ['a', 'b'],
+    }
+
+    # transformed values are always serialized as lists
+    data = section.m_to_dict(keep_ndarray=True, transform=lambda q, s, v, p: v)
+    assert data['values'] == [[1.0] * 3] * 2
+
+    f = BytesIO()
+    write_archive(f, 1, [(create_example_uuid(), data)])
+    with read_archive(f) as reader:
+        assert to_json(reader[create_example_uuid()]) == section.m_to_dict()
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('keep_ndarray', [False, True])
+def test_write_archive_ndarray_benchmark(benchmark, example_uuid, keep_ndarray):
+    class TestSection(MSection):
+        values = Quantity(type=np.float64, shape=['*', 3])
+
+    section = TestSection(values=np.random.rand(1_000_000, 3))
+
+    def write():
+        f = BytesIO()
+        write_archive(
+            f, 1, [(example_uuid, section.m_to_dict(keep_ndarray=keep_ndarray))]
+        )
+        with read_archive(f, ndarray=keep_ndarray) as reader:
+            return reader[example_uuid]['values']
+
+    benchmark(write)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_combine_archive(tmp, monkeypatch, example_entry, workers):
+    # entries larger than the chunk size are not loaded in advance
+    monkeypatch.setattr('nomad.config.archive.copy_chunk_size', 4096)
+
+    entries = {
+        create_example_uuid(i): dict(example_entry, index=[float(i)] * (i % 3) * 200)
+        for i in range(20)
+    }
+    sources = []
+    for uuid, entry in entries.items():
+        if uuid == create_example_uuid(7):
+            sources.append((uuid, None))
+            continue
+        path = os.path.join(tmp, f'{uuid.strip()}.msg')
+        write_archive(path, 1, [(uuid, entry)])
+        sources.append((uuid, path))
+
+    def create_iterator():
+        for uuid, path in sources:
+            if uuid == create_example_uuid(3):
+                with read_archive(path) as reader:
+                    yield uuid, reader
+            else:
+                yield uuid, path
+
+    combined = os.path.join(tmp, 'combined.msg')
+    combine_archive(combined, len(sources), create_iterator(), workers=workers)
+
+    with read_archive(combined) as reader:
+        assert len(reader) == len(entries)
+        for uuid, entry in entries.items():
+            if uuid == create_example_uuid(7):
+                assert to_json(reader[uuid]) == {}
+            else:
+                assert to_json(reader[uuid]) == entry
+
+
 test_query_example: Dict[Any, Any] = {
     'c1': {
         's1': {'ss1': [{'p1': 1.0, 'p2': 'x'}, {'p1': 1.5, 'p2': 'y'}]},
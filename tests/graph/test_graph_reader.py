@@ -18,11 +18,15 @@
 
 import json
 from datetime import datetime
+from io import BytesIO
 
 import pytest
 import yaml
 
+from nomad.archive import read_archive, write_archive
 from nomad.graph.graph_reader import (
+    ArchiveCache,
+    ArchiveReader,
     EntryReader,
     UploadReader,
     UserReader,
@@ -30,7 +34,10 @@ from nomad.graph.graph_reader import (
     MongoReader,
     GeneralReader,
     Token,
+    QueryError,
     LazyUserWrapper,
+    _archive_file_size,
+    _archive_size,
 )
 from nomad.datamodel import EntryArchive
 from nomad.utils.exampledata import ExampleData
@@ -3895,3 +3902,170 @@ def json_dict():
             'results': {'calculation_result_ref': '/run/0/calculation/1'},
         },
     }
+
+
+@pytest.mark.parametrize('archive_source', ['dict', 'bytes', 'file'])
+def test_archive_reader_concurrency(monkeypatch, tmp_path, archive_source):
+    # small objects are not grouped, all children are read lazily from the file
+    monkeypatch.setattr('nomad.config.archive.small_obj_optimization_threshold', 64)
+    n_items = 64
+    archive = {
+        'metadata': {'upload_id': 'test_upload', 'entry_id': 'test_entry'},
+        'workflow': [
+            {'type': 'single_point', 'calculator': f'calculator {i}' * (i + 1)}
+            for i in range(n_items)
+        ],
+        'results': {
+            'material': {'elements': ['H', 'He'], 'chemical_formula_hill': 'HHe'},
+            'properties': {'n_calculations': n_items},
+        },
+    }
+    query = {
+        'metadata': {'m_request': {'directive': 'plain'}},
+        f'workflow[1:{n_items}]': {
+            'type': {'m_request': {'directive': 'plain'}},
+            'calculator': {'m_request': {'directive': 'plain'}},
+        },
+        'results': {'material': '*', 'properties': '*'},
+    }
+
+    def read():
+        if archive_source == 'dict':
+            with ArchiveReader(query, user=None) as reader:
+                return reader.sync_read(archive)
+
+        if archive_source == 'bytes':
+            f = BytesIO()
+            write_archive(f, 1, [('test_entry', archive)])
+            file_or_path = f
+        else:
+            # a buffered file that is read with seek and read, not positional reads
+            file_or_path = str(tmp_path / 'archive.msg')
+            write_archive(file_or_path, 1, [('test_entry', archive)])
+        with (
+            read_archive(file_or_path, use_mmap=False) as archive_reader,
+            ArchiveReader(query, user=None) as reader,
+        ):
+            return reader.sync_read(archive_reader['test_entry'])
+
+    monkeypatch.setattr('nomad.config.services.graph_concurrency', 1)
+    sequential = read()
+    monkeypatch.setattr('nomad.config.services.graph_concurrency', 8)
+
+    assert [v['calculator'] for v in sequential['workflow'][1:]] == [
+        f'calculator {i}' * (i + 1) for i in range(1, n_items)
+    ]
+    assert sequential['results'] == archive['results']
+    for _ in range(5):
+        # the merged response does not depend on the order the reads complete
+        assert json.dumps(read()) == json.dumps(sequential)
+
+
+def test_reader_errors_order():
+    errors = [
+        (QueryError.NOTFOUND, 'b not found'),
+        (QueryError.GENERAL, 'general'),
+        (QueryError.NOTFOUND, 'a not found'),
+    ]
+
+    def populate(logged):
+        with ArchiveReader({}, user=None) as reader:
+            for error_type, message in logged:
+                reader._log(message, error_type=error_type)
+            container: dict = {}
+            reader._populate_error_list(container)
+            return container['m_errors']
+
+    # concurrent visits log in the order they complete
+    assert populate(errors) == populate(errors[::-1])
+    assert populate(errors) == [
+        {'error_type': QueryError.GENERAL, 'message': 'general'},
+        {'error_type': QueryError.NOTFOUND, 'message': 'a not found'},
+        {'error_type': QueryError.NOTFOUND, 'message': 'b not found'},
+    ]
+
+
+def test_upload_reader_concurrency(monkeypatch, example_data_with_reference, user1):
+    required = {
+        'm_request': {'directive': 'plain'},
+        'upload_id': {'m_request': {'directive': 'resolved', 'resolve_type': 'upload'}},
+        'viewers': {'m_request': {'directive': 'resolved', 'resolve_type': 'user'}},
+        'main_author': {'m_request': {'directive': 'resolved', 'resolve_type': 'user'}},
+    }
+
+    def read():
+        with UploadReader(required, user=user1) as reader:
+            return reader.sync_read('id_published_with_ref')
+
+    monkeypatch.setattr('nomad.config.services.graph_concurrency', 1)
+    sequential = read()
+    monkeypatch.setattr('nomad.config.services.graph_concurrency', 4)
+    concurrent = read()
+
+    assert 'm_errors' not in sequential
+    assert sequential['upload_id']['upload_id'] == 'id_published_with_ref'
+    assert sequential['main_author']['name'] == 'Sheldon Cooper'
+    assert json.dumps(concurrent, default=str) == json.dumps(sequential, default=str)
+
+
+def test_archive_cache():
+    def create_archive(entry_id: str, size: int):
+        f = BytesIO()
+        write_archive(
+            f,
+            1,
+            [
+                (
+                    entry_id,
+                    {'metadata': {'entry_id': entry_id}, 'data': {'x': 'x' * size}},
+                )
+            ],
+        )
+        return read_archive(f)
+
+    readers = {entry_id: create_archive(entry_id, 1000) for entry_id in 'abc'}
+    # with the default small object threshold, archives are read as plain dicts
+    archives = {entry_id: reader[entry_id] for entry_id, reader in readers.items()}
+    assert isinstance(archives['a'], dict)
+    assert 1000 < _archive_size(archives['a']) < 1250
+    assert 1000 < _archive_file_size(readers['a'], 'a') < 1250
+    assert _archive_file_size(archives['a'], 'a') is None
+
+    cache = ArchiveCache(max_size=2500)
+
+    assert cache.get_archive('upload', 'a') is None
+    cache.add_archive('upload', 'a', archives['a'])
+    cache.add_archive(
+        'upload', 'b', archives['b'], _archive_file_size(readers['b'], 'b')
+    )
+    assert cache.get_archive('upload', 'a') is archives['a']
+
+    # targets are only cached for the cached archive instance
+    target = archives['a']['data']
+    assert cache.get_target('upload', 'a', archives['a'], 'data') is None
+    cache.add_target('upload', 'a', archives['a'], 'data', target)
+    assert cache.get_target('upload', 'a', archives['a'], 'data') is target
+    assert cache.get_target('upload', 'a', {}, 'data') is None
+
+    # the least recently used archive is evicted
+    cache.add_archive('upload', 'c', archives['c'])
+    assert cache.get_archive('upload', 'b') is None
+    assert cache.get_archive('upload', 'a') is archives['a']
+    assert cache.get_archive('upload', 'c') is archives['c']
+
+    # archives larger than the cache are not cached
+    cache.add_archive('upload', 'd', {'data': 'x' * 3000})
+    assert cache.get_archive('upload', 'd') is None
+
+    statistics = cache.statistics()
+    assert statistics['archives'] == 2
+    assert statistics['targets'] == 1
+    assert 2000 < statistics['size'] <= 2500
+    assert statistics['evictions'] == 1
+    assert statistics['archive_hits'] == 3
+    assert statistics['archive_misses'] == 3
+    assert statistics['target_hits'] == 1
+    assert statistics['target_misses'] == 1
+
+    cache.close()
+    assert cache.statistics()['archives'] == 0
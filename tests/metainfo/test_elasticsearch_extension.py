@@ -17,15 +17,21 @@
 #
 
 from typing import List
+import json
 import pytest
 import numpy as np
 from elasticsearch_dsl import Keyword
 
 from nomad.config import config
 from nomad.utils.exampledata import ExampleData
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel import User as DatamodelUser
 from nomad.datamodel.datamodel import SearchableQuantity
+from nomad.datamodel.metainfo import runschema, SCHEMA_IMPORT_ERROR
 from nomad.metainfo import MSection, Quantity, SubSection, Datetime, Unit, MEnum
+from nomad.metainfo import elasticsearch_extension
 from nomad.metainfo.elasticsearch_extension import (
+    DocumentType,
     Elasticsearch,
     create_indices,
     index_entries_with_materials,
@@ -471,6 +477,154 @@ def test_index_docs(indices):
     }
 
 
+def create_test_archive(index: int) -> EntryArchive:
+    from nomad.datamodel import results
+
+    user = DatamodelUser(user_id='test_user_id', first_name='Test', last_name='User')
+    archive = EntryArchive(
+        metadata=EntryMetadata(
+            entry_id=f'test_entry_id_{index}',
+            upload_id='test_upload_id',
+            mainfile=f'test_dir/{index}/mainfile.json',
+            entry_name=f'test entry {index}',
+            references=['http://example.com'],
+            main_author=user,
+            coauthors=[user],
+            search_quantities=[
+                SearchableQuantity(
+                    id='data.value#test.Schema',
+                    definition='data.value',
+                    path_archive='data.value',
+                    float_value=float(index),
+                )
+            ],
+        )
+    )
+    material = archive.m_setdefault('results/material')
+    material.m_update(
+        material_id=f'test_material_id_{index % 2}',
+        elements=['H', 'O'],
+        chemical_formula_hill='H2O',
+        chemical_formula_descriptive='H2O',
+        structural_type='bulk',
+    )
+    material.m_create(results.Symmetry, space_group_number=225)
+    for topology_index in range(3):
+        material.topology.append(
+            results.System(
+                system_id=f'results/material/topology/{topology_index}',
+                label=f'test system {topology_index}',
+                elements=['H'],
+                method='parser',
+            )
+        )
+    archive.results.m_create(results.Method, method_name='DFT').m_create(
+        results.Simulation, program_name='VASP'
+    )
+    return archive
+
+
+def assert_index_doc_with_plan(doc_type: DocumentType, root: MSection):
+    doc = doc_type.create_index_doc(root)
+    assert json.dumps(doc) == json.dumps(
+        doc_type.create_index_doc(root, with_plan=False)
+    )
+    return doc
+
+
+def test_create_index_doc(monkeypatch):
+    from nomad.datamodel.results import Material as ResultsMaterial
+
+    # the test schema uses the entry type for its annotations
+    test_schema_type = DocumentType('test', id_field='entry_id')
+    monkeypatch.setattr(
+        'nomad.metainfo.elasticsearch_extension.entry_type', test_schema_type
+    )
+    test_schema_type.create_mapping(Entry.m_def, auto_include_subsections=True)
+
+    user = User(user_id='test_user_id', name='Test User')
+    entry = Entry(entry_id='test_entry_id', mainfile='test_mainfile', viewers=[user])
+    data = entry.m_create(Data, points=[[0.1, 0.2], [1.1, 1.2]])
+    properties = entry.m_create(Results).m_create(Properties, data=data, n_series=data)
+    properties.dos.append(Dos(channel=0))
+    doc = assert_index_doc_with_plan(test_schema_type, entry)
+    assert doc['entry_id'] == 'test_entry_id'
+    assert doc['mainfile'] == 'other_mainfile'
+    assert doc['results']['properties']['dos'] == [{'channel': 0}]
+
+    test_entry_type = DocumentType('entries', id_field='entry_id')
+    test_material_type = DocumentType('materials', id_field='material_id')
+    monkeypatch.setattr(
+        'nomad.metainfo.elasticsearch_extension.entry_type', test_entry_type
+    )
+    test_entry_type.create_mapping(EntryArchive.m_def)
+    test_material_type.create_mapping(
+        ResultsMaterial.m_def, auto_include_subsections=True
+    )
+    for index in range(4):
+        archive = create_test_archive(index)
+        assert_index_doc_with_plan(test_entry_type, archive)
+        assert_index_doc_with_plan(test_material_type, archive.results.material)
+
+
+@pytest.mark.skipif(runschema is None, reason=SCHEMA_IMPORT_ERROR)
+def test_create_index_doc_archives(monkeypatch):
+    from nomad.datamodel.results import Material as ResultsMaterial
+    from tests.states.archives.create_archives import archive_dft_bulk
+
+    test_entry_type = DocumentType('entries', id_field='entry_id')
+    test_material_type = DocumentType('materials', id_field='material_id')
+    monkeypatch.setattr(
+        'nomad.metainfo.elasticsearch_extension.entry_type', test_entry_type
+    )
+    test_entry_type.create_mapping(EntryArchive.m_def)
+    test_material_type.create_mapping(
+        ResultsMaterial.m_def, auto_include_subsections=True
+    )
+
+    archive = archive_dft_bulk()
+    assert_index_doc_with_plan(test_entry_type, archive)
+    assert_index_doc_with_plan(test_material_type, archive.results.material)
+
+
+def test_create_index_doc_changed_properties(monkeypatch):
+    doc_type = DocumentType('test', id_field='entry_id')
+    monkeypatch.setattr('nomad.metainfo.elasticsearch_extension.entry_type', doc_type)
+    doc_type.create_mapping(Entry.m_def, auto_include_subsections=True)
+    entry = Entry(entry_id='test_entry_id', mainfile='test_mainfile')
+    entry.not_indexed = 'test_value'
+
+    doc = doc_type.create_index_doc(entry)
+    assert doc['mainfile'] == 'other_mainfile'
+    assert 'not_indexed' not in doc
+
+    # replace an indexed property without changing the number of indexed properties
+    doc_type.indexed_properties.remove(Entry.mainfile)
+    doc_type.indexed_properties.add(Entry.not_indexed)
+
+    doc = doc_type.create_index_doc(entry)
+    assert 'mainfile' not in doc
+    assert doc['not_indexed'] == 'test_value'
+    assert doc == doc_type.create_index_doc(entry, with_plan=False)
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('with_plan', [True, False])
+def test_create_index_doc_benchmark(benchmark, monkeypatch, with_plan):
+    test_entry_type = DocumentType('entries', id_field='entry_id')
+    monkeypatch.setattr(
+        'nomad.metainfo.elasticsearch_extension.entry_type', test_entry_type
+    )
+    test_entry_type.create_mapping(EntryArchive.m_def)
+    archives = [create_test_archive(index) for index in range(100)]
+
+    def create_index_docs():
+        for archive in archives:
+            test_entry_type.create_index_doc(archive, with_plan=with_plan)
+
+    benchmark(create_index_docs)
+
+
 def test_index_entry(elastic_function, indices, example_entry):
     index_entries_with_materials([example_entry], refresh=True)
     assert_entry_indexed(example_entry)
@@ -566,3 +720,40 @@ def test_index_materials_capped(elastic_function, indices, monkeypatch, cap, ent
     for material_doc in material_docs:
         assert len(material_doc['entries']) <= cap
         assert material_doc['n_entries'] == entries
+
+
+@pytest.mark.parametrize(
+    'to_index',
+    [
+        pytest.param('1-1*', id='updated'),
+        pytest.param('1-1*, 3-1', id='updated-and-new'),
+        pytest.param('3-1, 1-1*', id='new-and-updated'),
+    ],
+)
+def test_update_materials_capped(elastic_function, indices, monkeypatch, to_index):
+    monkeypatch.setattr('nomad.config.elastic.entries_per_material_cap', 2)
+    index_entries_with_materials(create_entries('1-1, 2-1'), refresh=True)
+    index_entries_with_materials(create_entries(to_index), refresh=True)
+
+    material_doc = material_index.get(id='1')['_source']
+    # updated entries keep their place in a material that is at the cap
+    assert [entry['entry_id'] for entry in material_doc['entries']] == ['1', '2']
+    assert material_doc['n_entries'] == len(create_entries(to_index)) + 1
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('n_updated', [1, 100])
+def test_update_materials_benchmark(
+    benchmark, elastic_function, indices, monkeypatch, n_updated
+):
+    n_entries = 10000
+    monkeypatch.setattr('nomad.config.elastic.entries_per_material_cap', n_entries)
+    index_entries_with_materials(
+        create_entries(','.join([f'{i}-1' for i in range(n_entries)])), refresh=True
+    )
+    updated_entries = create_entries(','.join([f'{i}-1' for i in range(n_updated)]))
+
+    benchmark(elasticsearch_extension.update_materials, updated_entries, refresh=True)
+
+    material_doc = material_index.get(id='1')['_source']
+    assert material_doc['n_entries'] == n_entries
@@ -16,10 +16,14 @@
 # limitations under the License.
 #
 
+from io import BytesIO
+
 import pytest
 import numpy as np
 import yaml
 
+from nomad import utils
+from nomad.archive import read_archive, write_archive
 from nomad.app.v1.routers.metainfo import (
     get_package_by_section_definition_id,
     store_package_definition,
@@ -90,6 +94,36 @@ def test_m_from_dict(example):
     assert Root.m_from_dict(example.m_to_dict()).m_to_dict() == expected_root
 
 
+def test_m_from_dict_lazy(example):
+    root = Root.m_from_dict(example.m_to_dict(), lazy=True)
+
+    # properties are only deserialized when they are accessed
+    assert not dict.__contains__(root.__dict__, 'child')
+    assert root.child.scalar == 'test_value'
+    assert dict.__contains__(root.__dict__, 'child')
+    assert not dict.__contains__(root.child.__dict__, 'many')
+    assert not dict.__contains__(root.__dict__, 'children')
+
+    assert root.m_is_set(Root.many)
+    assert root.abstract.m_def == Child.m_def
+    assert root.children[1].m_parent_index == 1
+    assert root.m_to_dict() == expected_root
+
+
+def test_m_from_dict_lazy_archive(example, monkeypatch):
+    monkeypatch.setattr('nomad.config.archive.small_obj_optimization_threshold', 64)
+    entry_id = utils.create_uuid()
+    f = BytesIO()
+    write_archive(f, 1, [(entry_id, example.m_to_dict())])
+    with read_archive(f) as reader:
+        data = reader.read_detached(entry_id)
+
+    root = Root.m_from_dict(data, lazy=True)
+    assert root.children[1].many == values['many']
+    assert root.m_to_dict() == expected_root
+    assert root.m_copy(deep=True).m_to_dict() == expected_root
+
+
 @pytest.mark.parametrize(
     'metainfo_data',
     [
@@ -16,11 +16,13 @@
 # limitations under the License.
 #
 
+import json
 import numpy as np
 from collections import defaultdict
 import pytest
 from nomad.client.processing import normalize
 from nomad.datamodel.metainfo import runschema
+from nomad.normalizing.topology import MaterialIds, top_50k_material_ids
 
 from nomad.units import ureg
 from tests.normalizing.conftest import (  # pylint: disable=unused-import
@@ -584,3 +586,46 @@ def test_mass_density(atom_labels, atom_parameters, expected_mass_density):
         assert cell.mass_density.magnitude == pytest.approx(
             expected_mass_density, abs=0, rel=1e-6
         )
+
+
+def test_material_ids(tmp_path):
+    path = tmp_path / 'material_ids.npy'
+    MaterialIds.write(['id_b', 'id_a', 'id_c', 'id_a'], path)
+    material_ids = MaterialIds(path)
+    assert len(material_ids) == 3
+    assert all(material_id in material_ids for material_id in ['id_a', 'id_b', 'id_c'])
+    assert all(
+        material_id not in material_ids
+        for material_id in ['id_', 'id_d', 'id_aa', 'a', '', None]
+    )
+
+
+@pytest.fixture(scope='module')
+def top_material_ids():
+    return [material_id.decode() for material_id in top_50k_material_ids.material_ids]
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('file_format', ['json', 'npy'])
+def test_material_ids_load_benchmark(
+    benchmark, tmp_path, top_material_ids, file_format
+):
+    if file_format == 'json':
+        # the entry counts by material id that were loaded on import before
+        path = tmp_path / 'top_50k_material_ids.json'
+        path.write_text(json.dumps(dict.fromkeys(top_material_ids, 1)))
+        benchmark(lambda: json.loads(path.read_text()))
+    else:
+        benchmark(lambda: MaterialIds(top_50k_material_ids.path).material_ids)
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('container', ['list', 'dict', 'npy'])
+def test_material_ids_membership_benchmark(benchmark, top_material_ids, container):
+    if container == 'list':
+        material_ids = top_material_ids
+    elif container == 'dict':
+        material_ids = dict.fromkeys(top_material_ids)
+    else:
+        material_ids = top_50k_material_ids
+    assert benchmark(lambda: top_material_ids[-1] in material_ids)
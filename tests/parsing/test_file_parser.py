@@ -285,6 +285,75 @@ class TestTextParser:
 
         assert parser.get('total_time') == 22.4
 
+    def test_quantity_sub_parser_views(self, parser):
+        parser.quantities = [
+            Quantity(
+                'scf',
+                r'Self\-consistent loop started([\s\S]+?)Self\-consistent loop stopped',
+                repeats=True,
+                sub_parser=TextParser(
+                    quantities=[
+                        Quantity(
+                            'iteration',
+                            r'SCF iteration number\s*:\s*(\d+)',
+                            repeats=True,
+                        )
+                    ]
+                ),
+            ),
+            Quantity(
+                'total_time',
+                r'Total time spent \(seconds\)\s*:\s*([\d.]+)',
+                repeats=False,
+            ),
+        ]
+
+        scf = parser.get('scf')
+        assert parser.get('total_time') == 22.4
+        assert len(scf) == 1
+        # sub parsers work on views of the parent buffer and are parsed lazily
+        assert isinstance(scf[0]._file_handler, memoryview)
+        assert scf[0]._results is None
+        assert len(scf[0].get('iteration')) == 12
+
+    @pytest.mark.parametrize('release', ['parse', 'clear'])
+    def test_quantity_sub_parser_outlives_parent(self, mainfile, release):
+        parser = TextParser(
+            mainfile=mainfile,
+            quantities=[
+                Quantity(
+                    'scf',
+                    r'Self\-consistent loop started([\s\S]+?)Self\-consistent loop stopped',
+                    repeats=True,
+                    sub_parser=TextParser(
+                        quantities=[
+                            Quantity(
+                                'iteration',
+                                r'SCF iteration number\s*:\s*(\d+)',
+                                repeats=True,
+                            )
+                        ]
+                    ),
+                )
+            ],
+        )
+        scf = parser.get('scf')
+        shared_map = scf[0]._shared_map
+        assert shared_map is not None and not shared_map.mmap.closed
+
+        if release == 'clear':
+            # the views of unparsed sub parsers are released with the parent
+            parser.clear()
+        else:
+            # the parent released the map after parsing, the sub parser still has a view
+            del parser
+            assert not shared_map.mmap.closed
+            assert len(scf[0].get('iteration')) == 12
+
+        # the map is closed with the last view
+        assert scf[0]._shared_map is None
+        assert shared_map.mmap.closed
+
     def test_block_short(self, parser, quantity_repeats):
         parser.quantities = [
             Quantity(
@@ -420,6 +489,60 @@ class TestTextParser:
         # assert list(lattice_vectors.shape) == Atoms.lattice_vectors.shape
         # assert lattice_vectors.dtype == Atoms.lattice_vectors.type
 
+    @pytest.mark.parametrize(
+        'block',
+        [
+            pytest.param(b'1 2 3', id='int'),
+            pytest.param(b'1.0 2.5\n -3e-2 4E+1', id='float'),
+            pytest.param(b'  7  ', id='scalar'),
+            pytest.param(b'1-2 3', id='no-separator'),
+            pytest.param(b'1.0 2.0e', id='malformed'),
+            pytest.param(b'1.0 nan inf', id='special'),
+            pytest.param(b'H 0.0 1.0', id='mixed'),
+        ],
+    )
+    @pytest.mark.parametrize('reduce', [True, False])
+    @pytest.mark.parametrize('dtype', [None, float])
+    def test_quantity_numeric_block(self, block, reduce, dtype):
+        def to_data(val_raw):
+            quantity = Quantity('test', r'(.+)', reduce=reduce, dtype=dtype)
+            return quantity.to_data(val_raw)
+
+        expected, data = to_data(block.decode()), to_data(block)
+        assert type(data) is type(expected)
+        if isinstance(expected, np.ndarray):
+            assert data.dtype == expected.dtype
+            np.testing.assert_array_equal(data, expected)
+        else:
+            assert data == expected
+
+    @pytest.mark.skip
+    @pytest.mark.parametrize('size', [100 * 2**20, 500 * 2**20])
+    def test_numeric_block_benchmark(self, benchmark, tmp_path, size):
+        mainfile = tmp_path / 'eigenvalues.out'
+        rows = size // 80
+        np.savetxt(
+            mainfile,
+            np.random.rand(rows, 4),
+            fmt='%18.12f',
+            header='Eigenvalues',
+            footer='End',
+            comments='',
+        )
+
+        def parse():
+            parser = TextParser(
+                mainfile=str(mainfile),
+                quantities=[
+                    Quantity(
+                        'eigenvalues', r'Eigenvalues\s+([\d\.\s]+)End', shape=(-1, 4)
+                    )
+                ],
+            )
+            return parser.get('eigenvalues')
+
+        assert benchmark(parse).shape == (rows, 4)
+
 
 class TestXMLParser:
     @pytest.fixture(scope='class')
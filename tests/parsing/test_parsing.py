@@ -21,6 +21,7 @@ import os
 from shutil import copyfile
 from unittest.mock import patch, MagicMock
 
+import magic
 import pytest
 
 from nomad import files, utils
@@ -433,3 +434,102 @@ if __name__ == '__main__':
     ), 'One argument with an directory path is required.'
 
     parser_in_dir(sys.argv[1])
+
+
+def synthetic_parsers(n: int = 80):
+    synthetic = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            parser = MatchingParser(
+                name=f'parsers/synthetic-{i}',
+                mainfile_name_re=rf'.*\.code{i}\.out',
+                mainfile_contents_re=rf'PROGRAM CODE{i}\b',
+            )
+        elif kind == 1:
+            parser = MatchingParser(
+                name=f'parsers/synthetic-{i}',
+                mainfile_contents_re=rf'(?m)^\s*Welcome to code {i}\s*$',
+            )
+        elif kind == 2:
+            parser = MatchingParser(
+                name=f'parsers/synthetic-{i}',
+                mainfile_name_re=r'.*\.h5',
+                mainfile_mime_re=r'application/.*',
+                mainfile_binary_header=f'CODE{i}'.encode(),
+            )
+        else:
+            parser = MatchingParser(
+                name=f'parsers/synthetic-{i}',
+                mainfile_name_re=r'.*/INPUT',
+                mainfile_alternative=i % 8 == 3,
+                mainfile_contents_re=rf'code{i}',
+                supported_compressions=['gz'],
+            )
+        synthetic.append(parser)
+
+    return parsers[:-1] + synthetic + parsers[-1:]
+
+
+def synthetic_upload(directory: str, n_files: int, n_parsers: int = 80):
+    # mimic the typical header of simulation outputs within the matching buffer size
+    header = ''.join(
+        f'{line:6d} some header line of typical length\n' for line in range(250)
+    )
+    contents = [
+        lambda i: (
+            f'calc_{i}.code{i % n_parsers}.out',
+            header + f'PROGRAM CODE{i % n_parsers}',
+        ),
+        lambda i: (f'log_{i}.txt', header + f'\n  Welcome to code {i % n_parsers}  \n'),
+        lambda i: (f'data_{i}.h5', b'\x00\x01' + f'CODE{i % n_parsers}'.encode()),
+        lambda i: ('INPUT', f'# code{i % n_parsers}\n' + 'x = 1\n' * 50),
+        lambda i: (f'aux_{i}.dat', '1.0 2.0 3.0\n' * 100),
+    ]
+    paths = []
+    for i in range(n_files):
+        file_name, content = contents[i % len(contents)](i)
+        path = os.path.join(directory, f'dir_{i // 5}', file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb' if isinstance(content, bytes) else 'wt') as f:
+            f.write(content)
+        paths.append(path)
+
+    return paths
+
+
+def test_match_parser_index(monkeypatch, tmp_path):
+    test_parsers = synthetic_parsers()
+    monkeypatch.setattr('nomad.parsing.parsers.parsers', test_parsers)
+
+    for path in synthetic_upload(str(tmp_path), 200):
+        with open(path, 'rb') as f:
+            buffer = f.read()
+        try:
+            decoded_buffer = buffer.decode('utf-8')
+        except UnicodeDecodeError:
+            decoded_buffer = None
+        mime_type = magic.from_buffer(buffer, mime=True)
+        expected = next(
+            (
+                parser
+                for parser in test_parsers
+                if parser.is_mainfile(path, mime_type, buffer, decoded_buffer)
+            ),
+            None,
+        )
+
+        parser, _ = match_parser(path)
+        assert parser is expected, path
+
+
+@pytest.mark.skip
+def test_match_parser_benchmark(benchmark, monkeypatch, tmp_path):
+    monkeypatch.setattr('nomad.parsing.parsers.parsers', synthetic_parsers())
+    paths = synthetic_upload(str(tmp_path), 5000)
+
+    def match_all():
+        for path in paths:
+            match_parser(path)
+
+    benchmark(match_all)
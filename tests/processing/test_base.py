@@ -184,9 +184,19 @@ class ChildProc(Proc):
             assert False, 'failing child'
         events.append(f'{self.child_id}:child_proc:succ')
 
+    @process(is_child=True)
+    def batch_child_proc(self):
+        if self.child_id.startswith('fail'):
+            events.append(f'{self.child_id}:batch_child_proc:fail')
+            assert False, 'failing child'
+        events.append(f'{self.child_id}:batch_child_proc:succ')
+
     def parent(self):
         return ParentProc.get(self.parent_id)
 
+    def parent_ref(self):
+        return ParentProc, self.parent_id
+
 
 class ParentProc(Proc):
     id_field = 'parent_id'
@@ -234,6 +244,18 @@ class ParentProc(Proc):
         events.append(f'{self.parent_id}:spawn:waiting{suffix}')
         return ProcessStatus.WAITING_FOR_RESULT
 
+    @process()
+    def spawn_batch(self, child_ids: List[str]):
+        events.append(f'{self.parent_id}:spawn_batch:start')
+        self.join_args = []
+        children = [
+            ChildProc.create(child_id=child_id, parent_id=self.parent_id)
+            for child_id in child_ids
+        ]
+        ChildProc.process_batch(children, 'batch_child_proc')
+        events.append(f'{self.parent_id}:spawn_batch:waiting')
+        return ProcessStatus.WAITING_FOR_RESULT
+
     def child_cls(self):
         return ChildProc
 
@@ -420,6 +442,133 @@ def test_parent_child(
     assert_events(expected_events)
 
 
+def test_process_batch(worker, mongo_function, reset_events):
+    child_ids = ['0', 'fail1', '2', '3']
+    parent = ParentProc.create(parent_id='p')
+    parent.spawn_batch(child_ids)
+    parent.block_until_complete()
+
+    assert parent.process_status == ProcessStatus.SUCCESS
+    for child_id in child_ids:
+        child = ChildProc.get(child_id)
+        assert child.process_status == (
+            ProcessStatus.FAILURE
+            if child_id.startswith('fail')
+            else ProcessStatus.SUCCESS
+        )
+        assert child.celery_task_id == ChildProc.get(child_ids[0]).celery_task_id
+
+    assert_events(
+        [
+            'p:spawn_batch:start',
+            [
+                'p:spawn_batch:waiting',
+                '0:batch_child_proc:succ',
+                'fail1:batch_child_proc:fail',
+                '2:batch_child_proc:succ',
+                '3:batch_child_proc:succ',
+            ],
+            'p:join:succ',
+        ]
+    )
+
+
+def complete_child(child: ChildProc) -> Union[bool, None]:
+    """
+    Completes the given child like a worker does. Returns the result of the parent
+    join, or None if the child did not try to join.
+    """
+    ChildProc._get_collection().update_one(
+        {'_id': child.child_id}, {'$set': {'process_status': ProcessStatus.SUCCESS}}
+    )
+    child._complete_child()
+    if (child._parent_pending_children or 0) > 0 and child._siblings_processing():
+        return None
+    return ParentProc.get(child.parent_id)._try_to_join()
+
+
+def create_waiting_parent(n_children: int, pending_children: int) -> ParentProc:
+    ParentProc.objects(parent_id='p').delete()
+    ChildProc.objects(parent_id='p').delete()
+    parent = ParentProc.create(parent_id='p')
+    ParentProc._get_collection().update_one(
+        {'_id': 'p'},
+        {
+            '$set': {
+                'process_status': ProcessStatus.WAITING_FOR_RESULT,
+                'pending_children': pending_children,
+            }
+        },
+    )
+    if n_children > 0:
+        ChildProc._get_collection().insert_many(
+            [
+                dict(_id=str(i), parent_id='p', process_status=ProcessStatus.RUNNING)
+                for i in range(n_children)
+            ]
+        )
+    return parent
+
+
+@pytest.mark.parametrize(
+    'pending_children', [pytest.param(3, id='stale'), pytest.param(1, id='low')]
+)
+def test_join_reconcile(mongo_function, pending_children):
+    parent = create_waiting_parent(2, pending_children)
+    children = [ChildProc(child_id=str(i), parent_id='p') for i in range(2)]
+
+    assert not complete_child(children[0])
+    assert complete_child(children[1]) is True
+    parent.reload()
+    assert parent.process_status == ProcessStatus.RUNNING
+    assert parent.pending_children == 0
+
+    # late completions do not decrement the counter below zero
+    children[1]._complete_child()
+    assert children[1]._parent_pending_children is None
+    parent.reload()
+    assert parent.pending_children == 0
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('n_children, n_threads', [(100000, 16)])
+def test_join_load(benchmark, mongo_function, n_children, n_threads):
+    """
+    Simulates the completion of many children against a local mongod. The parent must
+    be joined exactly once.
+    """
+    joins: List[Union[bool, None]] = []
+
+    def setup():
+        joins.clear()
+        create_waiting_parent(n_children, n_children)
+        children = [
+            ChildProc(child_id=str(i), parent_id='p') for i in range(n_children)
+        ]
+        return (children,), {}
+
+    def complete(children):
+        for child in children:
+            joins.append(complete_child(child))
+
+    def complete_all(children):
+        threads = [
+            threading.Thread(target=complete, args=(children[i::n_threads],))
+            for i in range(n_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    benchmark.pedantic(complete_all, setup=setup, rounds=3)
+
+    assert joins.count(True) == 1
+    parent = ParentProc.get('p')
+    assert parent.process_status == ProcessStatus.RUNNING
+    assert parent.pending_children == 0
+
+
 def test_queueing(worker, mongo_function, reset_events):
     p = ParentProc.create(parent_id='p')
     expected_events = []
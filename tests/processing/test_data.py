@@ -20,6 +20,8 @@ from typing import Generator, Tuple, Dict
 import pytest
 import os.path
 import re
+import threading
+import time
 import shutil
 import zipfile
 import json
@@ -28,6 +30,7 @@ import yaml
 from nomad import utils, infrastructure
 from nomad.config import config
 from nomad.config.models.config import BundleImportSettings
+from nomad.config.models.plugins import PluginPackage
 from nomad.archive import read_partial_archive_from_mongo, to_json
 from nomad.files import UploadFiles, StagingUploadFiles, PublicUploadFiles
 from nomad.parsing.parser import Parser
@@ -36,6 +39,8 @@ from nomad.datamodel import ServerContext
 from nomad.datamodel.data import EntryData
 from nomad.metainfo import Package, Quantity, Reference, SubSection
 from nomad.processing import Upload, Entry, ProcessStatus
+from nomad.processing import data as processing_data
+from nomad import search as search_module
 from nomad.search import search, refresh as search_refresh
 from nomad.utils.exampledata import ExampleData
 from nomad.datamodel.datamodel import EntryArchive, EntryData, ArchiveSection
@@ -279,6 +284,66 @@ def test_processing_with_large_dir(user1, proc_infra, tmp):
         assert len(entry.warnings) == 1
 
 
+@pytest.mark.timeout(config.tests.default_timeout)
+@pytest.mark.parametrize('matching_workers', [1, 4])
+def test_processing_matching_workers(
+    user1, proc_infra, tmp, monkeypatch, matching_workers
+):
+    monkeypatch.setattr('nomad.config.process.matching_workers', matching_workers)
+    monkeypatch.setattr('nomad.config.process.matching_insert_batch_size', 2)
+    upload_path = os.path.join(tmp, 'matching_workers.zip')
+    with zipfile.ZipFile(upload_path, 'w') as zf:
+        for i in range(5):
+            zf.write('tests/data/proc/templates/template.json', f'{i}/template.json')
+            for j in range(10):
+                with zf.open(f'{i}/{j}.aux', 'w') as f:
+                    f.write(b'content')
+
+    upload = run_processing(('test_upload_id', upload_path), user1)
+    assert_processing(upload)
+    assert sorted(entry.mainfile for entry in upload.successful_entries) == [
+        f'{i}/template.json' for i in range(5)
+    ]
+
+
+@pytest.mark.parametrize('matching_workers', [1, 4])
+def test_match_mainfiles_preprocessing(
+    raw_files_function, monkeypatch, matching_workers
+):
+    monkeypatch.setattr('nomad.config.process.matching_workers', matching_workers)
+    upload_files = StagingUploadFiles('test_upload_id', create=True)
+    for name in ['POTCAR', 'a.aux', 'b.aux']:
+        with open(upload_files.raw_file_object(name).os_path, 'wt') as f:
+            f.write('content\n')
+
+    events = []
+    preprocess_files = Upload._preprocess_files
+
+    def preprocess(self, path):
+        events.append(('preprocess', path))
+        preprocess_files(self, path)
+
+    def match(self, path):
+        events.append(('match', path))
+        return None, None
+
+    monkeypatch.setattr(Upload, '_preprocess_files', preprocess)
+    monkeypatch.setattr(Upload, '_match_file', match)
+    monkeypatch.setattr(Upload, 'staging_upload_files', upload_files)
+
+    upload = Upload(upload_id='test_upload_id')
+    assert list(upload.match_mainfiles(None, None)) == []
+    # all files are preprocessed before matching, created files are matched as well
+    kinds = [kind for kind, _ in events]
+    assert kinds == sorted(kinds, reverse=True)
+    assert sorted(path for kind, path in events if kind == 'match') == [
+        'POTCAR',
+        'POTCAR.stripped',
+        'a.aux',
+        'b.aux',
+    ]
+
+
 @pytest.mark.timeout(config.tests.default_timeout)
 def test_publish(
     non_empty_processed: Upload, no_warn, internal_example_user_metadata, monkeypatch
@@ -654,6 +719,48 @@ def test_re_process_match(non_empty_processed, published, monkeypatch, no_warn):
         assert not upload.with_embargo
 
 
+@pytest.mark.parametrize(
+    'rematch_published, plugin_version, skipped',
+    [
+        pytest.param(False, None, True, id='unchanged'),
+        pytest.param(True, None, False, id='rematch'),
+        pytest.param(False, '1.0.0', False, id='plugin-version'),
+    ],
+)
+def test_re_process_skip_unchanged(
+    published: Upload, monkeypatch, rematch_published, plugin_version, skipped
+):
+    # publishing replaces the fingerprints of the staging files
+    for entry in Entry.objects(upload_id=published.upload_id):
+        assert entry.entry_files_fingerprint.startswith('zip:')
+
+    if plugin_version is not None:
+        monkeypatch.setitem(
+            config.plugins.plugin_packages,
+            'test_plugin',
+            PluginPackage(name='test_plugin', version=plugin_version, entry_points=[]),
+        )
+
+    parsed_entry_ids = []
+    parsing = Entry.parsing
+
+    def parsing_spy(self):
+        parsed_entry_ids.append(self.entry_id)
+        return parsing(self)
+
+    monkeypatch.setattr('nomad.processing.data.Entry.parsing', parsing_spy)
+
+    published.process_upload(
+        reprocess_settings=dict(
+            skip_unchanged_entries=True, rematch_published=rematch_published
+        )
+    )
+    published.block_until_complete(interval=0.01)
+
+    assert published.process_status == ProcessStatus.SUCCESS
+    assert (len(parsed_entry_ids) == 0) == skipped
+
+
 @pytest.mark.parametrize('reuse_parser', [False, True])
 def test_reuse_parser(monkeypatch, tmp, user1, proc_infra, reuse_parser, no_warn):
     upload_path = os.path.join(tmp, 'example_upload.zip')
@@ -840,6 +947,65 @@ def test_process_partial(proc_infra, non_empty_processed: Upload, args):
             )
 
 
+def test_index_entries(non_empty_processed: Upload, monkeypatch):
+    upload = non_empty_processed
+    entry_ids = sorted(
+        entry.entry_id for entry in Entry.objects(upload_id=upload.upload_id)
+    )
+    assert len(entry_ids) > 1
+
+    indexed_chunks = []
+    index_docs = search_module.index_docs
+
+    def index_docs_spy(entry_docs, *args, **kwargs):
+        indexed_chunks.append([entry_id for entry_id, _ in entry_docs])
+        return index_docs(entry_docs, *args, **kwargs)
+
+    monkeypatch.setattr('nomad.search.index_docs', index_docs_spy)
+    monkeypatch.setattr('nomad.config.elastic.bulk_size', 1)
+
+    # the entries were indexed during processing and did not change
+    upload._index_entries(upload.get_logger())
+    assert indexed_chunks == [[] for _ in entry_ids]
+
+    Entry._get_collection().update_one(
+        {'_id': entry_ids[0]}, {'$unset': {'index_hash': ''}}
+    )
+    indexed_chunks.clear()
+    upload._index_entries(upload.get_logger())
+    assert indexed_chunks == [[entry_ids[0]]] + [[] for _ in entry_ids[1:]]
+    assert Entry.get(entry_ids[0]).index_hash is not None
+
+
+def test_claim_buffered_index_docs(non_empty_processed: Upload):
+    upload = non_empty_processed
+    flushed_id, buffered_id = sorted(
+        entry.entry_id for entry in Entry.objects(upload_id=upload.upload_id)
+    )[:2]
+    collection = Entry._get_collection()
+    collection.update_many(
+        {'_id': {'$in': [flushed_id, buffered_id]}},
+        {'$set': {'index_pending': 'buffered'}},
+    )
+
+    # a worker is sending the document of one entry right now
+    assert processing_data._claim_index_buffer_entries([flushed_id]) == {flushed_id}
+
+    def complete_flush():
+        time.sleep(0.5)
+        processing_data._on_index_buffer_flushed({flushed_id: None}, {})
+
+    flusher = threading.Thread(target=complete_flush)
+    flusher.start()
+    upload._claim_buffered_index_docs(upload.get_logger())
+    assert not flusher.is_alive()
+    assert Entry.get(flushed_id).index_pending is None
+    assert Entry.get(buffered_id).index_pending is None
+
+    # the workers drop the documents that were taken over
+    assert processing_data._claim_index_buffer_entries([buffered_id]) == set()
+
+
 def test_re_pack(published: Upload):
     upload_id = published.upload_id
     upload_files: PublicUploadFiles = published.upload_files  # type: ignore
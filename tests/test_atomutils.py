@@ -15,8 +15,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import marshal
+
 import pytest
-from nomad.atomutils import Formula
+from nomad.aflow_prototypes import get_aflow_prototypes, read_aflow_prototypes
+from nomad.atomutils import Formula, search_aflow_prototype
 from nomad.datamodel.results import Material, ElementalComposition
 
 
@@ -161,3 +164,102 @@ def test_formula_populate_overwrite_exception(formula, material):
     formula_object = Formula(formula)
     with pytest.raises(ValueError):
         formula_object.populate(material, descriptive_format='original')
+
+
+@pytest.mark.parametrize(
+    'space_group, norm_wyckoff, expected_id',
+    [
+        pytest.param(
+            225, {'a': {'X_0': 1}, 'b': {'X_1': 1}}, 'AB_cF8_225_a_b', id='match'
+        ),
+        pytest.param(
+            194,
+            {
+                'f': {'X_1': 2, 'X_0': 2},
+                'a': {'X_0': 1},
+                'c': {'X_0': 1},
+                'b': {'X_0': 1},
+            },
+            'A5B2_hP14_194_abdf_f',
+            id='order independent',
+        ),
+        pytest.param(
+            229, {'a': {'X_0': 1}, 'b': {'X_1': 1}}, None, id='other space group'
+        ),
+        pytest.param(225, {'a': {'X_0': 2}}, None, id='other occupations'),
+        pytest.param(225, {}, None, id='empty'),
+    ],
+)
+def test_search_aflow_prototype(space_group, norm_wyckoff, expected_id):
+    prototype = search_aflow_prototype(space_group, norm_wyckoff)
+    if expected_id is None:
+        assert prototype is None
+    else:
+        assert prototype['aflow_prototype_id'] == expected_id
+
+
+def test_search_aflow_prototype_library():
+    # the index returns the first prototype of a space group with the given occupations
+    prototypes_by_spacegroup = get_aflow_prototypes()['prototypes_by_spacegroup']
+    for space_group, prototypes in prototypes_by_spacegroup.items():
+        for prototype in prototypes:
+            norm_wyckoff = prototype.get('normalized_wyckoff_matid')
+            if not norm_wyckoff:
+                continue
+            expected = next(
+                other
+                for other in prototypes
+                if other.get('normalized_wyckoff_matid') == norm_wyckoff
+            )
+            assert search_aflow_prototype(space_group, norm_wyckoff) is expected
+
+
+def _scan_aflow_prototypes(space_group, norm_wyckoff):
+    # the linear scan that was used before the library was indexed
+    for prototype in get_aflow_prototypes()['prototypes_by_spacegroup'].get(
+        space_group, []
+    ):
+        if prototype.get('normalized_wyckoff_matid') == norm_wyckoff:
+            return prototype
+    return None
+
+
+@pytest.fixture(scope='module')
+def aflow_prototypes_python_code():
+    # the compiled module that held the library as a Python literal
+    source = f'aflow_prototypes = {get_aflow_prototypes()!r}'
+    return marshal.dumps(compile(source, 'aflow_prototypes.py', 'exec'))
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize('library_format', ['python', 'msgpack'])
+def test_aflow_prototypes_load_benchmark(
+    benchmark, aflow_prototypes_python_code, library_format
+):
+    if library_format == 'python':
+        benchmark(lambda: exec(marshal.loads(aflow_prototypes_python_code), {}))
+    else:
+        benchmark(read_aflow_prototypes)
+
+
+@pytest.mark.skip
+@pytest.mark.parametrize(
+    'search',
+    [
+        pytest.param(_scan_aflow_prototypes, id='scan'),
+        pytest.param(search_aflow_prototype, id='index'),
+    ],
+)
+def test_aflow_prototypes_search_benchmark(benchmark, search):
+    # the last prototype of the space group with the most prototypes
+    space_group, prototypes = max(
+        get_aflow_prototypes()['prototypes_by_spacegroup'].items(),
+        key=lambda item: len(item[1]),
+    )
+    norm_wyckoff = [
+        prototype['normalized_wyckoff_matid']
+        for prototype in prototypes
+        if prototype.get('normalized_wyckoff_matid')
+    ][-1]
+    assert search(space_group, norm_wyckoff) is not None
+    benchmark(search, space_group, norm_wyckoff)
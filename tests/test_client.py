@@ -88,6 +88,7 @@ def async_api_v1(monkeysession):
     monkeysession.setattr('httpx.AsyncClient.put', getattr(test_client, 'put'))
     monkeysession.setattr('httpx.AsyncClient.post', getattr(test_client, 'post'))
     monkeysession.setattr('httpx.AsyncClient.delete', getattr(test_client, 'delete'))
+    monkeysession.setattr('httpx.AsyncClient.stream', getattr(test_client, 'stream'))
 
     def mocked_auth_headers(self) -> dict:
         for user in users.values():
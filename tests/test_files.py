@@ -37,6 +37,7 @@ from nomad.files import (
     empty_archive_file_size,
     is_safe_path,
     is_safe_relative_path,
+    archive_reader_cache,
 )
 from nomad.files import StagingUploadFiles, PublicUploadFiles, UploadFiles
 from nomad.processing import Upload
@@ -305,6 +306,16 @@ class UploadFilesContract(UploadFilesFixtures):
         with upload_files.read_archive(example_entry_id) as archive:
             assert to_json(archive[example_entry_id]) == example_archive_contents
 
+    def test_read_many(self, test_upload: UploadWithFiles):
+        _, entries, upload_files = test_upload
+
+        entry_ids = [entry.entry_id for entry in entries] + ['does-not-exist']
+        archives = dict(upload_files.read_many(entry_ids))
+        assert archives.keys() == set(entry_ids)
+        assert archives.pop('does-not-exist') is None
+        for archive in archives.values():
+            assert archive == example_archive_contents
+
     def test_archive_hdf5_file(self, test_upload: UploadWithFiles):
         _, _, upload_files = test_upload
         with open(upload_files.archive_hdf5_location(example_entry_id), 'rb') as f:
@@ -428,6 +439,44 @@ class TestStagingUploadFiles(UploadFilesContract):
             )
             assert_example_files(entry_files, with_mainfile=with_mainfile)
 
+    def test_entry_fingerprint(self, monkeypatch, test_upload_id):
+        _, entries, upload_files = create_staging_upload(
+            test_upload_id, entry_specs='pp'
+        )
+        mainfile = entries[1].mainfile
+        # all files were just written and their modification time is not reliable
+        assert upload_files.entry_fingerprint(mainfile, None) is None
+
+        monkeypatch.setattr('nomad.files._racy_interval_ns', 0)
+        fingerprint = upload_files.entry_fingerprint(mainfile, None)
+        assert fingerprint.startswith('stat:')
+        assert upload_files.entry_fingerprint(mainfile, None) == fingerprint
+        assert upload_files.entry_fingerprint(mainfile, 'key') != fingerprint
+        assert upload_files.entry_fingerprint(entries[0].mainfile, None) != fingerprint
+
+        aux_file = list(upload_files.entry_files(mainfile))[1]
+        aux_os_path = upload_files.raw_file_object(aux_file).os_path
+        stat = os.stat(aux_os_path)
+        os.utime(aux_os_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert upload_files.entry_fingerprint(mainfile, None) != fingerprint
+
+        with pytest.raises(KeyError):
+            upload_files.entry_fingerprint('does/not/exist', None)
+
+    def test_entry_files_cache(self, monkeypatch, test_upload_id):
+        monkeypatch.setattr('nomad.files._racy_interval_ns', 0)
+        _, entries, upload_files = create_staging_upload(
+            test_upload_id, entry_specs='p'
+        )
+        mainfile = entries[0].mainfile
+        entry_files = list(upload_files.entry_files(mainfile))
+        assert list(upload_files.entry_files(mainfile)) == entry_files
+
+        new_file = os.path.join(os.path.dirname(mainfile), 'new_file')
+        with open(upload_files.raw_file_object(new_file).os_path, 'wt') as f:
+            f.write('content')
+        assert new_file in upload_files.entry_files(mainfile)
+
     def test_delete(self, test_upload: StagingUploadWithFiles):
         _, _, upload_files = test_upload
         upload_files.delete()
@@ -587,6 +636,121 @@ class TestPublicUploadFiles(UploadFilesContract):
         with pytest.raises(KeyError):
             StagingUploadFiles(upload_files.upload_id)
 
+    def test_archive_reader_cache(self, test_upload_id):
+        _, entries, upload_files = create_staging_upload(
+            test_upload_id, entry_specs='pp'
+        )
+        upload_files.pack(entries, with_embargo=False)
+        upload_files.delete()
+        archive_reader_cache.invalidate()
+
+        hits, misses = archive_reader_cache.hits, archive_reader_cache.misses
+        for _ in range(3):
+            with PublicUploadFiles(test_upload_id) as public_upload_files:
+                for entry in entries:
+                    with public_upload_files.read_archive(entry.entry_id) as archive:
+                        assert to_json(archive[entry.entry_id]) is not None
+
+        assert archive_reader_cache.misses == misses + 1
+        assert archive_reader_cache.hits == hits + 3 * len(entries) - 1
+        assert archive_reader_cache.statistics()['size'] == 1
+
+        # entries are not shared between checkouts and not readable after close
+        entry_id = entries[0].entry_id
+        with PublicUploadFiles(test_upload_id) as public_upload_files:
+            with public_upload_files.read_archive(entry_id) as archive:
+                entry_archive = archive[entry_id]
+                checkout_file = archive._f
+        with PublicUploadFiles(test_upload_id) as public_upload_files:
+            with public_upload_files.read_archive(entry_id) as archive:
+                assert archive[entry_id] is not entry_archive
+                assert archive._f is not checkout_file
+                assert to_json(archive[entry_id]) == to_json(entry_archive)
+        assert checkout_file.closed
+        with pytest.raises(ValueError):
+            checkout_file.read_at(1, 0)
+
+        # a closed checkout stays closed and cannot release a later checkout
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        first = public_upload_files.read_archive(entry_id)
+        first.close()
+        second = public_upload_files.read_archive(entry_id)
+        assert second is not first
+        assert first.is_closed() and not second.is_closed()
+        first.close()
+        assert not second.is_closed()
+        assert to_json(second[entry_id]) == to_json(entry_archive)
+        second.close()
+        assert second.is_closed()
+        assert archive_reader_cache.statistics()['size'] == 1
+
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        reader = public_upload_files.read_archive(entries[0].entry_id)
+        public_upload_files.re_pack(with_embargo=True)
+        assert archive_reader_cache.statistics()['size'] == 0
+        assert reader._f.closed
+
+    def test_raw_directory_index(self, test_upload_id):
+        _, entries, upload_files = create_staging_upload(
+            test_upload_id, entry_specs='pp'
+        )
+        upload_files.pack(entries, with_embargo=False)
+        expected = list(upload_files.raw_directory_list(recursive=True))
+        upload_files.delete()
+
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        index_file_object = PublicUploadFiles._create_raw_index_file_object(
+            public_upload_files, 'public'
+        )
+        assert index_file_object.exists()
+        assert sorted(public_upload_files.raw_directory_list(recursive=True)) == sorted(
+            path_info._replace(access='public') for path_info in expected
+        )
+
+        # A stale or missing index is recreated
+        with open(index_file_object.os_path, 'wb') as f:
+            f.write(b'garbage')
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        assert not public_upload_files.is_empty()
+        assert os.path.getsize(index_file_object.os_path) > len(b'garbage')
+
+        index_file_object.delete()
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        file_path = next(path_info.path for path_info in expected if path_info.is_file)
+        assert public_upload_files.raw_path_is_file(file_path)
+        assert index_file_object.exists()
+
+        public_upload_files.re_pack(with_embargo=True)
+        assert not index_file_object.exists()
+        assert PublicUploadFiles._create_raw_index_file_object(
+            public_upload_files, 'restricted'
+        ).exists()
+
+    def test_entry_fingerprint(self, test_upload_id):
+        _, entries, upload_files = create_staging_upload(
+            test_upload_id, entry_specs='pp'
+        )
+        upload_files.pack(entries, with_embargo=False)
+        upload_files.delete()
+
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        fingerprints = [
+            public_upload_files.entry_fingerprint(entry.mainfile, None)
+            for entry in entries
+        ]
+        assert all(fingerprint.startswith('zip:') for fingerprint in fingerprints)
+        assert len(set(fingerprints)) == len(entries)
+
+        public_upload_files.re_pack(with_embargo=True)
+        public_upload_files = PublicUploadFiles(test_upload_id)
+        assert fingerprints == [
+            public_upload_files.entry_fingerprint(entry.mainfile, None)
+            for entry in entries
+        ]
+
+        with pytest.raises(KeyError):
+            public_upload_files.entry_fingerprint('does/not/exist', None)
+
     @pytest.mark.parametrize(
         'suffixes,suffix',
         [
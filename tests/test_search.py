@@ -17,6 +17,7 @@
 #
 
 import json
+import threading
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Sequence, Union
 
@@ -27,6 +28,7 @@ from nomad.app.v1.models import (
     Direction,
     MetadataPagination,
     MetadataRequired,
+    MetadataResponse,
     WithQuery,
 )
 from nomad.config import config
@@ -44,6 +46,9 @@ from nomad.search import (
     AuthenticationRequiredError as ARE,
 )
 from nomad.search import (
+    IndexBuffer,
+    SearchCache,
+    index_doc_hash,
     quantity_values,
     refresh,
     search,
@@ -240,6 +245,171 @@ def test_index(indices, example_data):
     assert entry_index.get(id='test_entry_id_0') is not None
 
 
+def test_index_buffer(monkeypatch):
+    bulk_requests: List[List[str]] = []
+
+    def index_entry_docs(entry_docs, **kwargs):
+        bulk_requests.append([entry_id for entry_id, _ in entry_docs])
+        return {'entry_1': 'error'} if 'entry_1' in bulk_requests[-1] else {}
+
+    monkeypatch.setattr(
+        'nomad.search.create_entry_index_docs',
+        lambda entries: [(entry['entry_id'], dict(entry)) for entry in entries],
+    )
+    monkeypatch.setattr('nomad.search.index_entry_docs', index_entry_docs)
+    monkeypatch.setattr('nomad.config.process.index_buffer_entries', 3)
+    monkeypatch.setattr('nomad.config.process.index_buffer_delay', 60)
+
+    flushed: List[Any] = []
+    buffer = IndexBuffer(on_flushed=lambda *args: flushed.append(args))
+
+    assert buffer.add(dict(entry_id='entry_0')) == {}
+    assert buffer.add(dict(entry_id='entry_1')) == {}
+    # replaces the buffered document
+    assert buffer.add(dict(entry_id='entry_1')) == {}
+    assert len(buffer) == 2 and bulk_requests == []
+
+    # the errors of other entries are only reported
+    assert buffer.add(dict(entry_id='entry_2')) == {}
+    assert bulk_requests == [['entry_0', 'entry_1', 'entry_2']]
+    assert flushed == [
+        (
+            {
+                entry_id: index_doc_hash(dict(entry_id=entry_id))
+                for entry_id in ['entry_0', 'entry_1', 'entry_2']
+            },
+            {'entry_1': 'error'},
+        )
+    ]
+    assert len(buffer) == 0
+
+    assert buffer.add(dict(entry_id='entry_3')) == {}
+    assert buffer.discard('entry_3')
+    assert buffer.add(dict(entry_id='entry_1')) == {}
+    assert buffer.flush() == {'entry_1': 'error'}
+    assert bulk_requests[-1] == ['entry_1']
+
+
+def test_index_buffer_claim(monkeypatch):
+    bulk_requests: List[List[str]] = []
+
+    def index_entry_docs(entry_docs, **kwargs):
+        bulk_requests.append([entry_id for entry_id, _ in entry_docs])
+        return {}
+
+    monkeypatch.setattr(
+        'nomad.search.create_entry_index_docs',
+        lambda entries: [(entry['entry_id'], dict(entry)) for entry in entries],
+    )
+    monkeypatch.setattr('nomad.search.index_entry_docs', index_entry_docs)
+    monkeypatch.setattr('nomad.config.process.index_buffer_entries', 3)
+    monkeypatch.setattr('nomad.config.process.index_buffer_delay', 60)
+
+    flushed: List[Any] = []
+    buffer = IndexBuffer(
+        on_flushed=lambda *args: flushed.append(args),
+        claim=lambda entry_ids: {'entry_0'},
+    )
+    buffer.add(dict(entry_id='entry_0'))
+    buffer.add(dict(entry_id='entry_1'))
+
+    # documents that were taken over are neither indexed nor reported
+    assert buffer.flush() == {}
+    assert bulk_requests == [['entry_0']]
+    assert flushed == [({'entry_0': index_doc_hash(dict(entry_id='entry_0'))}, {})]
+
+
+def test_index_buffer_concurrent_add(monkeypatch):
+    indexing, release = threading.Event(), threading.Event()
+
+    def index_entry_docs(entry_docs, **kwargs):
+        indexing.set()
+        assert release.wait(timeout=10)
+        return {}
+
+    monkeypatch.setattr(
+        'nomad.search.create_entry_index_docs',
+        lambda entries: [(entry['entry_id'], dict(entry)) for entry in entries],
+    )
+    monkeypatch.setattr('nomad.search.index_entry_docs', index_entry_docs)
+    monkeypatch.setattr('nomad.config.process.index_buffer_entries', 3)
+    monkeypatch.setattr('nomad.config.process.index_buffer_delay', 60)
+
+    buffer = IndexBuffer()
+    buffer.add(dict(entry_id='entry_0'))
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    try:
+        assert indexing.wait(timeout=10)
+        # adding does not wait for the bulk request of the running flush
+        adder = threading.Thread(target=buffer.add, args=(dict(entry_id='entry_1'),))
+        adder.start()
+        adder.join(timeout=5)
+        assert not adder.is_alive()
+        assert len(buffer) == 1
+    finally:
+        release.set()
+        flusher.join()
+
+
+def test_index_doc_hash():
+    entry_doc = dict(
+        entry_id='entry_0', results=dict(n_elements=2, elements=['H', 'O'])
+    )
+    assert index_doc_hash(entry_doc) == index_doc_hash(
+        dict(results=dict(elements=['H', 'O'], n_elements=2), entry_id='entry_0')
+    )
+    assert index_doc_hash(entry_doc) != index_doc_hash(
+        dict(entry_id='entry_0', results=dict(n_elements=2, elements=['O', 'H']))
+    )
+    # documents that cannot be serialized have no hash
+    assert index_doc_hash(dict(entry_id='entry_0', n_atoms=2**64)) is None
+
+
+def test_search_cache(monkeypatch):
+    monkeypatch.setattr('nomad.config.elastic.search_cache_size', 2)
+    monkeypatch.setattr('nomad.config.elastic.search_cache_owners', ['public', 'user'])
+    cache = SearchCache()
+    monkeypatch.setattr('nomad.search.search_cache', cache)
+
+    calls: List[Any] = []
+
+    def _search(owner, query, *args):
+        calls.append((owner, query))
+        return MetadataResponse(
+            owner=owner, query=query, pagination={'total': 0}, data=[]
+        )
+
+    monkeypatch.setattr('nomad.search._search', _search)
+
+    def assert_search(owner, query, user_id=None, n_calls=None):
+        response = search(owner=owner, query=query, user_id=user_id)
+        assert response.owner == owner
+        assert len(calls) == n_calls
+
+    assert_search('public', {'upload_id': 'a'}, 'user_a', n_calls=1)
+    # public responses are shared between users
+    assert_search('public', {'upload_id': 'a'}, 'user_b', n_calls=1)
+    assert_search('user', {'upload_id': 'a'}, 'user_a', n_calls=2)
+    assert_search('user', {'upload_id': 'a'}, 'user_b', n_calls=3)
+    # evicted
+    assert_search('public', {'upload_id': 'a'}, n_calls=4)
+    assert cache.statistics()['evictions'] == 2
+
+    # owners that are not configured are not cached
+    assert_search('visible', {'upload_id': 'a'}, n_calls=5)
+    assert_search('visible', {'upload_id': 'a'}, n_calls=6)
+
+    cache.clear()
+    assert_search('public', {'upload_id': 'a'}, n_calls=7)
+
+    monkeypatch.setattr('nomad.config.elastic.search_cache_ttl', -1)
+    assert_search('public', {'upload_id': 'b'}, n_calls=8)
+    assert_search('public', {'upload_id': 'b'}, n_calls=9)
+
+    assert cache.statistics()['hits'] == 1
+
+
 @pytest.fixture()
 def indices(elastic_function):
     pass